@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from ..dags.etl.json_decoder import available_decoders
+
+
+@pytest.fixture(scope="module")
+def ndjson_payload(raw_facts):
+    return b"".join(
+        json.dumps(record).encode() + b"\n" for record in raw_facts
+    )
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec", "json"])
+def test_decode_json_array(benchmark, raw_facts, name):
+    """
+    Benchmark decoding the whole feed as one JSON array with each installed
+    decoder.
+    """
+    from ..dags.etl.json_decoder import get_decoder
+
+    if name not in available_decoders():
+        pytest.skip(f"{name} is not installed")
+    decode = get_decoder(name)
+    payload = json.dumps(raw_facts).encode()
+
+    result = benchmark(decode, payload)
+
+    assert len(result) == len(raw_facts)
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec", "json"])
+def test_decode_ndjson(benchmark, ndjson_payload, raw_facts, name):
+    """
+    Benchmark decoding the feed as newline-delimited JSON with each installed
+    decoder.
+    """
+    from ..dags.etl.extractors.json_stream import decode_json_records
+    from ..dags.etl.json_decoder import get_decoder
+
+    if name not in available_decoders():
+        pytest.skip(f"{name} is not installed")
+    decode = get_decoder(name)
+
+    result = benchmark(
+        decode_json_records, ndjson_payload, ndjson=True, decoder=decode
+    )
+
+    assert len(result) == len(raw_facts)
+
+
+def test_to_facts(benchmark, raw_facts):
+    """
+    Benchmark turning the decoded records into `Fact` records. Lists are
+    converted in place, so every round converts a copy of the shared feed.
+    """
+    from ..dags.etl.fact_record import to_facts
+
+    result = benchmark.pedantic(
+        to_facts, setup=lambda: ((list(raw_facts),), {}), rounds=5
+    )
+
+    assert 0 < len(result) <= len(raw_facts)
@@ -0,0 +1,63 @@
+import copy
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def postgres_repository(postgres_uri):
+    """
+    A PostgresRepository on the benchmark database. The facts written by the
+    benchmark are deleted afterwards.
+    """
+    from ..dags.etl.repositories import PostgresRepository
+
+    repository = PostgresRepository(db_uri=postgres_uri)
+    yield repository
+
+    conn = repository._get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM lsh_buckets WHERE fact_id IN (
+                    SELECT id FROM facts WHERE fact LIKE 'benchmark %'
+                );
+                DELETE FROM facts WHERE fact LIKE 'benchmark %';
+                """
+            )
+        conn.commit()
+    finally:
+        repository._release_connection(conn)
+
+
+@pytest.fixture
+def transformed_facts(raw_facts, repository):
+    from ..dags.etl.transformers import FactTransformer, FactVersionManager
+
+    version_manager = FactVersionManager(repository, tokenizer="words")
+    transformer = FactTransformer(
+        data_repository=repository, version_manager=version_manager
+    )
+    facts, _ = transformer.transform(copy.deepcopy(raw_facts))
+    return facts
+
+
+def test_save_facts_batch(benchmark, postgres_repository, transformed_facts):
+    """
+    Benchmark PostgresRepository.save_facts_batch against the database of
+    BENCHMARK_DB_URI, with fresh fact hashes every round.
+    """
+
+    def setup():
+        run = uuid.uuid4().hex
+        facts = copy.deepcopy(transformed_facts)
+        for number, fact in enumerate(facts):
+            fact["fact"] = f"benchmark {run} {fact['fact']}"
+            fact["fact_hash"] = f"{run[:24]}{number:08x}"
+            fact.pop("previous_fact_hash", None)
+        return (facts,), {}
+
+    benchmark.pedantic(
+        postgres_repository.save_facts_batch, setup=setup, rounds=3
+    )
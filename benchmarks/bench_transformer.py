@@ -0,0 +1,79 @@
+import copy
+
+import pytest
+
+
+@pytest.fixture
+def transformer(repository):
+    from ..dags.etl.transformers import FactTransformer, FactVersionManager
+
+    return FactTransformer(
+        data_repository=repository,
+        version_manager=FactVersionManager(repository),
+    )
+
+
+def test_validate_datetime(benchmark, raw_facts):
+    """
+    Benchmark DateTimeValidator.validate on every created date of the feed.
+    """
+    from ..dags.etl.transformers import DateTimeValidator
+
+    validator = DateTimeValidator()
+    dates = [record["created_date"] for record in raw_facts]
+
+    result = benchmark(lambda: [validator.validate(date) for date in dates])
+
+    assert len(result) == len(dates)
+
+
+def test_validate_many(benchmark, raw_facts):
+    """
+    Benchmark the batch DateTimeValidator.validate_many.
+    """
+    from ..dags.etl.transformers import DateTimeValidator
+
+    validator = DateTimeValidator()
+    dates = [record["created_date"] for record in raw_facts]
+
+    parsed_dates, _ = benchmark(validator.validate_many, dates)
+
+    assert len(parsed_dates) == len(dates)
+
+
+def test_cleanup_data(benchmark, raw_facts, transformer):
+    """
+    Benchmark FactTransformer.cleanup_data, on a fresh copy of the feed per
+    round as the stages update the records in place.
+    """
+    result = benchmark.pedantic(
+        transformer.cleanup_data,
+        setup=lambda: ((copy.deepcopy(raw_facts),), {}),
+        rounds=3,
+    )
+
+    assert 0 < len(result) <= len(raw_facts)
+
+
+def test_contains_number(benchmark, raw_facts, transformer):
+    """
+    Benchmark FactTransformer.contains_number fact by fact.
+    """
+    facts = [record["fact"] for record in raw_facts]
+
+    result = benchmark(
+        lambda: [transformer.contains_number(fact) for fact in facts]
+    )
+
+    assert any(result)
+
+
+def test_contains_numbers(benchmark, raw_facts, transformer):
+    """
+    Benchmark the batch FactTransformer.contains_numbers.
+    """
+    facts = [record["fact"] for record in raw_facts]
+
+    result = benchmark(transformer.contains_numbers, facts)
+
+    assert any(result)
@@ -0,0 +1,139 @@
+import copy
+import time
+
+import pytest
+
+
+@pytest.fixture
+def version_manager(request, repository):
+    from ..dags.etl.transformers import FactVersionManager
+
+    return FactVersionManager(
+        repository, tokenizer=request.config.getoption("--lsh-tokenizer")
+    )
+
+
+@pytest.fixture
+def cleaned_facts(raw_facts, repository):
+    from ..dags.etl.transformers import FactTransformer
+
+    transformer = FactTransformer(
+        data_repository=repository, version_manager=object()
+    )
+    return transformer.cleanup_data(copy.deepcopy(raw_facts))
+
+
+@pytest.fixture
+def stored_and_new_facts(cleaned_facts, repository, version_manager):
+    """
+    Store the older half of the cleaned facts with their bucket hashes in the
+    repository, and return the newer half to be versioned against them.
+    """
+    middle = len(cleaned_facts) // 2
+    stored, new = cleaned_facts[:middle], cleaned_facts[middle:]
+    bucket_hashes_batch = version_manager.create_lsh_buckets_batch(
+        [fact["fact"] for fact in stored]
+    ).tolist()
+    for fact, bucket_hashes in zip(stored, bucket_hashes_batch):
+        fact["bucket_hashes"] = bucket_hashes
+        fact["is_numeric"] = False
+    repository.save_facts_batch(stored)
+    return stored, new
+
+
+def test_create_lsh_buckets(benchmark, cleaned_facts, version_manager):
+    """
+    Benchmark FactVersionManager.create_lsh_buckets fact by fact.
+    """
+    facts = [fact["fact"] for fact in cleaned_facts]
+
+    result = benchmark.pedantic(
+        lambda: [version_manager.create_lsh_buckets(fact) for fact in facts],
+        rounds=3,
+    )
+
+    assert len(result) == len(facts)
+
+
+def test_create_lsh_buckets_batch(benchmark, cleaned_facts, version_manager):
+    """
+    Benchmark the vectorized FactVersionManager.create_lsh_buckets_batch.
+    """
+    facts = [fact["fact"] for fact in cleaned_facts]
+
+    result = benchmark.pedantic(
+        version_manager.create_lsh_buckets_batch, args=(facts,), rounds=3
+    )
+
+    assert len(result) == len(facts)
+
+
+def test_match_and_find_version(
+    benchmark, stored_and_new_facts, version_manager
+):
+    """
+    Benchmark FactVersionManager.match_and_find_version fact by fact against
+    the in-memory repository.
+    """
+    _, new = stored_and_new_facts
+
+    result = benchmark.pedantic(
+        lambda facts: [
+            version_manager.match_and_find_version(fact) for fact in facts
+        ],
+        setup=lambda: ((copy.deepcopy(new),), {}),
+        rounds=3,
+    )
+
+    assert len(result) == len(new)
+
+
+def test_match_and_find_versions(
+    benchmark, stored_and_new_facts, version_manager
+):
+    """
+    Benchmark the batched FactVersionManager.match_and_find_versions against
+    the in-memory repository.
+    """
+    _, new = stored_and_new_facts
+
+    result = benchmark.pedantic(
+        version_manager.match_and_find_versions,
+        setup=lambda: ((copy.deepcopy(new),), {}),
+        rounds=3,
+    )
+
+    assert len(result) == len(new)
+
+
+def test_match_and_find_versions_scaling(
+    benchmark, cleaned_facts, version_manager
+):
+    """
+    Benchmark the batched FactVersionManager.match_and_find_versions on the
+    whole batch against an empty repository, and check that its cost per
+    record stays roughly flat when the batch grows: resolving the versions
+    within a batch must not become quadratic, whatever the tokenizer.
+    """
+    sizes = [len(cleaned_facts) // 4, len(cleaned_facts) // 2]
+    per_record = []
+    for size in sizes:
+        facts = copy.deepcopy(cleaned_facts[:size])
+        start = time.perf_counter()
+        version_manager.match_and_find_versions(facts)
+        per_record.append((time.perf_counter() - start) / size)
+
+    result = benchmark.pedantic(
+        version_manager.match_and_find_versions,
+        setup=lambda: ((copy.deepcopy(cleaned_facts),), {}),
+        rounds=1,
+    )
+    per_record.append(benchmark.stats.stats.max / len(cleaned_facts))
+    benchmark.extra_info["seconds_per_record"] = dict(
+        zip(sizes + [len(cleaned_facts)], per_record)
+    )
+
+    assert len(result) == len(cleaned_facts)
+    # four times the records may cost up to three times as much per record,
+    # which leaves room for the buckets of the in-batch index filling up
+    assert max(per_record) < 3 * min(per_record)
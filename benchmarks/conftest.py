@@ -0,0 +1,91 @@
+import logging
+import os
+
+import pytest
+
+from .fact_generator import generate_facts
+
+scales = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("etl benchmarks")
+    group.addoption(
+        "--scale",
+        default="10k",
+        help="number of synthetic records: 10k, 100k, 1M or any integer",
+    )
+    group.addoption(
+        "--duplicate-rate",
+        type=float,
+        default=0.1,
+        help="share of records repeating an earlier fact",
+    )
+    group.addoption(
+        "--near-duplicate-rate",
+        type=float,
+        default=0.1,
+        help="share of records that are new versions of an earlier fact",
+    )
+    group.addoption(
+        "--lsh-tokenizer",
+        default="words",
+        help="tokenizer of the FactVersionManager: words, shingles or tfidf",
+    )
+    group.addoption(
+        "--etl-log-level",
+        default="WARNING",
+        help="level of the ETL loggers while benchmarking",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def etl_log_level(request):
+    """
+    Quiet the per-record logging of the ETL modules, which would otherwise
+    dominate the measurements.
+    """
+    level = request.config.getoption("--etl-log-level")
+    from ..dags.etl.repositories import postgres_repository  # noqa: F401
+    from ..dags.etl.transformers import fact_transformer  # noqa: F401
+
+    for name in list(logging.root.manager.loggerDict):
+        if "etl." in name:
+            logging.getLogger(name).setLevel(level)
+
+
+@pytest.fixture(scope="session")
+def scale(request):
+    value = request.config.getoption("--scale")
+    return scales.get(value) or int(value)
+
+
+@pytest.fixture(scope="session")
+def raw_facts(request, scale):
+    """
+    The synthetic feed all benchmarks run on.
+    """
+    return generate_facts(
+        scale,
+        duplicate_rate=request.config.getoption("--duplicate-rate"),
+        near_duplicate_rate=request.config.getoption("--near-duplicate-rate"),
+    )
+
+
+@pytest.fixture
+def repository():
+    from ..dags.etl.repositories import InMemoryRepository
+
+    return InMemoryRepository()
+
+
+@pytest.fixture
+def postgres_uri():
+    """
+    The Postgres database to benchmark against, taken from BENCHMARK_DB_URI.
+    Benchmarks needing it are skipped when it is not set.
+    """
+    uri = os.getenv("BENCHMARK_DB_URI")
+    if not uri:
+        pytest.skip("BENCHMARK_DB_URI is not set")
+    return uri
@@ -0,0 +1,116 @@
+import random
+from datetime import datetime, timedelta
+
+# Words the synthetic facts are made of
+vocabulary = (
+    "dogs",
+    "puppies",
+    "hounds",
+    "terriers",
+    "retrievers",
+    "bark",
+    "sniff",
+    "wag",
+    "their",
+    "tails",
+    "noses",
+    "paws",
+    "sense",
+    "smell",
+    "hearing",
+    "sleep",
+    "run",
+    "fast",
+    "loyal",
+    "playful",
+    "wolves",
+    "ancestors",
+    "humans",
+    "breeds",
+    "fur",
+    "coats",
+    "whiskers",
+    "sweat",
+    "through",
+    "can",
+    "detect",
+    "learn",
+    "remember",
+    "words",
+    "gestures",
+    "colours",
+    "see",
+    "blue",
+    "yellow",
+    "and",
+    "with",
+    "than",
+    "more",
+)
+
+numbers = ("two", "twelve", "forty-two", "a hundred", "3", "18", "250")
+
+
+def generate_facts(
+    count,
+    duplicate_rate=0.1,
+    near_duplicate_rate=0.1,
+    numeric_rate=0.3,
+    invalid_date_rate=0.01,
+    seed=0,
+):
+    """
+    Generate raw fact records shaped like the feed.
+
+    :param count: The number of records
+    :param duplicate_rate: The share of records repeating an earlier fact,
+    sometimes with extra whitespace
+    :param near_duplicate_rate: The share of records changing one word of an
+    earlier fact, i.e. new versions of it
+    :param numeric_rate: The share of new facts mentioning a number
+    :param invalid_date_rate: The share of records with a malformed
+    created date
+    :param seed: The seed of the random generator, so runs are comparable
+    :return: A list of `{"fact": ..., "created_date": ...}` dictionaries in
+    random created date order
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    records = []
+    for _ in range(count):
+        roll = rng.random()
+        if len(records) > 0 and roll < duplicate_rate:
+            fact = rng.choice(records)["fact"]
+            if rng.random() < 0.5:
+                fact = f"  {fact.replace(' ', '  ', 1)} "
+        elif len(records) > 0 and roll < duplicate_rate + near_duplicate_rate:
+            fact = near_duplicate(rng.choice(records)["fact"], rng)
+        else:
+            fact = new_fact(rng, numeric_rate)
+
+        created_date = start + timedelta(
+            seconds=rng.randrange(365 * 24 * 3600),
+            milliseconds=rng.randrange(1000),
+        )
+        if rng.random() < invalid_date_rate:
+            created_date = created_date.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            created_date = (
+                created_date.strftime("%Y-%m-%dT%H:%M:%S.")
+                + f"{created_date.microsecond // 1000:03d}Z"
+            )
+        records.append({"fact": fact, "created_date": created_date})
+    return records
+
+
+def new_fact(rng, numeric_rate):
+    words = rng.sample(vocabulary, rng.randint(8, 16))
+    if rng.random() < numeric_rate:
+        words.insert(rng.randrange(len(words)), rng.choice(numbers))
+    return " ".join(words).capitalize() + "."
+
+
+def near_duplicate(fact, rng):
+    words = fact.rstrip(".").split()
+    words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words) + "."
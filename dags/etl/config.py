@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -21,4 +22,48 @@ class Config:
     # resource_url = "https://raw.githubusercontent.com/vetstoria/random-k9-etl/main/source_data.json"  # noqa
     # resource_url = "http://127.0.0.1:5000/api/data"
     resource_url = "https://shark-app-6yuld.ondigitalocean.app/api/data"
+    # local file, or glob pattern of files, read instead of resource_url,
+    # e.g. to replay archived dumps; may be gzip/bz2/xz/zstd/brotli packed
+    resource_path = os.getenv("RESOURCE_PATH")
+    # directory caching the ETag / Last-Modified of resource_url, so an
+    # unchanged feed is not downloaded again; unset disables the cache
+    http_cache_dir = os.getenv("HTTP_CACHE_DIR")
+    # comma separated feeds fetched concurrently instead of resource_url
+    resource_urls = [
+        url.strip()
+        for url in (os.getenv("RESOURCE_URLS") or "").split(",")
+        if url.strip()
+    ]
+    # feeds fetched at the same time, overall and from a single host
+    extract_workers = int(os.getenv("EXTRACT_WORKERS") or 8)
+    extract_per_host_limit = int(os.getenv("EXTRACT_PER_HOST_LIMIT") or 4)
+    # "orjson", "msgspec", "json", or "auto" for the fastest one installed
+    json_decoder = os.getenv("JSON_DECODER") or "auto"
+    # hold the records as compact Fact objects instead of dictionaries
+    typed_facts = os.getenv("TYPED_FACTS", "").lower() == "true"
     db_uri = os.getenv("DB_URI")
+    # "postgres", or "memory" to run without a database, e.g. for profiling
+    repository = os.getenv("REPOSITORY") or "postgres"
+    # parse the feed incrementally while it is downloaded
+    stream_extract = os.getenv("STREAM_EXTRACT", "").lower() == "true"
+    # only process the records created since the newest one already loaded
+    incremental = os.getenv("INCREMENTAL", "").lower() == "true"
+    # query parameter passing that watermark to the source, if it filters
+    watermark_param = os.getenv("WATERMARK_PARAM")
+    # transform and load in chunks of this many records, 0 disables chunking
+    transform_chunk_size = int(os.getenv("TRANSFORM_CHUNK_SIZE") or 0)
+    # processes running the CPU-bound transform stages, 1 disables the pool
+    transform_workers = int(os.getenv("TRANSFORM_WORKERS") or 1)
+    # one of "words", "shingles" or "tfidf", see FactVersionManager
+    lsh_tokenizer = os.getenv("LSH_TOKENIZER") or "words"
+    # MinHash permutations, bands (b) and rows per band (r) of the LSH
+    lsh_num_perm = int(os.getenv("LSH_NUM_PERM") or 128)
+    lsh_bands = int(os.getenv("LSH_BANDS") or 20)
+    lsh_rows_per_band = int(os.getenv("LSH_ROWS_PER_BAND") or 3)
+    # optional files the run metrics are written to with the summary report
+    metrics_json_path = os.getenv("METRICS_JSON_PATH")
+    metrics_prometheus_path = os.getenv("METRICS_PROMETHEUS_PATH")
+    # directory holding the intermediate files passed between DAG tasks
+    staging_dir = os.getenv("STAGING_DIR") or os.path.join(
+        tempfile.gettempdir(), "etl_staging"
+    )
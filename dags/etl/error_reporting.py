@@ -1,7 +1,24 @@
+from .metrics import metrics
+
+
 class ErrorReporter:
-    def __init__(self, logger, enable_console=False):
+    def __init__(
+        self,
+        logger,
+        enable_console=False,
+        metrics_json_path=None,
+        metrics_prometheus_path=None,
+    ):
+        """
+        :param metrics_json_path: An optional file the run metrics are
+        written to as JSON with the summary report
+        :param metrics_prometheus_path: An optional file the run metrics are
+        written to in the Prometheus textfile format with the summary report
+        """
         self.logger = logger
         self.enable_console = enable_console
+        self.metrics_json_path = metrics_json_path
+        self.metrics_prometheus_path = metrics_prometheus_path
         self.error_log = []
 
     def report_error(self, message):
@@ -21,6 +38,7 @@ class ErrorReporter:
             if self.error_log
             else "No errors occurred."
         )
+        summary_message += f"\nRun metrics:\n{metrics.to_json()}"
 
         # Log the summary report
         self.logger.info(summary_message)
@@ -29,6 +47,11 @@ class ErrorReporter:
         if self.enable_console:
             print(summary_message)
 
+        if self.metrics_json_path:
+            metrics.write_json(self.metrics_json_path)
+        if self.metrics_prometheus_path:
+            metrics.write_prometheus(self.metrics_prometheus_path)
+
         # Placeholder for future extension: Send summary via email, Slack, etc.
         # For example:
         # self.report_error_via_email(
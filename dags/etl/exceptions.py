@@ -2,3 +2,9 @@ class MalformedJsonError(Exception):
     """Raised when the JSON file is malformed and cannot be parsed."""
 
     pass
+
+
+class UnsupportedCompressionError(Exception):
+    """Raised when data is compressed with a codec that cannot be read."""
+
+    pass
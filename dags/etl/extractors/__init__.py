@@ -1,3 +1,19 @@
+from .base_extractor import NoNewData
+from .http_cache import HTTPCache
+from .json_file_extractor import JSONFileExtractor
 from .json_url_extractor import JSONURLExtractor
+from .multi_source_extractor import (
+    MultiSourceJSONExtractor,
+    page_urls,
+    set_query_param,
+)
 
-__all__ = ["JSONURLExtractor"]
+__all__ = [
+    "HTTPCache",
+    "JSONFileExtractor",
+    "JSONURLExtractor",
+    "MultiSourceJSONExtractor",
+    "NoNewData",
+    "page_urls",
+    "set_query_param",
+]
@@ -1,7 +1,22 @@
 from abc import ABC, abstractmethod
 
 
+class NoNewData(list):
+    """
+    Empty result of an extractor whose source has not changed since the last
+    successful run. `FactTransformer` and `FactsLoader` pass it through
+    without doing any work.
+    """
+
+
 class BaseExtractor(ABC):
     @abstractmethod
     def extract(self):
         pass
+
+    def commit(self):
+        """
+        Called once the extracted data has been loaded, e.g. to remember what
+        was fetched. Does nothing by default.
+        """
+        pass
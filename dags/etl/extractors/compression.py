@@ -0,0 +1,313 @@
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from abc import ABC, abstractmethod
+
+from ..exceptions import MalformedJsonError, UnsupportedCompressionError
+
+try:
+    import brotli
+except ImportError:  # optional, needed for "br" only
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, needed for "zstd" only
+    zstandard = None
+
+try:
+    from urllib3.response import HAS_ZSTD as urllib3_decodes_zstd
+except ImportError:  # urllib3 before 2.0
+    urllib3_decodes_zstd = False
+
+# file extensions of compressed payloads and their codecs, named like the
+# HTTP content codings
+compression_suffixes = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".br": "br",
+}
+
+
+def accept_encoding():
+    """
+    The `Accept-Encoding` header value listing the content codings the
+    extractors can decode: gzip and deflate, plus brotli and zstd when their
+    libraries are installed.
+    """
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None or urllib3_decodes_zstd:
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def compression_of(name):
+    """
+    The codec a payload is compressed with, judging by the extension of its
+    file name or URL, or None if it is not compressed.
+    """
+    path = name.split("?", 1)[0].lower()
+    for suffix, compression in compression_suffixes.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def strip_compression_suffix(name):
+    """
+    Remove the compression extension, e.g. turning "dump.ndjson.gz" into
+    "dump.ndjson", so the format can be told from the remaining extension.
+    """
+    path = name.split("?", 1)[0]
+    for suffix in compression_suffixes:
+        if path.lower().endswith(suffix):
+            return path[: -len(suffix)]
+    return path
+
+
+def decompress(stream, compression, source=None):
+    """
+    Wrap a binary stream so it is decompressed while it is read, without
+    holding the whole payload in memory.
+
+    :param stream: A binary file-like object
+    :param compression: One of the codecs of `compression_suffixes`, or
+    None to read the stream as it is
+    :param source: The file or URL the stream is read from, named in errors
+    :return: A binary file-like object yielding the decompressed bytes.
+    Raises `UnsupportedCompressionError` for an unknown codec or one whose
+    optional library is not installed. Reading it raises
+    `MalformedJsonError` if the data is corrupt or truncated.
+    """
+    if compression is None:
+        return stream
+    return io.BufferedReader(
+        DecompressedStream(
+            _open_decompressed(stream, compression), compression, source
+        )
+    )
+
+
+def _open_decompressed(stream, compression):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(stream)
+    if compression == "xz":
+        return lzma.LZMAFile(stream)
+    if compression == "zstd":
+        if zstandard is None:
+            raise UnsupportedCompressionError(
+                "Install zstandard to read zstd compressed data"
+            )
+        return ZstdReader(stream)
+    if compression == "br":
+        if brotli is None:
+            raise UnsupportedCompressionError(
+                "Install brotli to read brotli compressed data"
+            )
+        return BrotliReader(stream)
+    raise UnsupportedCompressionError(f"Unknown compression {compression}")
+
+
+def _corrupt_data_errors(compression):
+    """
+    The exceptions the codec raises on corrupt data. All of them raise
+    EOFError on truncated data.
+    """
+    if compression == "gzip":
+        # gzip.BadGzipFile is an OSError
+        return (EOFError, OSError, zlib.error)
+    if compression == "bz2":
+        return (EOFError, OSError)
+    if compression == "xz":
+        return (EOFError, lzma.LZMAError)
+    if compression == "zstd":
+        return (EOFError, zstandard.ZstdError)
+    return (EOFError, brotli.error)
+
+
+def response_body(response, url, stream=False):
+    """
+    The body of a response as a binary stream of uncompressed JSON.
+
+    The content coding of the transfer is undone by urllib3 where it can,
+    and here otherwise (zstd on urllib3 versions without zstd support). A
+    payload that is a compressed file, e.g. "dump.json.gz", is decompressed
+    by its extension unless the server declared it as the content coding.
+
+    :param response: A `requests` response
+    :param url: The URL the response was fetched from
+    :param stream: Whether the response was requested with `stream=True`, in
+    which case the body is read from the connection while it is parsed
+    """
+    decode_here = _decodes_zstd_here(response)
+    if stream:
+        response.raw.decode_content = not decode_here
+        body = response.raw
+    else:
+        body = io.BytesIO(response.content)
+    if decode_here:
+        body = decompress(body, "zstd", url)
+    return decompress(body, _payload_compression(response, url), url)
+
+
+def needs_decompression(response, url):
+    """
+    Tell whether the body `requests` decoded still has to be decompressed by
+    `response_body` before it can be parsed.
+    """
+    return (
+        _decodes_zstd_here(response)
+        or _payload_compression(response, url) is not None
+    )
+
+
+def _content_encoding(response):
+    content_encoding = response.headers.get("Content-Encoding") or ""
+    return str(content_encoding).strip().lower()
+
+
+def _decodes_zstd_here(response):
+    return _content_encoding(response) == "zstd" and not urllib3_decodes_zstd
+
+
+def _payload_compression(response, url):
+    if _content_encoding(response) not in ("", "identity"):
+        # the declared content coding already covers the compression
+        return None
+    return compression_of(url)
+
+
+class DecompressedStream(io.RawIOBase):
+    """
+    Raw stream reading from a decompressing file object, raising the codec's
+    errors on corrupt data as `MalformedJsonError` like the other parse
+    errors of the extractors.
+    """
+
+    def __init__(self, stream, compression, source=None):
+        self.stream = stream
+        self.compression = compression
+        self.source = source
+        self.errors = _corrupt_data_errors(compression)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            return self.stream.readinto(buffer)
+        except self.errors as e:
+            source = f" of {self.source}" if self.source else ""
+            raise MalformedJsonError(
+                f"The {self.compression} data{source} is corrupt: {e}"
+            ) from e
+
+    def close(self):
+        if not self.closed:
+            self.stream.close()
+        super().close()
+
+
+class ChunkDecompressor(io.RawIOBase, ABC):
+    """
+    Raw stream decompressing the data read from another binary stream chunk
+    by chunk. Subclasses implement `decompress` and `finished` for a codec;
+    note that the io base classes do not refuse to instantiate a subclass
+    missing them.
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        # the decompressed data before the offset has been read already
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.offset == len(self.buffer):
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                if not self.finished():
+                    raise EOFError(
+                        "Compressed file ended before the end-of-stream "
+                        "marker was reached"
+                    )
+                return 0
+            self.buffer = self.decompress(chunk)
+            self.offset = 0
+        size = min(len(buffer), len(self.buffer) - self.offset)
+        end = self.offset + size
+        buffer[:size] = self.buffer[self.offset:end]
+        self.offset = end
+        return size
+
+    @abstractmethod
+    def decompress(self, chunk):
+        """
+        Decompress the next chunk of compressed data, returning the bytes it
+        completes, possibly none.
+        """
+
+    @abstractmethod
+    def finished(self):
+        """
+        Tell whether the compressed data read so far ends at the end of the
+        stream, rather than within it.
+        """
+
+
+class BrotliReader(ChunkDecompressor):
+    """
+    Raw stream decompressing brotli data, as the brotli library has no file
+    object of its own.
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        super().__init__(stream, chunk_size)
+        self.decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk):
+        return self.decompressor.process(chunk)
+
+    def finished(self):
+        return self.decompressor.is_finished()
+
+
+class ZstdReader(ChunkDecompressor):
+    """
+    Raw stream decompressing zstd data of one or more frames. Unlike the
+    stream reader of the zstandard library, it tells data ending within a
+    frame apart from complete data.
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        super().__init__(stream, chunk_size)
+        self.zstd = zstandard.ZstdDecompressor()
+        self.decompressor = None
+
+    def decompress(self, chunk):
+        output = []
+        while chunk:
+            if self.finished():
+                # every frame needs a decompressor of its own
+                self.decompressor = self.zstd.decompressobj()
+            output.append(self.decompressor.decompress(chunk))
+            chunk = b""
+            if self.decompressor.eof:
+                # the data following the end of a frame starts the next one
+                chunk = self.decompressor.unused_data
+        return b"".join(output)
+
+    def finished(self):
+        return self.decompressor is None or self.decompressor.eof
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+from ..logging_config import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+
+class HTTPCache:
+    """
+    On-disk cache of the validators (`ETag` and `Last-Modified`) of fetched
+    resources, one small JSON file per URL.
+
+    The validators are sent back as `If-None-Match` and `If-Modified-Since`,
+    so an unchanged resource is answered with `304 Not Modified` instead of
+    its full body. Store them only once the data of the response has been
+    loaded, otherwise a failed run would skip that data on the next attempt.
+    """
+
+    def __init__(self, directory):
+        """
+        :param directory: The directory holding the cached validators, created
+        if it does not exist
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, url):
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{url_hash}.json")
+
+    def get(self, url):
+        """
+        Read the validators stored for `url`.
+
+        :return: A dictionary with the "etag" and "last_modified" of the
+        resource, or None if nothing is stored or the file is unreadable
+        """
+        try:
+            with open(self.path(url), encoding="utf8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logging.warning(f"Ignoring the corrupt HTTP cache entry of {url}")
+            return None
+
+    def conditional_headers(self, url):
+        """
+        The headers making the request for `url` conditional on the resource
+        having changed since the stored validators.
+        """
+        validators = self.get(url) or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    @staticmethod
+    def validators(response):
+        """
+        Read the validators of a response.
+
+        :return: A dictionary with the "etag" and "last_modified" of the
+        response, or None if it has neither
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return None
+        return {"etag": etag, "last_modified": last_modified}
+
+    def store(self, url, validators):
+        """
+        Store the validators of `url`, as returned by `validators`. For None,
+        i.e. a response without validators, the validators stored before are
+        removed, as they no longer describe the resource.
+        """
+        if validators is None:
+            self.remove(url)
+            return
+        path = self.path(url)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf8") as file:
+            json.dump(validators, file)
+        os.replace(temporary_path, path)
+        logging.info(f"Stored the HTTP validators of {url}")
+
+    def remove(self, url):
+        """
+        Remove the validators stored for `url`, so it is fetched
+        unconditionally.
+        """
+        try:
+            os.remove(self.path(url))
+        except FileNotFoundError:
+            return
+        logging.info(f"Removed the HTTP validators of {url}")
@@ -0,0 +1,92 @@
+import glob
+
+from ..json_decoder import get_decoder
+from ..logging_config import LoggerManager
+from .base_extractor import BaseExtractor
+from .compression import compression_of, decompress, strip_compression_suffix
+from .json_stream import decode_json_records, iter_json_records
+
+logging = LoggerManager.get_logger(__name__)
+
+
+class JSONFileExtractor(BaseExtractor):
+    """
+    Extractor reading records from local files, e.g. to replay or backfill
+    from archived dumps of the feed.
+
+    The files may hold a JSON array or newline-delimited JSON, and may be
+    compressed with gzip, bzip2, xz, zstd or brotli, told apart by their
+    extensions (".json.gz", ".ndjson.zst", ...). They are decompressed and
+    parsed incrementally in stream mode, and otherwise read whole and decoded
+    at once with the fast decoder, like `JSONURLExtractor` does.
+    """
+
+    def __init__(self, path, stream=False, ndjson=None, decoder=None):
+        """
+        :param path: The path of the file, or a glob pattern matching several
+        files, e.g. "archive/*.ndjson.gz", which are read in name order
+        :param stream: When True, `extract` returns a generator yielding the
+        records while the files are read
+        :param ndjson: Whether the files are newline-delimited JSON. When
+        None, it is detected for each file from its extension.
+        :param decoder: The function decoding JSON, see `get_decoder`; the
+        fastest one installed by default. Only the lines of newline-delimited
+        JSON are decoded with it in stream mode.
+        """
+        logging.info("Initialize file extractor")
+        self.path = path
+        self.stream = stream
+        self.ndjson = ndjson
+        self.decoder = decoder or get_decoder()
+
+    def paths(self):
+        """
+        The files to read, sorted by name. Raises `FileNotFoundError` if
+        nothing matches.
+        """
+        paths = sorted(glob.glob(self.path))
+        if len(paths) == 0:
+            raise FileNotFoundError(f"No files match {self.path}")
+        return paths
+
+    @LoggerManager.log_execution
+    def extract(self):
+        """
+        Read the records of all the files.
+
+        :return: A list of the records, or in stream mode a generator yielding
+        them. Raises `MalformedJsonError` on malformed input, while iterating
+        in stream mode.
+        """
+        if self.stream:
+            return self.extract_stream(self.paths())
+        records = []
+        for path in self.paths():
+            logging.info(f"Reading {path}")
+            with open(path, "rb") as file:
+                document = decompress(file, compression_of(path), path).read()
+            records.extend(
+                decode_json_records(
+                    document, ndjson=self.is_ndjson(path), decoder=self.decoder
+                )
+            )
+        return records
+
+    def extract_stream(self, paths):
+        for path in paths:
+            logging.info(f"Reading {path}")
+            with open(path, "rb") as file:
+                yield from iter_json_records(
+                    decompress(file, compression_of(path), path),
+                    ndjson=self.is_ndjson(path),
+                    decoder=self.decoder,
+                )
+
+    def is_ndjson(self, path):
+        """
+        Tell from its extension whether a file holds newline-delimited JSON,
+        unless it was configured explicitly.
+        """
+        if self.ndjson is not None:
+            return self.ndjson
+        return strip_compression_suffix(path).endswith((".ndjson", ".jsonl"))
@@ -0,0 +1,69 @@
+import io
+import json
+
+import ijson
+
+from ..exceptions import MalformedJsonError
+from ..logging_config import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+
+def iter_json_records(stream, ndjson=False, decoder=None):
+    """
+    Incrementally parse records from a binary stream without loading the
+    whole payload into memory.
+
+    :param stream: A binary file-like object holding either a JSON array of
+    records or newline-delimited JSON (one record per line)
+    :param ndjson: Whether the stream holds newline-delimited JSON
+    :param decoder: The function decoding each line of newline-delimited
+    JSON, see `get_decoder`; `json.loads` by default. JSON arrays are parsed
+    incrementally by ijson.
+    :return: A generator yielding the records one by one. Raises
+    `MalformedJsonError` while iterating if the payload cannot be parsed.
+    """
+    if ndjson:
+        decode = decoder or json.loads
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield decode(line)
+            except ValueError as e:
+                logging.error(f"Malformed JSON on line {line_number}")
+                raise MalformedJsonError("The JSON file is malformed") from e
+        return
+
+    try:
+        yield from ijson.items(stream, "item", use_float=True)
+    except ijson.JSONError as e:
+        logging.error("The JSON file is malformed")
+        raise MalformedJsonError("The JSON file is malformed") from e
+
+
+def decode_json_records(document, ndjson=False, decoder=None):
+    """
+    Decode a whole payload already held in memory, which is faster than
+    parsing it incrementally.
+
+    :param document: The payload as bytes, holding either a JSON array of
+    records or newline-delimited JSON
+    :param ndjson: Whether the payload is newline-delimited JSON
+    :param decoder: The function decoding JSON, see `get_decoder`;
+    `json.loads` by default
+    :return: The decoded records. Raises `MalformedJsonError` if the payload
+    cannot be parsed.
+    """
+    if ndjson:
+        return list(
+            iter_json_records(
+                io.BytesIO(document), ndjson=True, decoder=decoder
+            )
+        )
+    decode = decoder or json.loads
+    try:
+        return decode(document)
+    except ValueError as e:
+        logging.error("The JSON file is malformed")
+        raise MalformedJsonError("The JSON file is malformed") from e
@@ -3,19 +3,98 @@ import time
 import requests
 
 from ..exceptions import MalformedJsonError
+from ..json_decoder import get_decoder
 from ..logging_config import LoggerManager
-from .base_extractor import BaseExtractor
+from .base_extractor import BaseExtractor, NoNewData
+from .compression import (
+    accept_encoding,
+    needs_decompression,
+    response_body,
+    strip_compression_suffix,
+)
+from .json_stream import decode_json_records, iter_json_records
 
 logging = LoggerManager.get_logger(__name__)
 
 
+def get_with_backoff(get, url, retries=3, timeout=5, **kwargs):
+    """
+    Make a GET request with retries and exponential backoff in case of
+    connection errors or timeouts.
+
+    :param get: The function making the request, e.g. `requests.get` or the
+    `get` method of a shared `requests.Session`
+    :param url: The URL to request
+    :param retries: The number of attempts before giving up
+    :param timeout: The timeout of each attempt in seconds
+    :return: The response of the first successful attempt, after raising for
+    an error status. The exception of the final attempt is raised if all of
+    them fail.
+    """
+    for attempt in range(retries):
+        try:
+            logging.info(f"Attempt {attempt+1}/{retries}")
+            logging.info(f"Connecting to: {url}")
+            response = get(url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+            return response
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as e:
+            if attempt < retries - 1:
+                sleep_time = 2**attempt
+                logging.error(f"Failed to reach resource at {url}")
+                logging.error(f"Trying after: {sleep_time}s")
+                time.sleep(sleep_time)  # Exponential backoff
+            else:
+                logging.error(f"Failed to reach resource at {url}: {e}")
+                raise e  # Raise the exception after final retry
+
+
+def is_ndjson_response(response, url):
+    """
+    Tell from the content type of the response, or the extension of the URL,
+    whether it holds newline-delimited JSON.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    path = strip_compression_suffix(url)
+    return (
+        "ndjson" in content_type
+        or "jsonl" in content_type
+        or path.endswith((".ndjson", ".jsonl"))
+    )
+
+
 class JSONURLExtractor(BaseExtractor):
-    def __init__(self, url):
+    def __init__(
+        self, url, stream=False, ndjson=None, cache=None, decoder=None
+    ):
+        """
+        :param url: The URL of the JSON resource
+        :param stream: When True, `extract` returns a generator yielding the
+        records while the body is downloaded and parsed incrementally
+        :param ndjson: Whether the resource is newline-delimited JSON. When
+        None, it is detected from the response content type and URL.
+        :param cache: An optional `HTTPCache`. The resource is then requested
+        conditionally and `extract` returns `NoNewData` if it has not changed
+        since the validators stored by the last `commit`.
+        :param decoder: The function decoding JSON, see `get_decoder`; the
+        fastest one installed by default
+        """
         logging.info("Initialize extractor")
         self.url = url
+        self.stream = stream
+        self.ndjson = ndjson
+        self.cache = cache
+        self.decoder = decoder or get_decoder()
+        # validators of the last response, stored by `commit`
+        self.validators = None
+        # whether the last request was answered with the resource
+        self.modified = False
 
     @LoggerManager.log_execution
-    def get_resource(self):
+    def get_resource(self, stream=False):
         """
         The function `get_resource` makes a GET request to a specified URL with
         retries and exponential backoff in case of connection errors or
@@ -29,28 +108,12 @@ class JSONURLExtractor(BaseExtractor):
         retries fail, an error message is logged, and the original exception is
         raised
         """
-        retries = 3
-        for attempt in range(retries):
-            try:
-                logging.info(f"Attempt {attempt+1}/{retries}")
-                logging.info(f"Connecting to: {self.url}")
-                response = requests.get(self.url, timeout=5)
-                response.raise_for_status()
-                return response
-            except (
-                requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout,
-            ) as e:
-                if attempt < retries - 1:
-                    sleep_time = 2**attempt
-                    logging.error(f"Failed to reach resource at {self.url}")
-                    logging.error(f"Trying after: {sleep_time}s")
-                    time.sleep(sleep_time)  # Exponential backoff
-                else:
-                    logging.error(
-                        f"Failed to reach resource at {self.url}: {e}"
-                    )
-                    raise e  # Raise the exception after final retry
+        headers = {"Accept-Encoding": accept_encoding()}
+        if self.cache is not None:
+            headers.update(self.cache.conditional_headers(self.url))
+        return get_with_backoff(
+            requests.get, self.url, stream=stream, headers=headers
+        )
 
     @LoggerManager.log_execution
     def extract(self):
@@ -62,19 +125,70 @@ class JSONURLExtractor(BaseExtractor):
         JSON data. If there are errors such as an invalid file type or
         malformed JSON, it will log an error message and raise the
         corresponding custom exception (`InvalidFileTypeError` or
-        `MalformedJsonError`).
+        `MalformedJsonError`). In stream mode a generator of records is
+        returned instead, see `extract_stream`. `NoNewData` is returned if
+        the resource has not been modified since the last commit.
         """
+        response = self.get_resource(stream=self.stream)
+        self.modified = response.status_code != 304
+        if not self.modified:
+            logging.info(f"{self.url} has not been modified")
+            response.close()
+            return NoNewData()
+        if self.cache is not None:
+            self.validators = self.cache.validators(response)
+        if self.stream:
+            return self.extract_stream(response)
         try:
-            response = self.get_resource()
-
-            # Attempt to parse JSON content
-            try:
-                logging.info("Attempt to parse json")
-                return response.json()
-            except ValueError as e:
-                logging.error("The JSON file is malformed")
-                raise MalformedJsonError("The JSON file is malformed") from e
-
+            if needs_decompression(response, self.url):
+                # e.g. a compressed dump
+                document = response_body(response, self.url).read()
+            else:
+                document = response.content
+            logging.info("Attempt to parse json")
+            return decode_json_records(
+                document,
+                ndjson=self.is_ndjson(response),
+                decoder=self.decoder,
+            )
         except MalformedJsonError as e:
             logging.error(f"Error extracting data: {e}")
             raise
+
+    def extract_stream(self, response=None):
+        """
+        Stream the resource and yield its records as they are parsed, so
+        neither the raw body nor the full list of records is held in memory.
+        Raises `MalformedJsonError` while iterating on malformed input.
+
+        :param response: The streamed response to read, requested if omitted
+        """
+        if response is None:
+            response = self.get_resource(stream=True)
+        try:
+            yield from iter_json_records(
+                response_body(response, self.url, stream=True),
+                ndjson=self.is_ndjson(response),
+                decoder=self.decoder,
+            )
+        finally:
+            response.close()
+
+    def commit(self):
+        """
+        Store the validators of the extracted resource in the cache, so the
+        next run only downloads it again if it changed. Call once the data
+        has been loaded. The validators stored before are removed if the
+        resource came without any, and kept if it was not modified.
+        """
+        if self.cache is not None and self.modified:
+            self.cache.store(self.url, self.validators)
+
+    def is_ndjson(self, response):
+        """
+        Tell whether the response holds newline-delimited JSON, unless it was
+        configured explicitly.
+        """
+        if self.ndjson is not None:
+            return self.ndjson
+        return is_ndjson_response(response, self.url)
@@ -0,0 +1,213 @@
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..json_decoder import get_decoder
+from ..logging_config import LoggerManager
+from .base_extractor import BaseExtractor
+from .compression import accept_encoding, response_body
+from .json_stream import decode_json_records
+from .json_url_extractor import get_with_backoff, is_ndjson_response
+
+logging = LoggerManager.get_logger(__name__)
+
+
+def set_query_param(url, param, value):
+    """
+    Add a query parameter to a URL, replacing any value it already has.
+    """
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    query_params = [
+        (key, current_value)
+        for key, current_value in parse_qsl(query, keep_blank_values=True)
+        if key != param
+    ]
+    return urlunsplit(
+        (
+            scheme,
+            netloc,
+            path,
+            urlencode(query_params + [(param, value)]),
+            fragment,
+        )
+    )
+
+
+def page_urls(url, pages, param="page", start=1):
+    """
+    Build the URLs of the pages of a paginated resource.
+
+    :param url: The URL of the resource, with or without a query string
+    :param pages: The number of pages to fetch
+    :param param: The query parameter holding the page number
+    :param start: The number of the first page
+    :return: A list with the URL of every page
+    """
+    return [
+        set_query_param(url, param, page)
+        for page in range(start, start + pages)
+    ]
+
+
+class MultiSourceJSONExtractor(BaseExtractor):
+    """
+    Extractor fetching many JSON resources, e.g. several partner feeds or the
+    pages of a paginated feed, concurrently on a thread pool.
+
+    All requests share one `requests.Session`, so connections are kept alive
+    and reused, and go through `get_with_backoff` like `JSONURLExtractor`.
+    The number of requests in flight to the same host is limited, so a single
+    partner is not flooded when it serves many of the URLs. The URLs of each
+    host wait in a queue of their own and are only handed to the pool while
+    the host is below its limit, so a slow host never holds up workers that
+    could fetch from the other hosts.
+    """
+
+    def __init__(
+        self,
+        urls,
+        max_workers=8,
+        per_host_limit=4,
+        ndjson=None,
+        session=None,
+        decoder=None,
+    ):
+        """
+        :param urls: The URLs of the JSON resources
+        :param max_workers: The number of resources fetched at the same time
+        :param per_host_limit: The number of resources fetched at the same
+        time from a single host. Both limits must be at least 1.
+        :param ndjson: Whether the resources are newline-delimited JSON. When
+        None, it is detected for each response from its content type and URL.
+        :param session: The `requests.Session` to share. By default a new one
+        is created, and closed once `extract` is done.
+        :param decoder: The function decoding JSON, see `get_decoder`; the
+        fastest one installed by default
+        """
+        logging.info("Initialize multi-source extractor")
+        if max_workers < 1:
+            raise ValueError(
+                f"max_workers must be at least 1, not {max_workers}"
+            )
+        if per_host_limit < 1:
+            raise ValueError(
+                f"per_host_limit must be at least 1, not {per_host_limit}"
+            )
+        self.urls = list(urls)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.ndjson = ndjson
+        self.owns_session = session is None
+        self.session = session or self.create_session()
+        self.decoder = decoder or get_decoder()
+
+    def create_session(self):
+        """
+        Create a session keeping a connection per worker alive for each host.
+        """
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = accept_encoding()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @LoggerManager.log_execution
+    def fetch_page(self, url):
+        """
+        Fetch a single resource and parse its records.
+
+        :param url: The URL of the resource
+        :return: A list of the records of the resource. Raises the exception
+        of the final attempt if the resource cannot be reached, and
+        `MalformedJsonError` if it cannot be parsed.
+        """
+        response = get_with_backoff(self.session.get, url)
+        ndjson = self.ndjson
+        if ndjson is None:
+            ndjson = is_ndjson_response(response, url)
+        return decode_json_records(
+            response_body(response, url).read(), ndjson, decoder=self.decoder
+        )
+
+    def extract(self):
+        """
+        Fetch all the resources concurrently.
+
+        :return: A generator yielding the records of each resource as soon as
+        it has been fetched, in the order the resources complete. If fetching
+        any of them fails, the resources not started yet are cancelled and the
+        error is raised. A session created by the extractor is closed once
+        the generator is done.
+        """
+        return self.extract_stream()
+
+    def extract_stream(self):
+        try:
+            yield from self.fetch_all()
+        finally:
+            # after the pool has shut down, so no request is still using it
+            if self.owns_session:
+                self.close()
+
+    def fetch_all(self):
+        """
+        Fetch the resources on the thread pool. Each host's URLs are handed
+        to the pool one at a time per free slot of the host, as its earlier
+        requests complete.
+
+        :return: A generator yielding the records of the resources in the
+        order they complete
+        """
+        host_urls = defaultdict(deque)
+        for url in self.urls:
+            host_urls[urlsplit(url).netloc].append(url)
+
+        results = queue.Queue()
+        lock = threading.Lock()
+        futures = []
+        stopped = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def submit_next(host):
+                with lock:
+                    if stopped or len(host_urls[host]) == 0:
+                        return
+                    url = host_urls[host].popleft()
+                    future = executor.submit(self.fetch_page, url)
+                    futures.append(future)
+                future.add_done_callback(
+                    lambda future: fetched(host, url, future)
+                )
+
+            def fetched(host, url, future):
+                results.put((url, future))
+                # the host has a free slot for its next URL
+                submit_next(host)
+
+            try:
+                for host in list(host_urls):
+                    for _ in range(self.per_host_limit):
+                        submit_next(host)
+
+                for _ in range(len(self.urls)):
+                    url, future = results.get()
+                    records = future.result()
+                    logging.info(f"Fetched {len(records)} records from {url}")
+                    yield from records
+            finally:
+                with lock:
+                    stopped = True
+                for future in list(futures):
+                    future.cancel()
+
+    def close(self):
+        self.session.close()
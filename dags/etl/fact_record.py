@@ -0,0 +1,166 @@
+from collections.abc import MutableMapping
+
+from .extractors.base_extractor import NoNewData
+from .logging_config import LoggerManager
+from .metrics import metrics
+
+logging = LoggerManager.get_logger(__name__)
+
+
+class Fact(MutableMapping):
+    """
+    Compact record of a fact, used in place of the dictionary decoded from
+    the feed.
+
+    The fields the pipeline reads and sets are stored in slots, so a record
+    takes a fraction of the memory of a dictionary. Other keys of the source
+    record are kept in `extra`, which is only allocated when there are any.
+    Records behave as mutable mappings, so every stage of the pipeline works
+    on them unchanged, and compare equal to dictionaries with the same items.
+
+    A `Fact` always holds the `required_fields`, so `FactTransformer` does
+    not check them again.
+    """
+
+    fields = (
+        "fact",
+        "created_date",
+        "parsed_date",
+        "fact_hash",
+        "bucket_hashes",
+        "is_numeric",
+        "fact_number",
+        "previous_fact_hash",
+        "is_current",
+    )
+    required_fields = ("fact", "created_date")
+    __slots__ = fields + ("extra",)
+
+    def __init__(self, fact, created_date, **values):
+        self.fact = fact
+        self.created_date = created_date
+        self.extra = None
+        for key, value in values.items():
+            self[key] = value
+
+    @classmethod
+    def from_record(cls, record, required_keys=()):
+        """
+        Build a fact from a decoded record.
+
+        :param record: A mapping, e.g. a decoded JSON object
+        :param required_keys: Keys the record must hold on top of the
+        `required_fields`
+        :return: The fact, or None if the record misses a required key
+        """
+        for key in cls.required_fields + tuple(required_keys):
+            if key not in record:
+                return None
+        fact = cls.__new__(cls)
+        fact.extra = None
+        for key, value in record.items():
+            fact[key] = value
+        return fact
+
+    def __getitem__(self, key):
+        if key in _field_names:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _field_names:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _field_names:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _field_names:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for key in self.fields:
+            if hasattr(self, key):
+                yield key
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Fact({dict(self)!r})"
+
+
+_field_names = frozenset(Fact.fields)
+
+
+def to_facts(records, required_keys=()):
+    """
+    Turn decoded records into `Fact` records, dropping the records that miss
+    a required key. The records are decoded as dictionaries first; the
+    required keys are checked when they are converted, not while decoding.
+
+    A list, as returned by the extractors outside of stream mode, is
+    converted in place: each dictionary is replaced by its fact, so it can be
+    freed as soon as it is converted unless the caller still references it.
+    Other iterables, e.g. the generators of stream mode, are converted while
+    they are read.
+
+    :param records: An iterable of decoded records, e.g. from an extractor
+    :param required_keys: Keys the records must hold on top of
+    `Fact.required_fields`
+    :return: The same list holding the facts, or for other iterables a
+    generator yielding them. `NoNewData` is returned as it is.
+    """
+    if isinstance(records, NoNewData):
+        return records
+    if isinstance(records, list):
+        return _convert_in_place(records, required_keys)
+    return _iter_facts(records, required_keys)
+
+
+def _to_fact(record, required_keys):
+    fact = Fact.from_record(record, required_keys)
+    if fact is None:
+        logging.info(f"Record dropped: {record}")
+        metrics.record_drop("to_facts", "missing_keys")
+    return fact
+
+
+def _convert_in_place(records, required_keys):
+    kept = 0
+    for position, record in enumerate(records):
+        records[position] = None
+        fact = _to_fact(record, required_keys)
+        del record
+        if fact is not None:
+            records[kept] = fact
+            kept += 1
+    del records[kept:]
+    return records
+
+
+def _iter_facts(records, required_keys):
+    for record in records:
+        fact = _to_fact(record, required_keys)
+        if fact is not None:
+            yield fact
@@ -0,0 +1,72 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, the fastest decoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional, used if orjson is not installed
+    msgspec = None
+
+# decoders in order of preference for "auto"
+preference = ("orjson", "msgspec", "json")
+
+
+def _json_decoder():
+    return json.loads
+
+
+def _orjson_decoder():
+    if orjson is None:
+        raise ImportError("Install orjson to use the orjson decoder")
+    # orjson.JSONDecodeError is a ValueError
+    return orjson.loads
+
+
+def _msgspec_decoder():
+    if msgspec is None:
+        raise ImportError("Install msgspec to use the msgspec decoder")
+    decoder = msgspec.json.Decoder()
+
+    def decode(document):
+        try:
+            return decoder.decode(document)
+        except msgspec.DecodeError as e:
+            # raised as a ValueError like the other decoders
+            raise ValueError(str(e)) from e
+
+    return decode
+
+
+decoder_factories = {
+    "orjson": _orjson_decoder,
+    "msgspec": _msgspec_decoder,
+    "json": _json_decoder,
+}
+
+
+def available_decoders():
+    """
+    The names of the decoders that can be used, in order of preference.
+    """
+    installed = {"orjson": orjson, "msgspec": msgspec, "json": json}
+    return [name for name in preference if installed[name] is not None]
+
+
+def get_decoder(name="auto"):
+    """
+    Return a function decoding a JSON document, given as bytes or str, into
+    Python objects. Malformed documents raise a ValueError whatever the
+    decoder.
+
+    :param name: One of "orjson", "msgspec" or "json", or "auto" for the
+    fastest one installed. Raises an ImportError if the requested decoder is
+    not installed, and a ValueError for an unknown name.
+    """
+    if name is None or name == "auto":
+        name = available_decoders()[0]
+    if name not in decoder_factories:
+        raise ValueError(f"Unknown JSON decoder {name}")
+    return decoder_factories[name]()
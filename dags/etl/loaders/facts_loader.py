@@ -1,9 +1,21 @@
+from ..extractors.base_extractor import NoNewData
+from ..logging_config import LoggerManager
 from .base_loader import BaseLoader
 
+logging = LoggerManager.get_logger(__name__)
+
 
 class FactsLoader(BaseLoader):
-    def __init__(self, data_repository):
+    # name of the etl_state row holding the watermark of incremental runs
+    watermark_name = "watermark"
+
+    def __init__(self, data_repository, records_loaded=0):
+        """
+        :param records_loaded: The number of records an interrupted chunked
+        run already loaded, carried over into the next checkpoints
+        """
         self.data_repository = data_repository
+        self.records_loaded = records_loaded
 
     def load(self, data, expired_data):
         """
@@ -13,6 +25,61 @@ class FactsLoader(BaseLoader):
         :param data: The method takes a parameter `data`, which is expected to
         be a list of dictionaries where each dictionary represents a row to be
         inserted into the s`facts` table
+        :param expired_data: A list of fact ids to mark as expired. The number
+        of rows the repository reports as expired is checked against it.
+        Nothing is loaded for `NoNewData`.
         """
-        self.data_repository.mark_as_expired(expired_data)
+        if isinstance(data, NoNewData):
+            logging.info("No new data to load")
+            return
+        expired_count = self.data_repository.mark_as_expired(expired_data)
+        self.check_expired_count(expired_data, expired_count)
         self.data_repository.save_facts_batch(data)
+
+    def load_chunk(self, data, expired_data, checkpoint_name):
+        """
+        Load one chunk of a chunked run and record how far the run got, all
+        in one transaction.
+
+        :param data: The transformed facts of the chunk, sorted by created
+        date
+        :param expired_data: A list of fact ids to mark as expired
+        :param checkpoint_name: The name the run's checkpoint is stored under
+        :return: The checkpoint stored for the chunk
+        """
+        newest = max(data, key=lambda fact: fact["created_date"])
+        checkpoint = {
+            "last_created_date": newest["created_date"],
+            "last_fact_hash": newest["fact_hash"],
+            "records_loaded": self.records_loaded + len(data),
+        }
+        expired_count = self.data_repository.load_facts_chunk(
+            data, expired_data, checkpoint_name, checkpoint
+        )
+        self.check_expired_count(expired_data, expired_count)
+        self.records_loaded = checkpoint["records_loaded"]
+        return checkpoint
+
+    def load_with_watermark(self, data, expired_data):
+        """
+        Load the data like `load` and advance the watermark to the newest
+        created date loaded, all in one transaction. The next incremental run
+        then skips the records created before it.
+
+        :param data: The transformed facts
+        :param expired_data: A list of fact ids to mark as expired
+        :return: The stored watermark, or None if there was nothing to load
+        and the watermark was left as it is
+        """
+        if len(data) == 0:
+            self.load(data, expired_data)
+            return None
+        return self.load_chunk(data, expired_data, self.watermark_name)
+
+    def check_expired_count(self, expired_data, expired_count):
+        expected_count = len(set(expired_data))
+        if expired_count != expected_count:
+            logging.warning(
+                f"Expected to expire {expected_count} fact(s), "
+                f"but {expired_count} were updated"
+            )
@@ -3,6 +3,8 @@ import logging
 import time
 from logging.handlers import RotatingFileHandler
 
+from .metrics import count_records, metrics
+
 
 class LoggerManager:
     @staticmethod
@@ -33,17 +35,39 @@ class LoggerManager:
 
     @staticmethod
     def log_execution(func):
+        """
+        Log the start and duration of each call, and record the call's wall
+        and CPU time and its input and output record counts as stage metrics.
+        """
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             logger = logging.getLogger(func.__module__)
             logger.info(f"Starting {func.__name__} function")
+            input_count = next(
+                (
+                    count
+                    for count in map(count_records, args)
+                    if count is not None
+                ),
+                None,
+            )
+            result = None
             start_time = time.time()
+            start_cpu_time = time.process_time()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
                 end_time = time.time()
                 elapsed_time = end_time - start_time
+                metrics.record_stage(
+                    func.__qualname__,
+                    elapsed_time,
+                    time.process_time() - start_cpu_time,
+                    input_count,
+                    count_records(result),
+                )
                 logger.info(
                     f"Finished {func.__name__} function in {elapsed_time:.4f} seconds"  # noqa
                 )
@@ -0,0 +1,264 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class Metrics:
+    """
+    Collects the metrics of a pipeline run: wall and CPU time plus input and
+    output counts per stage, dropped records by stage and reason, database
+    round trips and their latency per statement type, and the peak resident
+    set size of the process.
+
+    Stages are recorded by `LoggerManager.log_execution`, database round
+    trips by the cursors of `PostgresRepository`. Use the module-level
+    `metrics` instance and `reset` it at the start of a run.
+    """
+
+    def __init__(self):
+        # stages and database calls may be recorded from several threads
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.time()
+        self.merged_peak_rss_bytes = None
+        self.stages = defaultdict(
+            lambda: {
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "input_count": 0,
+                "output_count": 0,
+            }
+        )
+        self.drops = defaultdict(int)
+        self.db = defaultdict(
+            lambda: {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+
+    def record_stage(
+        self, name, wall_seconds, cpu_seconds, input_count, output_count
+    ):
+        with self.lock:
+            stage = self.stages[name]
+            stage["calls"] += 1
+            stage["wall_seconds"] += wall_seconds
+            stage["cpu_seconds"] += cpu_seconds
+            stage["input_count"] += input_count or 0
+            stage["output_count"] += output_count or 0
+
+    def record_drop(self, stage, reason, count=1):
+        with self.lock:
+            self.drops[(stage, reason)] += count
+
+    def merge_drops(self, drops):
+        """
+        Add drop counts collected elsewhere, e.g. in a worker process, given
+        as `(stage, reason, count)` tuples.
+        """
+        for stage, reason, count in drops:
+            self.record_drop(stage, reason, count)
+
+    def drop_counts(self):
+        return [
+            (stage, reason, count)
+            for (stage, reason), count in self.drops.items()
+        ]
+
+    def record_db_call(self, operation, seconds):
+        with self.lock:
+            call = self.db[operation]
+            call["calls"] += 1
+            call["total_seconds"] += seconds
+            call["max_seconds"] = max(call["max_seconds"], seconds)
+
+    @contextlib.contextmanager
+    def track_db(self, operation):
+        """
+        Time a database round trip of the given operation, e.g. "SELECT".
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_db_call(operation, time.perf_counter() - start_time)
+
+    def merge_summary(self, summary):
+        """
+        Add the metrics another process collected, e.g. an Airflow task, given
+        as returned by its `summary`.
+        """
+        for name, stage in summary["stages"].items():
+            merged_stage = self.stages[name]
+            for field, value in stage.items():
+                merged_stage[field] += value
+        for drop in summary["drops"]:
+            self.record_drop(drop["stage"], drop["reason"], drop["count"])
+        for operation, call in summary["db"].items():
+            merged_call = self.db[operation]
+            merged_call["calls"] += call["calls"]
+            merged_call["total_seconds"] += call["total_seconds"]
+            merged_call["max_seconds"] = max(
+                merged_call["max_seconds"], call["max_seconds"]
+            )
+        if summary["peak_rss_bytes"] is not None:
+            self.merged_peak_rss_bytes = max(
+                self.merged_peak_rss_bytes or 0, summary["peak_rss_bytes"]
+            )
+
+    def peak_rss_bytes(self):
+        """
+        The peak resident set size of the process so far, or of any process
+        merged in if higher. None where the `resource` module is not
+        available.
+        """
+        if resource is None:
+            return self.merged_peak_rss_bytes
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # reported in bytes on macOS and in kilobytes elsewhere
+        if sys.platform != "darwin":
+            peak_rss *= 1024
+        return max(peak_rss, self.merged_peak_rss_bytes or 0)
+
+    def summary(self):
+        """
+        The metrics of the run so far as a JSON serializable dictionary.
+        """
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": time.time() - self.started_at,
+            "peak_rss_bytes": self.peak_rss_bytes(),
+            "stages": {
+                name: dict(stage) for name, stage in self.stages.items()
+            },
+            "drops": [
+                {"stage": stage, "reason": reason, "count": count}
+                for stage, reason, count in self.drop_counts()
+            ],
+            "db": {
+                operation: dict(call) for operation, call in self.db.items()
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix="etl"):
+        """
+        Render the metrics in the Prometheus text exposition format, as read
+        by the node exporter's textfile collector.
+        """
+        summary = self.summary()
+        lines = []
+
+        def add(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{key}="{_escape_label(label)}"'
+                    for key, label in labels.items()
+                )
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{prefix}_{name}{label_text} {value}")
+
+        add(
+            "run_duration_seconds",
+            "gauge",
+            "Duration of the run so far.",
+            [({}, summary["duration_seconds"])],
+        )
+        if summary["peak_rss_bytes"] is not None:
+            add(
+                "peak_rss_bytes",
+                "gauge",
+                "Peak resident set size of the process.",
+                [({}, summary["peak_rss_bytes"])],
+            )
+        stages = summary["stages"].items()
+        for field, help_text in (
+            ("calls", "Number of calls of the stage."),
+            ("wall_seconds", "Wall clock time spent in the stage."),
+            ("cpu_seconds", "CPU time spent in the stage."),
+            ("input_count", "Records passed into the stage."),
+            ("output_count", "Records returned by the stage."),
+        ):
+            add(
+                f"stage_{field}",
+                "gauge",
+                help_text,
+                [({"stage": name}, stage[field]) for name, stage in stages],
+            )
+        add(
+            "dropped_records",
+            "gauge",
+            "Records dropped by stage and reason.",
+            [
+                (
+                    {"stage": drop["stage"], "reason": drop["reason"]},
+                    drop["count"],
+                )
+                for drop in summary["drops"]
+            ],
+        )
+        db = summary["db"].items()
+        for field, help_text in (
+            ("calls", "Database round trips by statement type."),
+            ("total_seconds", "Time spent in database round trips."),
+            ("max_seconds", "Slowest database round trip."),
+        ):
+            add(
+                f"db_{field}",
+                "gauge",
+                help_text,
+                [({"operation": name}, call[field]) for name, call in db],
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomically(path, self.to_json())
+
+    def write_prometheus(self, path):
+        _write_atomically(path, self.to_prometheus())
+
+
+def _escape_label(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _write_atomically(path, text):
+    # the textfile collector must never read a half written file
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf8") as file:
+        file.write(text)
+    os.replace(temporary_path, path)
+
+
+def count_records(value):
+    """
+    The number of records in a stage's input or output, or None if it is not
+    a collection. For `(data, expired)` tuples the records of `data` count.
+    """
+    if isinstance(value, tuple) and len(value) > 0:
+        value = value[0]
+    if isinstance(value, (list, set, dict)):
+        return len(value)
+    return None
+
+
+metrics = Metrics()
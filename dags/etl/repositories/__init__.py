@@ -1,3 +1,4 @@
+from .in_memory_repository import InMemoryRepository
 from .postgres_repository import PostgresRepository
 
-__all__ = ["PostgresRepository"]
+__all__ = ["PostgresRepository", "InMemoryRepository"]
@@ -6,6 +6,67 @@ class BaseRepository(ABC):
     def fact_exists(self, fact_hash):
         pass
 
+    @abstractmethod
+    def existing_hashes(self, fact_hashes):
+        """Return the subset of the given fact hashes already stored."""
+        pass
+
+    @abstractmethod
+    def get_last_fact_number(self):
+        """Return the highest fact number stored, or None."""
+        pass
+
     @abstractmethod
     def save_facts_batch(self, data):
         pass
+
+    @abstractmethod
+    def find_similar_facts_by_buckets(self, bucket_hashes):
+        """
+        Return the `(fact_id, fact_number, fact)` tuples of the current facts
+        sharing the bucket hash of at least one band.
+        """
+        pass
+
+    @abstractmethod
+    def find_similar_facts_for_batch(self, bucket_hashes_batch):
+        """
+        Return the candidates of `find_similar_facts_by_buckets` for every
+        bucket hash list of the batch.
+        """
+        pass
+
+    @abstractmethod
+    def get_current_facts(self, after_id=0, limit=1000):
+        """Page through the `(id, fact)` tuples of the current facts."""
+        pass
+
+    @abstractmethod
+    def replace_lsh_buckets(self, buckets_by_fact_id):
+        """Replace the stored bucket hashes of the given fact ids."""
+        pass
+
+    @abstractmethod
+    def mark_as_expired(self, data):
+        """Expire the facts with the given ids and return how many were."""
+        pass
+
+    @abstractmethod
+    def load_facts_chunk(
+        self, facts, expired_ids, checkpoint_name, checkpoint
+    ):
+        """
+        Expire, insert and checkpoint a chunk atomically, returning the number
+        of facts expired.
+        """
+        pass
+
+    @abstractmethod
+    def get_checkpoint(self, name):
+        """Return the checkpoint stored under `name`, or None."""
+        pass
+
+    @abstractmethod
+    def clear_checkpoint(self, name):
+        """Remove the checkpoint stored under `name`."""
+        pass
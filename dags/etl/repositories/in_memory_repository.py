@@ -0,0 +1,209 @@
+import itertools
+from collections import defaultdict
+
+from ..logging_config import LoggerManager
+from .base_repository import BaseRepository
+
+logging = LoggerManager.get_logger(__name__)
+
+
+class InMemoryRepository(BaseRepository):
+    """
+    Repository keeping the facts in process memory, with the same behaviour
+    as `PostgresRepository`: hash lookups go through a dictionary keyed by
+    fact hash and the LSH buckets through a dictionary keyed by
+    `(band, bucket_hash)`.
+
+    Used to run, profile and load test the pipeline without a database. The
+    data is lost when the process exits.
+    """
+
+    def __init__(self):
+        logging.info("Initialize InMemoryRepository")
+        self.facts = {}
+        self.fact_ids_by_hash = {}
+        self.buckets = defaultdict(set)
+        self.fact_buckets = {}
+        self.checkpoints = {}
+        self._fact_ids = itertools.count(1)
+        self._fact_numbers = itertools.count(1)
+
+    def fact_exists(self, fact_hash):
+        return fact_hash in self.fact_ids_by_hash
+
+    def existing_hashes(self, fact_hashes):
+        """
+        Resolve which of the given fact hashes are already stored.
+
+        :param fact_hashes: An iterable of fact hashes to look up
+        :return: A set containing the hashes already stored
+        """
+        return {
+            fact_hash
+            for fact_hash in fact_hashes
+            if fact_hash in self.fact_ids_by_hash
+        }
+
+    def get_last_fact_number(self):
+        return max(
+            (fact["fact_number"] for fact in self.facts.values()),
+            default=None,
+        )
+
+    @LoggerManager.log_execution
+    def save_facts_batch(self, facts):
+        """
+        Store the facts and their LSH buckets, numbering them like
+        `PostgresRepository.save_facts_batch`. Raises a ValueError without
+        storing anything if a fact hash is already taken.
+
+        :param facts: A list of transformed fact dictionaries, sorted by
+        created date
+        """
+        self._check_new_hashes(facts)
+        self._insert_facts(facts)
+
+    def find_similar_facts_by_buckets(self, bucket_hashes):
+        """
+        Retrieve the current facts sharing the bucket hash of at least one
+        band with the given bucket hashes, where the position of each hash is
+        its band.
+        """
+        fact_ids = set()
+        for key in enumerate(bucket_hashes):
+            fact_ids.update(self.buckets.get(key, ()))
+        candidates = []
+        for fact_id in sorted(fact_ids):
+            fact = self.facts[fact_id]
+            if fact["is_current"]:
+                candidates.append((fact_id, fact["fact_number"], fact["fact"]))
+        return candidates
+
+    def find_similar_facts_for_batch(self, bucket_hashes_batch):
+        """
+        Retrieve the candidate facts for a whole batch of facts.
+
+        :return: A list with one entry per input fact, each being a list of
+        `(fact_id, fact_number, fact)` tuples
+        """
+        return [
+            self.find_similar_facts_by_buckets(bucket_hashes)
+            for bucket_hashes in bucket_hashes_batch
+        ]
+
+    def get_current_facts(self, after_id=0, limit=1000):
+        """
+        Page through the current facts in id order.
+
+        :return: A list of `(id, fact)` tuples
+        """
+        return list(
+            itertools.islice(
+                (
+                    (fact_id, fact["fact"])
+                    # ids are handed out in ascending insertion order
+                    for fact_id, fact in self.facts.items()
+                    if fact_id > after_id and fact["is_current"]
+                ),
+                limit,
+            )
+        )
+
+    def replace_lsh_buckets(self, buckets_by_fact_id):
+        """
+        Replace the stored LSH buckets of the given facts.
+
+        :param buckets_by_fact_id: A dictionary mapping fact ids to their new
+        list of bucket hashes
+        """
+        for fact_id, bucket_hashes in buckets_by_fact_id.items():
+            self._set_buckets(fact_id, bucket_hashes)
+
+    def mark_as_expired(self, data):
+        """
+        Expire the facts with the given ids.
+
+        :param data: A list of fact ids to expire
+        :return: The number of facts found and expired
+        """
+        affected_rows = 0
+        for fact_id in set(data):
+            fact = self.facts.get(fact_id)
+            if fact is None:
+                continue
+            fact["is_current"] = False
+            affected_rows += 1
+        return affected_rows
+
+    @LoggerManager.log_execution
+    def load_facts_chunk(
+        self, facts, expired_ids, checkpoint_name, checkpoint
+    ):
+        """
+        Expire the superseded facts, insert the new facts and store the
+        checkpoint. Nothing is changed if a fact hash is already taken.
+
+        :return: The number of facts expired
+        """
+        self._check_new_hashes(facts)
+        expired_count = self.mark_as_expired(expired_ids)
+        self._insert_facts(facts)
+        self.checkpoints[checkpoint_name] = dict(checkpoint)
+        return expired_count
+
+    def get_checkpoint(self, name):
+        """
+        Read the checkpoint stored under `name`.
+
+        :return: A copy of the checkpoint dictionary, or None if there is none
+        """
+        checkpoint = self.checkpoints.get(name)
+        return dict(checkpoint) if checkpoint is not None else None
+
+    def clear_checkpoint(self, name):
+        """
+        Remove the checkpoint stored under `name`.
+        """
+        self.checkpoints.pop(name, None)
+
+    def _check_new_hashes(self, facts):
+        seen_hashes = set()
+        for item in facts:
+            fact_hash = item["fact_hash"]
+            if fact_hash in self.fact_ids_by_hash or fact_hash in seen_hashes:
+                raise ValueError(f"Duplicate fact hash {fact_hash}")
+            seen_hashes.add(fact_hash)
+
+    def _insert_facts(self, facts):
+        fact_numbers = {}
+        for item in facts:
+            if "fact_number" in item:
+                fact_number = item["fact_number"]
+            elif item.get("previous_fact_hash") in fact_numbers:
+                fact_number = fact_numbers[item["previous_fact_hash"]]
+            else:
+                fact_number = next(self._fact_numbers)
+            fact_numbers[item["fact_hash"]] = fact_number
+
+            fact_id = next(self._fact_ids)
+            self.facts[fact_id] = {
+                "fact_number": fact_number,
+                "fact_hash": item["fact_hash"],
+                "fact": item["fact"],
+                "created_date": item["parsed_date"],
+                "is_numeric": item["is_numeric"],
+                "is_current": item.get("is_current", True),
+            }
+            self.fact_ids_by_hash[item["fact_hash"]] = fact_id
+            self._set_buckets(fact_id, item.get("bucket_hashes", []))
+
+    def _set_buckets(self, fact_id, bucket_hashes):
+        for key in self.fact_buckets.pop(fact_id, []):
+            fact_ids = self.buckets[key]
+            fact_ids.discard(fact_id)
+            if len(fact_ids) == 0:
+                del self.buckets[key]
+        keys = list(enumerate(bucket_hashes))
+        self.fact_buckets[fact_id] = keys
+        for key in keys:
+            self.buckets[key].add(fact_id)
@@ -1,21 +1,66 @@
+import io
+
 import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
 import psycopg2.pool
 
 from ..logging_config import LoggerManager
+from ..metrics import metrics
 from .base_repository import BaseRepository
 
 logging = LoggerManager.get_logger(__name__)
 
 
+def statement_type(query):
+    """
+    The leading keyword of an SQL statement, e.g. "SELECT", used to group the
+    database round trips in the run metrics.
+    """
+    if isinstance(query, bytes):
+        query = query.decode("utf8", "replace")
+    if not isinstance(query, str) or query.strip() == "":
+        return "QUERY"
+    return query.split(None, 1)[0].upper()
+
+
+class MetricsCursor(psycopg2.extensions.cursor):
+    """
+    Cursor recording the count and latency of every database round trip in
+    the run metrics.
+    """
+
+    def execute(self, query, vars=None):
+        with metrics.track_db(statement_type(query)):
+            return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        with metrics.track_db(statement_type(query)):
+            return super().executemany(query, vars_list)
+
+    def copy_from(self, *args, **kwargs):
+        with metrics.track_db("COPY"):
+            return super().copy_from(*args, **kwargs)
+
+
 class PostgresRepository(BaseRepository):
     _connection_pool = None
 
+    # Number of rows sent per multi-row INSERT statement
+    insert_page_size = 1000
+
+    # Number of ids sent per set-based UPDATE statement
+    expire_chunk_size = 10000
+
     def __init__(self, db_uri):
         logging.info("PostgresRepository DateTimeValidator")
         if PostgresRepository._connection_pool is None:
             PostgresRepository._connection_pool = (
                 psycopg2.pool.SimpleConnectionPool(
-                    minconn=1, maxconn=10, dsn=db_uri
+                    minconn=1,
+                    maxconn=10,
+                    dsn=db_uri,
+                    cursor_factory=MetricsCursor,
                 )
             )
 
@@ -48,6 +93,36 @@ class PostgresRepository(BaseRepository):
             if conn is not None:
                 self._release_connection(conn)
 
+    def existing_hashes(self, fact_hashes):
+        """
+        Resolve which of the given fact hashes are already stored, using a
+        single query for the whole batch.
+
+        :param fact_hashes: An iterable of fact hashes to look up
+        :return: A set containing the hashes present in the `facts` table
+        """
+        fact_hashes = list(fact_hashes)
+        if len(fact_hashes) == 0:
+            return set()
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT fact_hash FROM facts WHERE fact_hash = ANY(%s)",
+                (fact_hashes,),
+            )
+            return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
     def get_last_fact_number(self):
         conn = None
         cursor = None
@@ -70,8 +145,63 @@ class PostgresRepository(BaseRepository):
             if conn is not None:
                 self._release_connection(conn)
 
+    def reserve_fact_numbers(self, count, cursor=None):
+        """
+        Reserve `count` new fact numbers from the `facts_fact_number_seq`
+        sequence with a single statement.
+
+        The numbers come from `nextval`, so concurrent loaders never receive
+        the same number and never wait on each other. The block is contiguous
+        unless another loader draws from the sequence at the same moment.
+
+        :param count: The number of fact numbers to reserve
+        :param cursor: An optional cursor to run the query in an existing
+        transaction
+        :return: A list of `count` unique fact numbers in ascending order
+        """
+        if count == 0:
+            return []
+        conn = None
+        local_cursor = False
+        try:
+            if cursor is None:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+                local_cursor = True
+            cursor.execute(
+                """
+                SELECT nextval('facts_fact_number_seq')
+                FROM generate_series(1, %s)
+                """,
+                (count,),
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            raise
+        finally:
+            if local_cursor:
+                if cursor is not None:
+                    cursor.close()
+                if conn is not None:
+                    self._release_connection(conn)
+
     @LoggerManager.log_execution
     def save_facts_batch(self, facts):
+        """
+        Bulk insert the facts and their LSH buckets in a single transaction.
+
+        Facts are written with multi-row `INSERT ... RETURNING` statements, the
+        returned ids are mapped back to the facts through their unique hash,
+        and all bucket rows are then streamed in with one `COPY`.
+
+        A fact carrying a `previous_fact_hash` takes over the fact number of
+        that earlier fact of the batch, and facts flagged with
+        `is_current = False` are stored as already expired.
+
+        :param facts: A list of transformed fact dictionaries, sorted by
+        created date
+        """
         conn = None
         cursor = None
         if len(facts) == 0:
@@ -79,39 +209,7 @@ class PostgresRepository(BaseRepository):
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            insert_query = """
-                INSERT INTO facts
-                (fact_number, fact_hash, fact, created_date, is_numeric)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id;
-                """
-
-            last_fact_number = None
-            last_fact_number = self.get_last_fact_number()
-            if last_fact_number is None:
-                last_fact_number = 0
-            for item in facts:
-                if "fact_number" in item:
-                    fact_number = item["fact_number"]
-                else:
-                    last_fact_number += 1
-                    fact_number = last_fact_number
-                cursor.execute(
-                    insert_query,
-                    (
-                        fact_number,
-                        item["fact_hash"],
-                        item["fact"],
-                        item["parsed_date"],
-                        item["is_numeric"],
-                    ),
-                )
-
-                if "bucket_hashes" in item:
-                    auto_increment_id = cursor.fetchone()[0]
-                    self.save_lsh_buckets_for_fact(
-                        auto_increment_id, item["bucket_hashes"], cursor=cursor
-                    )
+            self._insert_facts(cursor, facts)
             conn.commit()
         except Exception as e:
             logging.error(f"An error occurred: {e}")
@@ -124,28 +222,118 @@ class PostgresRepository(BaseRepository):
             if conn is not None:
                 self._release_connection(conn)
 
+    def _insert_facts(self, cursor, facts):
+        insert_query = """
+            INSERT INTO facts
+            (fact_number, fact_hash, fact, created_date, is_numeric,
+             is_current, effective_end_date)
+            VALUES %s
+            RETURNING id, fact_hash;
+            """
+        insert_template = """
+            (%s, %s, %s, %s, %s, %s,
+             CASE WHEN %s THEN NULL ELSE now() END)
+            """
+
+        batch_hashes = {item["fact_hash"] for item in facts}
+        new_fact_numbers = iter(
+            self.reserve_fact_numbers(
+                sum(
+                    1
+                    for item in facts
+                    if "fact_number" not in item
+                    and item.get("previous_fact_hash") not in batch_hashes
+                ),
+                cursor=cursor,
+            )
+        )
+        fact_numbers = {}
+        rows = []
+        for item in facts:
+            if "fact_number" in item:
+                fact_number = item["fact_number"]
+            elif item.get("previous_fact_hash") in batch_hashes:
+                fact_number = fact_numbers[item["previous_fact_hash"]]
+            else:
+                fact_number = next(new_fact_numbers)
+            fact_numbers[item["fact_hash"]] = fact_number
+            is_current = item.get("is_current", True)
+            rows.append(
+                (
+                    fact_number,
+                    item["fact_hash"],
+                    item["fact"],
+                    item["parsed_date"],
+                    item["is_numeric"],
+                    is_current,
+                    is_current,
+                )
+            )
+
+        inserted = psycopg2.extras.execute_values(
+            cursor,
+            insert_query,
+            rows,
+            template=insert_template,
+            page_size=self.insert_page_size,
+            fetch=True,
+        )
+        fact_ids = {fact_hash: fact_id for fact_id, fact_hash in inserted}
+
+        bucket_rows = [
+            (fact_ids[item["fact_hash"]], band, bucket_hash)
+            for item in facts
+            if "bucket_hashes" in item
+            for band, bucket_hash in enumerate(item["bucket_hashes"])
+        ]
+        self._copy_lsh_buckets(cursor, bucket_rows)
+
+    @staticmethod
+    def _copy_lsh_buckets(cursor, bucket_rows):
+        """
+        Stream `(fact_id, band, bucket_hash)` rows into the lsh_buckets table
+        with a single `COPY FROM STDIN`.
+        """
+        if len(bucket_rows) == 0:
+            return
+        buffer = io.StringIO()
+        for fact_id, band, bucket_hash in bucket_rows:
+            buffer.write(f"{fact_id}\t{band}\t{bucket_hash}\n")
+        buffer.seek(0)
+        cursor.copy_from(
+            buffer, "lsh_buckets", columns=("fact_id", "band", "bucket_hash")
+        )
+
     def find_similar_facts_by_buckets(self, bucket_hashes):
+        """
+        Retrieve the current facts sharing the bucket hash of at least one
+        band with the given bucket hashes, where the position of each hash is
+        its band.
+        """
+        if len(bucket_hashes) == 0:
+            return []
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            facts = set()
-            for bucket_hash in bucket_hashes:
-                cursor.execute(
-                    """
-                    SELECT fact_id, fact_number, facts.fact
-                    FROM lsh_buckets
-                    JOIN facts
-                    ON facts.id = lsh_buckets.fact_id
-                        AND facts.is_current = true
-                    WHERE bucket_hash = %s
-                    """,
-                    (bucket_hash,),
-                )
-                facts.update(
-                    [(row[0], row[1], row[2]) for row in cursor.fetchall()]
-                )
+            cursor.execute(
+                """
+                SELECT DISTINCT fact_id, fact_number, facts.fact
+                FROM unnest(%s::smallint[], %s::bigint[])
+                    AS query(band, bucket_hash)
+                JOIN lsh_buckets
+                ON lsh_buckets.band = query.band
+                    AND lsh_buckets.bucket_hash = query.bucket_hash
+                JOIN facts
+                ON facts.id = lsh_buckets.fact_id
+                    AND facts.is_current = true
+                """,
+                (list(range(len(bucket_hashes))), list(bucket_hashes)),
+            )
+            facts = set(
+                [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+            )
             return list(facts)
         except Exception as e:
             logging.error(f"An error occurred: {e}")
@@ -158,54 +346,248 @@ class PostgresRepository(BaseRepository):
             if conn is not None:
                 self._release_connection(conn)
 
-    def save_lsh_buckets_for_fact(self, fact_id, bucket_hashes, cursor=None):
+    def find_similar_facts_for_batch(self, bucket_hashes_batch):
         """
-        Store the LSH bucket hashes for a given fact_id in the lsh_buckets
-        table.
+        Retrieve the candidate facts for a whole batch of facts with a single
+        query.
 
-        :param fact_id: The ID of the fact in the facts table
-        :param bucket_hashes: A list of bucket hashes generated for the fact
+        :param bucket_hashes_batch: A list holding the bucket hashes of each
+        input fact, where the position of each hash is its band
+        :return: A list with one entry per input fact, each being a list of
+        `(fact_id, fact_number, fact)` tuples sharing at least one bucket with
+        that fact
         """
+        candidates = [[] for _ in bucket_hashes_batch]
+        fact_indexes = []
+        bands = []
+        bucket_hashes = []
+        for fact_index, fact_bucket_hashes in enumerate(bucket_hashes_batch):
+            for band, bucket_hash in enumerate(fact_bucket_hashes):
+                fact_indexes.append(fact_index)
+                bands.append(band)
+                bucket_hashes.append(bucket_hash)
+        if len(bucket_hashes) == 0:
+            return candidates
         conn = None
+        cursor = None
         try:
-            local_cursor = False
-            if cursor is None:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                local_cursor = True
-            for bucket_hash in bucket_hashes:
-                cursor.execute(
-                    """
-                    INSERT INTO lsh_buckets (fact_id, bucket_hash)
-                    VALUES (%s, %s)""",
-                    (fact_id, bucket_hash),
-                )
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT DISTINCT batch.fact_index, fact_id, fact_number,
+                    facts.fact
+                FROM unnest(%s::integer[], %s::smallint[], %s::bigint[])
+                    AS batch(fact_index, band, bucket_hash)
+                JOIN lsh_buckets
+                ON lsh_buckets.band = batch.band
+                    AND lsh_buckets.bucket_hash = batch.bucket_hash
+                JOIN facts
+                ON facts.id = lsh_buckets.fact_id
+                    AND facts.is_current = true
+                """,
+                (fact_indexes, bands, bucket_hashes),
+            )
+            for row in cursor.fetchall():
+                candidates[row[0]].append((row[1], row[2], row[3]))
+            return candidates
         except Exception as e:
             logging.error(f"An error occurred: {e}")
-            if local_cursor:
+            if conn is not None:
                 conn.rollback()
             raise
         finally:
-            if local_cursor:
-                if cursor is not None:
-                    cursor.close()
-                if conn is not None:
-                    self._release_connection(conn)
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
+    def get_current_facts(self, after_id=0, limit=1000):
+        """
+        Page through the current facts in id order.
+
+        :param after_id: Only facts with an id greater than this are returned
+        :param limit: The maximum number of facts to return
+        :return: A list of `(id, fact)` tuples
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT id, fact
+                FROM facts
+                WHERE is_current = true AND id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (after_id, limit),
+            )
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
+    def replace_lsh_buckets(self, buckets_by_fact_id):
+        """
+        Replace the stored LSH buckets of the given facts in one transaction.
+
+        :param buckets_by_fact_id: A dictionary mapping fact ids to their new
+        list of bucket hashes
+        """
+        if len(buckets_by_fact_id) == 0:
+            return
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM lsh_buckets WHERE fact_id = ANY(%s)",
+                (list(buckets_by_fact_id),),
+            )
+            self._copy_lsh_buckets(
+                cursor,
+                [
+                    (fact_id, band, bucket_hash)
+                    for fact_id, bucket_hashes in buckets_by_fact_id.items()
+                    for band, bucket_hash in enumerate(bucket_hashes)
+                ],
+            )
+            conn.commit()
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            if conn is not None:
+                conn.rollback()
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
 
     def mark_as_expired(self, data):
+        """
+        Expire the facts with the given ids using set-based
+        `UPDATE ... WHERE id = ANY(%s)` statements, chunked by
+        `expire_chunk_size`.
+
+        :param data: A list of fact ids to expire
+        :return: The number of rows affected
+        """
+        if len(data) == 0:
+            return 0
         conn = None
         cursor = None
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            for expired_fact_id in data:
-                cursor.execute(
-                    """
-                    UPDATE facts
-                    SET is_current = false, effective_end_date = now()
-                    WHERE id = %s;""",
-                    (expired_fact_id,),
-                )
+            affected_rows = self._expire_facts(cursor, data)
+            conn.commit()
+            return affected_rows
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            if conn is not None:
+                conn.rollback()
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
+    @LoggerManager.log_execution
+    def load_facts_chunk(
+        self, facts, expired_ids, checkpoint_name, checkpoint
+    ):
+        """
+        Expire the superseded facts, insert the new facts and store the
+        checkpoint in a single transaction, so a chunk is either loaded
+        completely, checkpoint included, or not at all.
+
+        :param facts: A list of transformed fact dictionaries
+        :param expired_ids: A list of fact ids to expire
+        :param checkpoint_name: The name the checkpoint is stored under
+        :param checkpoint: A dictionary with the `last_created_date`,
+        `last_fact_hash` and `records_loaded` of the run so far
+        :return: The number of facts expired
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            expired_count = self._expire_facts(cursor, expired_ids)
+            if len(facts) > 0:
+                self._insert_facts(cursor, facts)
+            self._save_checkpoint(cursor, checkpoint_name, checkpoint)
+            conn.commit()
+            return expired_count
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            if conn is not None:
+                conn.rollback()
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
+    def get_checkpoint(self, name):
+        """
+        Read the checkpoint stored under `name` in the etl_state table.
+
+        :return: A dictionary with the `last_created_date`, `last_fact_hash`
+        and `records_loaded` of the checkpoint, or None if there is none
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT last_created_date, last_fact_hash, records_loaded
+                FROM etl_state
+                WHERE name = %s
+                """,
+                (name,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return {
+                "last_created_date": row[0],
+                "last_fact_hash": row[1],
+                "records_loaded": row[2],
+            }
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            if conn is not None:
+                self._release_connection(conn)
+
+    def clear_checkpoint(self, name):
+        """
+        Remove the checkpoint stored under `name`, e.g. once a run completed.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM etl_state WHERE name = %s", (name,))
             conn.commit()
         except Exception as e:
             logging.error(f"An error occurred: {e}")
@@ -217,3 +599,37 @@ class PostgresRepository(BaseRepository):
                 cursor.close()
             if conn is not None:
                 self._release_connection(conn)
+
+    @staticmethod
+    def _save_checkpoint(cursor, name, checkpoint):
+        cursor.execute(
+            """
+            INSERT INTO etl_state
+            (name, last_created_date, last_fact_hash, records_loaded)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (name) DO UPDATE
+            SET last_created_date = EXCLUDED.last_created_date,
+                last_fact_hash = EXCLUDED.last_fact_hash,
+                records_loaded = EXCLUDED.records_loaded,
+                updated_at = now()
+            """,
+            (
+                name,
+                checkpoint["last_created_date"],
+                checkpoint["last_fact_hash"],
+                checkpoint["records_loaded"],
+            ),
+        )
+
+    def _expire_facts(self, cursor, fact_ids):
+        affected_rows = 0
+        for start in range(0, len(fact_ids), self.expire_chunk_size):
+            cursor.execute(
+                """
+                UPDATE facts
+                SET is_current = false, effective_end_date = now()
+                WHERE id = ANY(%s);""",
+                (list(fact_ids[start:start + self.expire_chunk_size]),),
+            )
+            affected_rows += cursor.rowcount
+        return affected_rows
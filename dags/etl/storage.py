@@ -0,0 +1,96 @@
+import gzip
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+
+from .config import Config
+from .fact_record import Fact
+from .logging_config import LoggerManager
+
+logging = LoggerManager.get_logger(__name__)
+
+# Marks a datetime value serialized by `write_records`
+DATETIME_TAG = "$datetime"
+
+unsafe_characters = re.compile(r"[^\w.-]")
+
+
+def run_directory(run_id, base_dir=None):
+    """
+    Return the directory holding the intermediate files of a run, creating
+    it if needed.
+
+    :param run_id: The run identifier, e.g. the Airflow `run_id`
+    :param base_dir: The staging directory, defaults to `Config.staging_dir`
+    :return: The path of the run-scoped directory
+    """
+    path = os.path.join(
+        base_dir or Config.staging_dir, unsafe_characters.sub("_", run_id)
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def remove_run_directory(run_id, base_dir=None):
+    """
+    Delete the intermediate files of a run.
+    """
+    path = os.path.join(
+        base_dir or Config.staging_dir, unsafe_characters.sub("_", run_id)
+    )
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def write_records(path, records):
+    """
+    Write records as gzip-compressed newline-delimited JSON. Records are
+    written one by one, so `records` may be a generator. Datetime values are
+    kept as such when read back with `read_records`.
+
+    The file is written under a temporary name and renamed once complete, so
+    a task failing halfway never leaves a truncated file behind.
+
+    :param path: The path of the file to write
+    :param records: An iterable of JSON serializable records
+    :return: The path of the written file
+    """
+    temporary_path = f"{path}.tmp"
+    count = 0
+    with gzip.open(temporary_path, "wt", encoding="utf8") as file:
+        for record in records:
+            file.write(json.dumps(record, default=_encode_value))
+            file.write("\n")
+            count += 1
+    os.replace(temporary_path, path)
+    logging.info(f"Wrote {count} record(s) to {path}")
+    return path
+
+
+def read_records(path):
+    """
+    Read back the records written by `write_records`.
+
+    :param path: The path of the file to read
+    :return: A generator yielding the records one by one
+    """
+    with gzip.open(path, "rt", encoding="utf8") as file:
+        for line in file:
+            yield json.loads(line, object_hook=_decode_value)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+    if isinstance(value, Fact):
+        return dict(value)
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+def _decode_value(value):
+    if len(value) == 1 and DATETIME_TAG in value:
+        return datetime.fromisoformat(value[DATETIME_TAG])
+    return value
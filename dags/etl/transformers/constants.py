@@ -34,5 +34,34 @@ number_words = {
     "billion",
 }
 
+# Number words combined into hyphenated numbers, e.g. "forty-two"
+tens_number_words = (
+    "twenty",
+    "thirty",
+    "forty",
+    "fifty",
+    "sixty",
+    "seventy",
+    "eighty",
+    "ninety",
+)
+unit_number_words = (
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+)
+
 # Regular expression for matching hyphenated number words
-hyphenated_numbers_pattern = r"\b(?:twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety)-(?:one|two|three|four|five|six|seven|eight|nine)\b"  # noqa
+hyphenated_numbers_pattern = (
+    r"\b(?:"
+    + "|".join(tens_number_words)
+    + ")-(?:"
+    + "|".join(unit_number_words)
+    + r")\b"
+)
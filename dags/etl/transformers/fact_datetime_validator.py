@@ -5,69 +5,142 @@ from ..logging_config import LoggerManager
 
 logging = LoggerManager.get_logger(__name__)
 
+# The created date format of the feed, e.g. 2024-08-14T12:34:56.789Z
+date_pattern = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})\.(\d{3})Z"
+)
+# The same format as checked by `validate_format`, which has always let a
+# trailing newline through
+format_pattern = re.compile(date_pattern.pattern + "$")
+# The format the per-step checks parse with, more lenient than the pattern,
+# e.g. on the number of digits
+date_format = "%Y-%m-%dT%H:%M:%S.%fZ"
+# The years `validate` accepts on top of the min and max dates
+min_year_date = datetime(1900, 1, 1)
+max_year_date = datetime(2100, 12, 31, 23, 59, 59, 999999)
+
 
 class DateTimeValidator:
     def __init__(self, min_date=None, max_date=None):
         logging.info("Initialized DateTimeValidator")
         self.min_date = min_date if min_date else datetime(2000, 1, 1)
         self.max_date = max_date if max_date else datetime(2100, 12, 31)
-        self.pattern = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$"
+        self.pattern = date_pattern
 
     def validate_format(self, date_string):
-        if re.match(self.pattern, date_string):
+        if format_pattern.match(date_string):
             return True
         else:
-            print(f"Invalid format: {date_string}")
+            logging.info(f"Invalid format: {date_string}")
             return False
 
     def validate_components(self, date_string):
         try:
-            parsed_date = datetime.strptime(
-                date_string, "%Y-%m-%dT%H:%M:%S.%fZ"
-            )
-
-            # Example: Additional check for year range
-            if parsed_date.year < 1900 or parsed_date.year > 2100:
-                print(f"Year out of range: {parsed_date.year}")
-                return False
-
-            return True
+            parsed_date = datetime.strptime(date_string, date_format)
         except ValueError as e:
-            print(f"Error parsing date-time components: {e}")
+            logging.info(f"Error parsing date-time components: {e}")
+            return False
+
+        # Example: Additional check for year range
+        if parsed_date.year < 1900 or parsed_date.year > 2100:
+            logging.info(f"Year out of range: {parsed_date.year}")
             return False
 
+        return True
+
     def validate_timezone(self, date_string):
         if date_string.endswith("Z"):
             return True
         else:
-            print(f"Timezone indicator missing or incorrect: {date_string}")
+            logging.info(
+                f"Timezone indicator missing or incorrect: {date_string}"
+            )
             return False
 
     def validate_range(self, date_string):
         try:
-            parsed_date = datetime.strptime(
-                date_string, "%Y-%m-%dT%H:%M:%S.%fZ"
-            )
-            if parsed_date < self.min_date or parsed_date > self.max_date:
-                print(f"Date out of valid range: {parsed_date}")
-                return False
-            return True
+            parsed_date = datetime.strptime(date_string, date_format)
         except ValueError as e:
-            print(f"Error checking date range: {e}")
+            logging.info(f"Error checking date range: {e}")
+            return False
+        return self.in_range(parsed_date)
+
+    def in_range(self, parsed_date):
+        if parsed_date < self.min_date or parsed_date > self.max_date:
+            logging.info(f"Date out of valid range: {parsed_date}")
             return False
+        return True
+
+    def parse(self, date_string):
+        """
+        Parse the date string in a single pass: the precompiled pattern checks
+        the format and the UTC designator, and its groups are turned into the
+        datetime directly. Returns None if the string does not match or is not
+        a valid date.
+        """
+        match = self.pattern.fullmatch(date_string)
+        if match is None:
+            logging.info(f"Invalid format: {date_string}")
+            return None
+
+        year, month, day, hour, minute, second, millisecond = map(
+            int, match.groups()
+        )
+        try:
+            return datetime(
+                year, month, day, hour, minute, second, millisecond * 1000
+            )
+        except ValueError as e:
+            logging.info(f"Error parsing date-time components: {e}")
+            return None
 
     def validate(self, date_string):
         """
         Perform all validations on the date string.
         Returns the parsed date if valid, otherwise None.
         """
+        parsed_date = self.parse(date_string)
         if (
-            self.validate_format(date_string)
-            and self.validate_components(date_string)
-            and self.validate_timezone(date_string)
-            and self.validate_range(date_string)
+            parsed_date is not None
+            and 1900 <= parsed_date.year <= 2100
+            and self.in_range(parsed_date)
         ):
-            return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
+            return parsed_date
         else:
-            print(f"Validation failed for: {date_string}")
+            logging.info(f"Validation failed for: {date_string}")
             return None
+
+    def validate_many(self, date_strings):
+        """
+        Batch variant of `validate`. The precompiled pattern and the bounds
+        are applied across the whole list in one loop, with the year range
+        and the min/max dates folded into a single pair of bounds, instead of
+        one `validate` call per string.
+
+        :param date_strings: A list of date strings
+        :return: A `(parsed_dates, rejected)` tuple of lists aligned with the
+        input: the parsed date (or None) of every string, and whether the
+        string was rejected
+        """
+        fullmatch = self.pattern.fullmatch
+        lower = max(self.min_date, min_year_date)
+        upper = min(self.max_date, max_year_date)
+        parsed_dates = []
+        rejected = []
+        for date_string in date_strings:
+            parsed_date = None
+            if fullmatch(date_string) is not None:
+                try:
+                    # the pattern checked the format, so the C parser can
+                    # turn it into the datetime, without the "Z"
+                    parsed_date = datetime.fromisoformat(date_string[:-1])
+                except ValueError:
+                    pass
+                else:
+                    if not lower <= parsed_date <= upper:
+                        parsed_date = None
+            if parsed_date is None:
+                logging.info(f"Validation failed for: {date_string}")
+            parsed_dates.append(parsed_date)
+            rejected.append(parsed_date is None)
+        return parsed_dates, rejected
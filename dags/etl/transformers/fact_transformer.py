@@ -1,43 +1,85 @@
+import functools
 import hashlib
-import re
+import math
+from concurrent.futures import ProcessPoolExecutor
 
+from ..extractors.base_extractor import NoNewData
+from ..fact_record import Fact
 from ..logging_config import LoggerManager
+from ..metrics import metrics
 from .base_transformer import BaseTransformer
-from .constants import hyphenated_numbers_pattern, number_words
 from .fact_datetime_validator import DateTimeValidator
 from .fact_version_manager import FactVersionManager
+from .numeric_detector import contains_number, contains_numbers
+from .parallel import (
+    describe_facts,
+    init_worker,
+    prepare_records,
+    version_manager_options,
+)
+from .streaming import external_sort, iter_chunks
 
 logging = LoggerManager.get_logger(__name__)
 
 
 class FactTransformer(BaseTransformer):
-    def __init__(self, data_repository, required_keys=None):
+    # partitions handed to each worker by the parallel mode
+    partitions_per_worker = 4
+
+    def __init__(
+        self,
+        data_repository,
+        required_keys=None,
+        version_manager=None,
+        workers=1,
+    ):
+        """
+        :param workers: The number of processes running the CPU-bound stages
+        of `transform`. With more than one worker, the record-local stages
+        fan out across a process pool while version resolution stays ordered
+        in the calling process.
+        """
         logging.info("Initialize Transformer")
         self.data_repository = data_repository
-        self.version_manager = FactVersionManager(data_repository)
+        if version_manager is None:
+            version_manager = FactVersionManager(data_repository)
+        self.version_manager = version_manager
         self.datetime_validator = DateTimeValidator()
         if required_keys is None:
             required_keys = ["fact", "created_date"]
         self.required_keys = required_keys
+        self.workers = workers
 
     @LoggerManager.log_execution
-    def transform(self, data):
+    def transform(self, data, since=None):
         """
         Clean and process the input data, returning the transformed result.
+        `NoNewData` is passed through untouched.
+
+        :param since: An optional created date string, e.g. the watermark of
+        the last run; records created before it are dropped right after date
+        validation, before any hashing or repository lookups
         """
-        cleaned_data = self.cleanup_data(data)
+        if isinstance(data, NoNewData):
+            logging.info("No new data to transform")
+            return data, []
+        if self.workers > 1:
+            return self.transform_parallel(data, since=since)
+        cleaned_data = self.cleanup_data(data, since=since)
         processed_data, expired = self.process_data(cleaned_data)
         return processed_data, expired
 
     @LoggerManager.log_execution
-    def cleanup_data(self, data):
+    def cleanup_data(self, data, since=None):
         """
         Clean the data by removing whitespaces, dropping blank entries, and
-        deduplicating.
+        deduplicating. Records created before `since` are dropped first.
         Returns the cleaned data.
         """
         keys_validated = self.validate_keys(data)
-        date_validated = self.validate_datetime(keys_validated)
+        date_validated = self.drop_older_than(
+            self.validate_datetime(keys_validated), since
+        )
         self.sort_facts_by_created_date(date_validated)
         no_whitespaces = self.clean_whitespaces(date_validated)
         no_blanks = self.drop_blanks(no_whitespaces)
@@ -45,6 +87,126 @@ class FactTransformer(BaseTransformer):
 
         return no_duplicates
 
+    def transform_parallel(self, data, since=None):
+        """
+        Parallel variant of `transform`, producing the same result.
+
+        Validation, whitespace cleanup and hashing run on partitions of the
+        raw records across a process pool. The facts are then sorted and
+        deduplicated in the calling process, the pool computes their LSH
+        bucket hashes and numeric flags, and the versions are resolved in
+        created date order in the calling process.
+        """
+        data = list(data)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker,
+            initargs=(
+                self.required_keys,
+                self.datetime_validator,
+                version_manager_options(self.version_manager),
+            ),
+        ) as executor:
+            prepared_data = []
+            for records, drops in executor.map(
+                functools.partial(prepare_records, since=since),
+                self.partition(data),
+            ):
+                prepared_data.extend(records)
+                metrics.merge_drops(drops)
+            self.sort_facts_by_created_date(prepared_data)
+            unique_facts = self.deduplication(prepared_data, hashed=True)
+
+            descriptions = executor.map(
+                describe_facts,
+                self.partition([fact["fact"] for fact in unique_facts]),
+            )
+            facts = iter(unique_facts)
+            for partition in descriptions:
+                for bucket_hashes, is_numeric in partition:
+                    fact = next(facts)
+                    fact["bucket_hashes"] = bucket_hashes
+                    fact["is_numeric"] = is_numeric
+
+        return self.identify_versions(unique_facts)
+
+    def partition(self, data):
+        """
+        Split a list into partitions for the process pool, a few per worker
+        so a slow partition does not hold up the others.
+        """
+        size = math.ceil(
+            len(data) / (self.workers * self.partitions_per_worker)
+        )
+        return iter_chunks(data, max(size, 1))
+
+    def transform_stream(self, data, chunk_size=10000, since=None):
+        """
+        Streaming variant of `transform` for feeds that do not fit in memory.
+
+        The cleanup stages run as generators over chunks of `chunk_size`
+        records, the facts are ordered by created date with an external merge
+        sort, and the ordered facts are versioned and categorized chunk by
+        chunk. Apart from the hashes kept for deduplication, memory use is
+        bounded by the chunk size rather than the feed size.
+
+        :param data: An iterable of raw records, e.g. a streaming extractor
+        :param chunk_size: The number of records held in memory per stage
+        :param since: An optional created date string; records created
+        before it are dropped right after date validation
+        :return: A generator yielding a `(processed_data, expired)` tuple per
+        chunk, in created date order. Load each chunk before pulling the next
+        one so later chunks are versioned against it. Nothing is yielded for
+        `NoNewData`.
+        """
+        if isinstance(data, NoNewData):
+            logging.info("No new data to transform")
+            return
+        cleaned_data = self.cleanup_stream(data, chunk_size, since=since)
+        for chunk in iter_chunks(cleaned_data, chunk_size):
+            yield self.process_data(chunk)
+
+    def cleanup_stream(self, data, chunk_size=10000, since=None):
+        """
+        Streaming variant of `cleanup_data`, yielding the cleaned facts sorted
+        by created date.
+        """
+        prepared_data = (
+            record
+            for chunk in iter_chunks(data, chunk_size)
+            for record in self.drop_blanks(
+                self.clean_whitespaces(
+                    self.drop_older_than(
+                        self.validate_datetime(self.validate_keys(chunk)),
+                        since,
+                    )
+                )
+            )
+        )
+        sorted_data = external_sort(
+            prepared_data,
+            key=lambda x: x["created_date"],
+            chunk_size=chunk_size,
+        )
+        seen_hashes = set()
+        for chunk in iter_chunks(sorted_data, chunk_size):
+            yield from self.deduplication(chunk, seen_hashes=seen_hashes)
+
+    @LoggerManager.log_execution
+    def drop_older_than(self, data, since):
+        """
+        Drop the records created before `since`, a created date string in the
+        feed's format. Records created at `since` itself are kept and left to
+        deduplication.
+        """
+        if since is None:
+            return data
+        kept = [record for record in data if record["created_date"] >= since]
+        metrics.record_drop(
+            "drop_older_than", "before_checkpoint", len(data) - len(kept)
+        )
+        return kept
+
     @LoggerManager.log_execution
     def sort_facts_by_created_date(self, data):
         data.sort(key=lambda x: x["created_date"])
@@ -84,12 +246,13 @@ class FactTransformer(BaseTransformer):
         for fact in data:
             if fact["fact"] == "":
                 logging.info(f"blank 'fact' found in record: {fact}")
+                metrics.record_drop("drop_blanks", "blank_fact")
                 continue
             facts.append(fact)
         return facts
 
     @LoggerManager.log_execution
-    def deduplication(self, data):
+    def deduplication(self, data, seen_hashes=None, hashed=False):
         """
         The `deduplication` function removes duplicate facts from the input
         data based on their MD5 hash values. It takes a list of dictionaries as
@@ -97,34 +260,59 @@ class FactTransformer(BaseTransformer):
         containing a fact string. The method then deduplicates the list based
         on the MD5 hash of the fact.
 
+        Duplicates within the batch are dropped first, then the remaining
+        hashes are checked against the data repository with a single bulk
+        lookup.
+
         :param data: List of dictionaries as input.
+        :param seen_hashes: An optional set of hashes seen in earlier chunks
+        of the same feed. It is updated with the hashes of this chunk.
+        :param hashed: Whether the facts already hold their `fact_hash`, e.g.
+        computed by the workers of `transform_parallel`.
 
         :return: The function `deduplication` returns a list of unique facts
         after removing any duplicates based on the hash value of the fact.
         """
-        hash_set = set()
-        unique_facts = []
+        hash_set = seen_hashes if seen_hashes is not None else set()
+        batch_unique_facts = []
         for fact in data:
             # compute md5 hash for the fact
-            hash_ = hashlib.md5(fact["fact"].encode()).hexdigest()
+            if hashed:
+                hash_ = fact["fact_hash"]
+            else:
+                hash_ = hashlib.md5(fact["fact"].encode()).hexdigest()
 
             # check if we saw the fact in this batch and skip if yes
             if hash_ in hash_set:
                 logging.info(
                     f"hash already found in the batch: {fact['fact']}"
                 )
+                metrics.record_drop("deduplication", "duplicate_in_batch")
                 continue
 
             hash_set.add(hash_)
 
-            # check if the fact is present in the data repository
-            if self.data_repository.fact_exists(hash_):
-                (f"hash already found in the data store: {fact['fact']}")
-                continue
-
             # store hash of the fact for persisting
             fact["fact_hash"] = hash_
 
+            batch_unique_facts.append(fact)
+
+        if len(batch_unique_facts) == 0:
+            return []
+
+        # check which facts are already present in the data repository
+        existing = self.data_repository.existing_hashes(
+            [fact["fact_hash"] for fact in batch_unique_facts]
+        )
+
+        unique_facts = []
+        for fact in batch_unique_facts:
+            if fact["fact_hash"] in existing:
+                logging.info(
+                    f"hash already found in the data store: {fact['fact']}"
+                )
+                metrics.record_drop("deduplication", "already_stored")
+                continue
             unique_facts.append(fact)
 
         return unique_facts
@@ -141,67 +329,95 @@ class FactTransformer(BaseTransformer):
         5. Save the new version to the database and mark the old version as
            expired.
         6. Save LSH buckets in the database.
+
+        Earlier versions within the batch are resolved in memory, and the
+        candidates of the remaining facts are retrieved with a single
+        repository call. Only stored facts are returned as expired; facts of
+        the batch that were superseded are flagged with `is_current = False`.
         """
         expired = []
-        for fact in data:
-            expired_fact_id = self.version_manager.match_and_find_version(fact)
+        expired_fact_ids = self.version_manager.match_and_find_versions(data)
+        for expired_fact_id in expired_fact_ids:
             if expired_fact_id:
                 logging.info(f"fact_id {expired_fact_id} is set to expire")
                 expired.append(expired_fact_id)
         return data, expired
 
     def contains_number(self, text):
-        # Check for digits
-        if re.search(r"\d", text):
-            return True
-
-        # Check for hyphenated number words
-        if re.search(hyphenated_numbers_pattern, text, re.IGNORECASE):
-            return True
-
-        # Check for exact number words
-        words = set(re.findall(r"\b\w+\b", text.lower()))
-        if words & number_words:
-            return True
+        """
+        Check for digits, hyphenated number words or number words with a
+        single scan of the precompiled `numeric_pattern`.
+        """
+        return contains_number(text)
 
-        return False
+    def contains_numbers(self, texts):
+        """
+        Batch variant of `contains_number`, returning a flag per text.
+        """
+        return contains_numbers(texts)
 
     @LoggerManager.log_execution
     def categorize_numeric_facts(self, data):
-        for fact in data:
-            if "fact" in fact:
-                if self.contains_number(fact["fact"]):
-                    fact["is_numeric"] = True
-                else:
-                    fact["is_numeric"] = False
-                logging.info(f"{fact['fact']} is numeric {fact['is_numeric']}")
+        facts = [fact for fact in data if "fact" in fact]
+        flags = self.contains_numbers([fact["fact"] for fact in facts])
+        for fact, is_numeric in zip(facts, flags):
+            fact["is_numeric"] = is_numeric
+            logging.info(f"{fact['fact']} is numeric {fact['is_numeric']}")
         return data
 
     @LoggerManager.log_execution
     def validate_datetime(self, data):
-        validated_data = []
+        """
+        Drop the records without a valid `created_date` and set the
+        `parsed_date` of the others. The dates of the batch are validated
+        together with `DateTimeValidator.validate_many`.
+        """
+        dated_data = []
         for record in data:
-            date_string = record.get("created_date")
-
-            if not date_string:
+            if not record.get("created_date"):
                 logging.info(f"'created_date' is missing in record: {record}")
+                metrics.record_drop(
+                    "validate_datetime", "missing_created_date"
+                )
                 continue
+            dated_data.append(record)
 
-            validated_date = self.datetime_validator.validate(date_string)
-            if validated_date:
-                record["parsed_date"] = validated_date
-                validated_data.append(record)
-            else:
+        parsed_dates, rejected = self.datetime_validator.validate_many(
+            [record["created_date"] for record in dated_data]
+        )
+        validated_data = []
+        for record, parsed_date, is_rejected in zip(
+            dated_data, parsed_dates, rejected
+        ):
+            if is_rejected:
                 logging.info(f"Invalid record: {record}")
+                metrics.record_drop(
+                    "validate_datetime", "invalid_created_date"
+                )
+                continue
+            record["parsed_date"] = parsed_date
+            validated_data.append(record)
 
         return validated_data
 
     @LoggerManager.log_execution
     def validate_keys(self, data):
+        """
+        Drop the records missing a required key. `Fact` records were checked
+        for their required fields when they were decoded, so only the other
+        required keys are checked for them.
+        """
+        fact_keys = [
+            key
+            for key in self.required_keys
+            if key not in Fact.required_fields
+        ]
         validated_data = []
         for record in data:
-            if all(key in record for key in self.required_keys):
+            keys = fact_keys if type(record) is Fact else self.required_keys
+            if all(key in record for key in keys):
                 validated_data.append(record)
             else:
                 logging.info(f"Record dropped: {record}")
+                metrics.record_drop("validate_keys", "missing_keys")
         return validated_data
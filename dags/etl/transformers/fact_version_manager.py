@@ -1,40 +1,246 @@
-from datasketch import MinHash
-from rapidfuzz import fuzz
-from sklearn.feature_extraction.text import TfidfVectorizer
+import re
+
+import numpy as np
+from datasketch.hashfunc import sha1_hash32
+from rapidfuzz import fuzz, process
+from sklearn.feature_extraction.text import (
+    ENGLISH_STOP_WORDS,
+    TfidfVectorizer,
+)
 
 from ..logging_config import LoggerManager
+from .lsh_index import LSHIndex
 
 logging = LoggerManager.get_logger(__name__)
 
+# Tokenizers available for building the MinHash of a fact
+TOKENIZERS = ("tfidf", "words", "shingles")
+
+word_pattern = re.compile(r"\w+")
+
+# Universal hashing constants of the (legacy) datasketch MinHash scheme
+mersenne_prime = np.uint64((1 << 61) - 1)
+max_hash = np.uint64((1 << 32) - 1)
+
+# Combines the rows of a band into one key, kept within a signed BIGINT
+band_multiplier = np.uint64(0x100000001B3)
+max_band_hash = np.uint64((1 << 63) - 1)
+
 
 class FactVersionManager:
     def __init__(
-        self, data_repository, num_perm=128, num_buckets=5, threshold=70
+        self,
+        data_repository,
+        num_perm=128,
+        num_buckets=20,
+        threshold=70,
+        tokenizer="words",
+        shingle_size=3,
+        rows_per_band=3,
+        batch_bucket_size=32,
     ):
+        """
+        :param num_perm: The number of MinHash permutations.
+        :param num_buckets: The number of LSH bands `b`; every fact gets one
+        bucket hash per band.
+        :param rows_per_band: The number of MinHash values `r` hashed together
+        into each band's bucket. Facts become candidates when all rows of at
+        least one band agree, which happens with probability
+        `1 - (1 - s^r)^b` for Jaccard similarity `s`. The default 20 bands of
+        3 rows put the steep part of that S-curve around `(1/b)^(1/r) = 0.37`:
+        facts with a similarity of 0.5 become candidates with probability
+        0.93 and facts with 0.1 with 0.02. Edits passing the default fuzzy
+        `threshold` of 70 usually keep a token similarity above 0.4, so they
+        are still found while unrelated facts no longer are. Every band is a
+        row of `lsh_buckets`, so more bands find slightly more versions at
+        the cost of more rows per fact. Bands of one row would make every
+        MinHash value a bucket of its own and most facts sharing a token
+        candidates. The bucket hashes of the "tfidf" tokenizer are not
+        comparable across facts, so the banding only narrows the candidates
+        of the other tokenizers.
+        :param tokenizer: How a fact is turned into MinHash tokens. "words"
+        (the default) hashes the normalized words without stop words,
+        "shingles" hashes the character shingles of the normalized text, and
+        "tfidf" fits a `TfidfVectorizer` per fact (the original behaviour).
+        Only "words" and "shingles" produce bucket hashes that are comparable
+        across facts and runs: the "tfidf" tokens are the indices of the
+        fact's own vocabulary, so they only depend on its number of distinct
+        words.
+        :param shingle_size: The length of the character shingles used by the
+        "shingles" tokenizer.
+        :param batch_bucket_size: The number of facts the in-batch index keeps
+        per bucket, the most recent ones. A fact is then fuzzy compared with
+        at most `num_buckets * batch_bucket_size` earlier facts of its batch,
+        so resolving the versions within a batch costs the same per fact
+        however large the batch, even when the buckets are not selective,
+        e.g. with the "tfidf" tokenizer. None keeps every fact.
+        """
         logging.info("Initialize FactVersionManager")
+        if num_buckets * rows_per_band > num_perm:
+            raise ValueError(
+                f"{num_buckets} bands of {rows_per_band} rows need more than "
+                f"{num_perm} permutations"
+            )
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(
+                f"Unknown tokenizer '{tokenizer}', expected one of "
+                f"{', '.join(TOKENIZERS)}"
+            )
         self.data_repository = data_repository
         self.num_perm = num_perm
         self.num_buckets = num_buckets
+        self.rows_per_band = rows_per_band
         self.threshold = threshold
+        self.tokenizer = tokenizer
+        self.shingle_size = shingle_size
+        self.batch_bucket_size = batch_bucket_size
         self.vectorizer = TfidfVectorizer(stop_words="english")
+        self.permutations = self.create_permutations(num_perm)[
+            :, : num_buckets * rows_per_band
+        ]
+
+    @staticmethod
+    def create_permutations(num_perm, seed=1):
+        """
+        Create the `(a, b)` parameters of the MinHash permutation functions,
+        drawn exactly like datasketch's legacy `MinHash(num_perm, seed)`, as a
+        2 x num_perm uint64 array.
+        """
+        gen = np.random.RandomState(seed)
+        return np.array(
+            [
+                (
+                    gen.randint(1, mersenne_prime, dtype=np.uint64),
+                    gen.randint(0, mersenne_prime, dtype=np.uint64),
+                )
+                for _ in range(num_perm)
+            ],
+            dtype=np.uint64,
+        ).T
+
+    def tokenize(self, text):
+        """
+        Turn the input text into the MinHash tokens of the configured
+        tokenizer. Raises a ValueError when the text holds no tokens.
+        """
+        if self.tokenizer == "tfidf":
+            tfidf_vector = self.vectorizer.fit_transform([text])
+            return [
+                str(index).encode("utf8")
+                for index in tfidf_vector.nonzero()[1]
+            ]
+
+        words = word_pattern.findall(text.lower())
+        if len(words) == 0:
+            raise ValueError("No tokens found in the text")
+
+        if self.tokenizer == "words":
+            tokens = {word for word in words if word not in ENGLISH_STOP_WORDS}
+            # a fact made of stop words only still needs a signature
+            if len(tokens) == 0:
+                tokens = set(words)
+        else:
+            normalized = " ".join(words)
+            tokens = {
+                normalized[i:i + self.shingle_size]
+                for i in range(
+                    max(len(normalized) - self.shingle_size + 1, 1)
+                )
+            }
+
+        return [token.encode("utf8") for token in sorted(tokens)]
 
     def create_lsh_buckets(self, text):
         """
         Create LSH buckets from input text using MinHash and return their
         hashes.
         """
-        tfidf_vector = self.vectorizer.fit_transform([text])
-        minhash = MinHash(num_perm=self.num_perm)
-        for index in tfidf_vector.nonzero()[1]:
-            minhash.update(str(index).encode("utf8"))
+        return self.create_lsh_buckets_batch([text])[0].tolist()
 
-        bucket_hashes = [
-            int.from_bytes(minhash.hashvalues[i].tobytes(), "little")
-            for i in range(self.num_buckets)
-        ]
+    def create_lsh_buckets_batch(self, texts):
+        """
+        Create the LSH bucket hashes of many texts in one vectorized pass.
+
+        The token hashes of all texts are permuted together with NumPy and
+        reduced to per-text minimums, computing only the MinHash values used
+        by the bands. The MinHash values match a datasketch legacy `MinHash`
+        updated token by token. Each band's `rows_per_band` values are then
+        hashed into the band's bucket hash.
+
+        :param texts: A list of texts
+        :return: A uint64 array of shape (len(texts), num_buckets), where
+        column `i` holds the bucket hash of band `i`
+        """
+        a, b = self.permutations
+        if len(texts) == 0:
+            return np.empty((0, self.num_buckets), dtype=np.uint64)
+
+        offsets = []
+        token_hashes = []
+        for text in texts:
+            offsets.append(len(token_hashes))
+            token_hashes.extend(
+                sha1_hash32(token) for token in self.tokenize(text)
+            )
+
+        hv = np.array(token_hashes, dtype=np.uint64)[:, np.newaxis]
+        # uint64 products wrap around exactly like datasketch's
+        phv = np.bitwise_and((hv * a + b) % mersenne_prime, max_hash)
+        signatures = np.minimum.reduceat(phv, offsets, axis=0)
+        return self.hash_bands(signatures)
 
+    def hash_bands(self, signatures):
+        """
+        Hash the MinHash signatures band by band. A band of a single row keeps
+        its MinHash value as bucket hash.
+
+        :param signatures: A uint64 array of shape
+        (N, num_buckets * rows_per_band)
+        :return: A uint64 array of shape (N, num_buckets)
+        """
+        bands = signatures.reshape(
+            len(signatures), self.num_buckets, self.rows_per_band
+        )
+        bucket_hashes = bands[:, :, 0].copy()
+        for row in range(1, self.rows_per_band):
+            bucket_hashes = bucket_hashes * band_multiplier + bands[:, :, row]
+        if self.rows_per_band > 1:
+            bucket_hashes &= max_band_hash
         return bucket_hashes
 
+    def rebuild_lsh_buckets(self, batch_size=1000):
+        """
+        Recompute the LSH buckets of all current facts in the data repository
+        with the configured tokenizer, replacing the stored buckets. Run it
+        after switching tokenizers so new facts are compared against buckets
+        built the same way.
+
+        :return: The number of facts whose buckets were rebuilt
+        """
+        rebuilt = 0
+        after_id = 0
+        while True:
+            facts = self.data_repository.get_current_facts(
+                after_id=after_id, limit=batch_size
+            )
+            if len(facts) == 0:
+                break
+            bucket_hashes_batch = self.create_lsh_buckets_batch(
+                [fact for _, fact in facts]
+            )
+            self.data_repository.replace_lsh_buckets(
+                {
+                    fact_id: bucket_hashes.tolist()
+                    for (fact_id, _), bucket_hashes in zip(
+                        facts, bucket_hashes_batch
+                    )
+                }
+            )
+            rebuilt += len(facts)
+            after_id = facts[-1][0]
+            logging.info(f"Rebuilt LSH buckets for {rebuilt} fact(s)")
+        return rebuilt
+
     def get_similar_fact_ids(self, bucket_hashes):
         """
         Retrieve IDs of facts similar to those in the given LSH buckets.
@@ -45,6 +251,16 @@ class FactVersionManager:
         )
         return similar_fact_ids
 
+    def get_similar_facts_for_batch(self, bucket_hashes_batch):
+        """
+        Retrieve the similar facts of a whole batch with one repository call,
+        grouped by input fact.
+        """
+
+        return self.data_repository.find_similar_facts_for_batch(
+            bucket_hashes_batch
+        )
+
     def match_and_find_version(self, fact):
         """
         Match the input fact with similar facts and return the ID of the best
@@ -57,31 +273,155 @@ class FactVersionManager:
         fact["bucket_hashes"] = bucket_hashes
         candidates = self.get_similar_fact_ids(bucket_hashes)
 
-        logging.info(
-            f"Found {len(candidates)} candidate(s) for: {fact['fact']}"
+        return self.match_candidates(fact, candidates)
+
+    def match_and_find_versions(self, facts):
+        """
+        Batched variant of `match_and_find_version`. Returns the ID of the
+        stored fact each input fact supersedes (or None), in the same order as
+        the input, which is expected to be sorted by created date.
+
+        The candidates of the whole batch are fetched from the data
+        repository with a single call, then the facts are resolved in order.
+        Earlier versions within the batch are looked up first through an
+        in-memory LSH index. A fact that supersedes an earlier fact of the
+        batch takes over its fact number (or references it through
+        `previous_fact_hash` when the earlier fact is new), and the earlier
+        fact is flagged with `is_current = False`. A stored fact is only
+        superseded once per batch: a later fact matching a stored fact that
+        an earlier fact of the batch already claimed supersedes that earlier
+        fact instead.
+
+        Facts that already hold their `bucket_hashes` are not hashed again.
+        """
+
+        if len(facts) == 0:
+            return []
+
+        if all("bucket_hashes" in fact for fact in facts):
+            # computed ahead, e.g. by FactTransformer.transform_parallel
+            bucket_hashes_batch = [fact["bucket_hashes"] for fact in facts]
+        else:
+            bucket_hashes_batch = self.create_lsh_buckets_batch(
+                [fact["fact"] for fact in facts]
+            ).tolist()
+        for fact, bucket_hashes in zip(facts, bucket_hashes_batch):
+            fact["bucket_hashes"] = bucket_hashes
+
+        candidates_batch = self.get_similar_facts_for_batch(
+            bucket_hashes_batch
         )
 
+        index = LSHIndex(bucket_size=self.batch_bucket_size)
+        previous_versions = {}
+        expired = [None] * len(facts)
+        # stored fact id -> position of the latest batch fact superseding it,
+        # and the other way around
+        claimed = {}
+        claims = {}
+        for position, (fact, bucket_hashes, candidates) in enumerate(
+            zip(facts, bucket_hashes_batch, candidates_batch)
+        ):
+            previous = self.find_previous_in_batch(facts, fact, index)
+            if previous is None:
+                top_scorer = self.find_best_match(fact["fact"], candidates)
+                if top_scorer is not None and top_scorer[0] in claimed:
+                    logging.info(
+                        f"Previous version {top_scorer} is already "
+                        f"superseded within the batch"
+                    )
+                    previous = claimed[top_scorer[0]]
+                elif top_scorer is not None:
+                    logging.info(f"Found previous version {top_scorer}")
+                    fact["fact_number"] = top_scorer[1]
+                    expired[position] = top_scorer[0]
+                    claimed[top_scorer[0]] = position
+                    claims[position] = top_scorer[0]
+
+            if previous is not None:
+                previous_versions[position] = previous
+                index.remove(previous)
+                if previous in claims:
+                    claims[position] = claims.pop(previous)
+                    claimed[claims[position]] = position
+            index.add(position, bucket_hashes)
+
+        # positions are visited in order, so an earlier version always has
+        # its own fact number resolved before it is handed on
+        for position in sorted(previous_versions):
+            fact = facts[position]
+            previous_fact = facts[previous_versions[position]]
+            previous_fact["is_current"] = False
+            if "fact_number" in previous_fact:
+                fact["fact_number"] = previous_fact["fact_number"]
+            else:
+                fact["previous_fact_hash"] = previous_fact["fact_hash"]
+
+        return expired
+
+    def find_previous_in_batch(self, facts, fact, index):
+        """
+        Return the position of the earlier fact of the batch the fact
+        supersedes, or None. Only the facts still in the index, i.e. not
+        superseded yet, are considered.
+        """
+
+        candidates = [
+            (candidate, None, facts[candidate]["fact"])
+            for candidate in index.query(fact["bucket_hashes"])
+        ]
+        top_scorer = self.find_best_match(fact["fact"], candidates)
+        if top_scorer is None:
+            return None
+        logging.info(f"Found previous version within the batch {top_scorer}")
+        return top_scorer[0]
+
+    def find_best_match(self, text, candidates):
+        """
+        Fuzzy compare the text against `(id, fact_number, fact)` candidates
+        and return the best scoring `(id, fact_number, score)` tuple passing
+        the threshold, or None. Every candidate is scored once, and
+        candidates are skipped as soon as they can no longer beat the
+        threshold or the best score so far.
+        """
+
+        candidates = list(candidates)
         if len(candidates) == 0:
             return None
 
-        match_scores = [
-            (
-                candidate[0],
-                candidate[1],
-                fuzz.ratio(current_fact, candidate[2]),
-            )
-            for candidate in candidates
-            if fuzz.ratio(current_fact, candidate[2]) > self.threshold
-        ]
+        match = process.extractOne(
+            text,
+            [candidate[2] for candidate in candidates],
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold,
+        )
+
+        # the threshold has to be exceeded, not just reached
+        if match is None or match[1] <= self.threshold:
+            logging.info("Found no candidate passing the threshold")
+            return None
+
+        _, score, index = match
+        return (candidates[index][0], candidates[index][1], score)
+
+    def match_candidates(self, fact, candidates):
+        """
+        Fuzzy compare the fact against its candidates and return the ID of the
+        best match passing the threshold. Sets the fact number of the match on
+        the fact.
+        """
 
         logging.info(
-            f"Found {len(match_scores)} candidate(s) passing the threshold"
+            f"Found {len(candidates)} candidate(s) for: {fact['fact']}"
         )
 
-        if len(match_scores) == 0:
+        if len(candidates) == 0:
             return None
 
-        top_scorer = max(match_scores, key=lambda x: x[2])
+        top_scorer = self.find_best_match(fact["fact"], candidates)
+
+        if top_scorer is None:
+            return None
 
         logging.info(f"Found previous version {top_scorer}")
         fact["fact_number"] = top_scorer[1]
@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+
+class LSHIndex:
+    """
+    In-memory index mapping LSH bucket hashes to the positions of facts within
+    a batch. Used to find earlier versions of a fact inside the batch being
+    transformed, without a database round trip.
+
+    Bucket hashes are given per band, like the rows of `lsh_buckets`, and only
+    match bucket hashes of the same band.
+
+    With a `bucket_size`, each bucket only keeps its most recently added
+    positions, so a query returns at most `bucket_size` positions per band
+    however many facts of the batch share its buckets, e.g. with a small
+    vocabulary or a tokenizer whose buckets are not selective.
+    """
+
+    def __init__(self, bucket_size=None):
+        """
+        :param bucket_size: The number of positions kept per bucket, all of
+        them when None
+        """
+        self.bucket_size = bucket_size
+        # dictionaries keep the positions of a bucket in insertion order
+        self.buckets = defaultdict(dict)
+        self.position_buckets = {}
+
+    def add(self, position, bucket_hashes):
+        """
+        Index the fact at `position` under each of its bucket hashes.
+        """
+        keys = list(enumerate(bucket_hashes))
+        self.position_buckets[position] = keys
+        for key in keys:
+            positions = self.buckets[key]
+            positions[position] = None
+            if self.bucket_size is not None:
+                while len(positions) > self.bucket_size:
+                    # evict the oldest position of the bucket
+                    del positions[next(iter(positions))]
+
+    def remove(self, position):
+        """
+        Drop the fact at `position` from the index, e.g. once it has been
+        superseded by a newer version.
+        """
+        for key in self.position_buckets.pop(position, []):
+            positions = self.buckets.get(key)
+            if positions is None:
+                continue
+            positions.pop(position, None)
+            if len(positions) == 0:
+                del self.buckets[key]
+
+    def query(self, bucket_hashes):
+        """
+        Return the positions sharing the bucket hash of at least one band with
+        the given ones, in ascending order.
+        """
+        positions = set()
+        for key in enumerate(bucket_hashes):
+            positions.update(self.buckets.get(key, {}).keys())
+        return sorted(positions)
+
+    def __len__(self):
+        return len(self.position_buckets)
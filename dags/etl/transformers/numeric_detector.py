@@ -0,0 +1,91 @@
+import re
+
+from .constants import (
+    hyphenated_numbers_pattern,
+    number_words,
+    tens_number_words,
+    unit_number_words,
+)
+
+
+def word_alternation(words):
+    """
+    Build a regular expression alternation matching any of the words, nested
+    by common prefix (e.g. "t(?:en|wo)") so the regex engine tries each
+    character once instead of every word in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for character in word:
+            node = node.setdefault(character, {})
+        node[""] = {}
+
+    def build(node):
+        optional = "" in node
+        branches = [
+            re.escape(character) + build(child)
+            for character, child in sorted(node.items())
+            if character != ""
+        ]
+        if len(branches) == 0:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        pattern = f"(?:{'|'.join(branches)})"
+        return f"{pattern}?" if optional else pattern
+
+    return build(trie)
+
+
+def first_letters(*word_lists):
+    """
+    Build a regular expression character class matching the first letter of
+    any of the words.
+    """
+    letters = {word[0] for words in word_lists for word in words}
+    return f"[{''.join(re.escape(letter) for letter in sorted(letters))}]"
+
+
+# Finds digits, hyphenated number words and number words in a single scan of
+# the lowercased text. Hyphenated number words are matched case-insensitively
+# like `hyphenated_numbers_pattern`, and the lookahead skips the remaining
+# alternatives at positions no number word can start from. It is matched
+# case-insensitively too, so it lets through characters like "ſ" that only
+# match a first letter of the hyphenated number words that way.
+numeric_pattern = re.compile(
+    r"\d|\b(?=(?i:"
+    + first_letters(tens_number_words, number_words)
+    + "))(?:(?i:"
+    + word_alternation(tens_number_words)
+    + "-"
+    + word_alternation(unit_number_words)
+    + ")|"
+    + word_alternation(number_words)
+    + r")\b"
+)
+
+hyphenated_pattern = re.compile(hyphenated_numbers_pattern, re.IGNORECASE)
+
+
+def contains_number(text):
+    """
+    Check whether the text holds digits, hyphenated number words or number
+    words.
+    """
+    lowered = text.lower()
+    if numeric_pattern.search(lowered) is not None:
+        return True
+    # lowercasing may expand characters, e.g. "İ" into "i" and a combining
+    # dot, which then no longer match the hyphenated number words
+    return (
+        len(lowered) != len(text)
+        and hyphenated_pattern.search(text) is not None
+    )
+
+
+def contains_numbers(texts):
+    """
+    Batch variant of `contains_number`, returning a flag per text.
+    """
+    return [contains_number(text) for text in texts]
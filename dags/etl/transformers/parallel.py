@@ -0,0 +1,82 @@
+import hashlib
+
+from ..metrics import metrics
+from .fact_version_manager import FactVersionManager
+
+# The transformer of a worker process, built once by `init_worker`
+_worker_transformer = None
+
+
+def version_manager_options(version_manager):
+    """
+    Return the keyword arguments recreating the LSH settings of a version
+    manager in a worker process, which has no data repository of its own.
+    """
+    return {
+        "num_perm": version_manager.num_perm,
+        "num_buckets": version_manager.num_buckets,
+        "threshold": version_manager.threshold,
+        "tokenizer": version_manager.tokenizer,
+        "shingle_size": version_manager.shingle_size,
+        "rows_per_band": version_manager.rows_per_band,
+    }
+
+
+def init_worker(required_keys, datetime_validator, options):
+    """
+    Process pool initializer building the worker's transformer. Workers only
+    run the record-local stages and never touch the data repository.
+    """
+    # imported here as the transformer module imports this one
+    from .fact_transformer import FactTransformer
+
+    global _worker_transformer
+    _worker_transformer = FactTransformer(
+        data_repository=None,
+        required_keys=required_keys,
+        version_manager=FactVersionManager(None, **options),
+    )
+    _worker_transformer.datetime_validator = datetime_validator
+
+
+def prepare_records(records, since=None):
+    """
+    Validate and clean a partition of raw records and hash their facts.
+    Records created before `since` are dropped right after date validation.
+
+    :return: A tuple of the records surviving the cleanup, each with its
+    `fact_hash`, and the `(stage, reason, count)` drop counts of the worker
+    """
+    # the worker's metrics only cover this partition
+    metrics.reset()
+    transformer = _worker_transformer
+    records = transformer.drop_blanks(
+        transformer.clean_whitespaces(
+            transformer.drop_older_than(
+                transformer.validate_datetime(
+                    transformer.validate_keys(records)
+                ),
+                since,
+            )
+        )
+    )
+    for record in records:
+        record["fact_hash"] = hashlib.md5(record["fact"].encode()).hexdigest()
+    return records, metrics.drop_counts()
+
+
+def describe_facts(facts):
+    """
+    Compute the LSH bucket hashes and the numeric flag of a partition of fact
+    strings.
+
+    :return: A list of `(bucket_hashes, is_numeric)` tuples, one per fact
+    """
+    transformer = _worker_transformer
+    bucket_hashes_batch = (
+        transformer.version_manager.create_lsh_buckets_batch(facts).tolist()
+    )
+    return [
+        (bucket_hashes, transformer.contains_number(fact))
+        for fact, bucket_hashes in zip(facts, bucket_hashes_batch)
+    ]
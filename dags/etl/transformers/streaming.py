@@ -0,0 +1,63 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+
+
+def iter_chunks(iterable, chunk_size):
+    """
+    Split an iterable into lists of at most `chunk_size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def external_sort(records, key, chunk_size):
+    """
+    Sort records of any volume while holding at most `chunk_size` of them in
+    memory.
+
+    Records are read in chunks, each chunk is sorted and spilled to a
+    temporary file, and the sorted runs are merged lazily. Like `list.sort`,
+    the sort is stable. Input fitting in a single chunk never touches the
+    disk.
+
+    :param records: An iterable of picklable records
+    :param key: The sort key function
+    :param chunk_size: The maximum number of records sorted in memory
+    :return: A generator yielding the records in sorted order
+    """
+    runs = []
+    try:
+        for chunk in iter_chunks(records, chunk_size):
+            chunk.sort(key=key)
+            if len(runs) == 0 and len(chunk) < chunk_size:
+                yield from chunk
+                return
+            runs.append(_spill(chunk))
+
+        # heapq.merge prefers earlier runs on ties, which keeps it stable
+        yield from heapq.merge(*(_read_run(run) for run in runs), key=key)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _spill(chunk):
+    run = tempfile.TemporaryFile()
+    for record in chunk:
+        pickle.dump(record, run, protocol=pickle.HIGHEST_PROTOCOL)
+    return run
+
+
+def _read_run(run):
+    run.seek(0)
+    while True:
+        try:
+            yield pickle.load(run)
+        except EOFError:
+            return
@@ -1,20 +1,47 @@
+import functools
+import os
 from datetime import datetime
 
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 from etl.config import Config
 from etl.error_reporting import ErrorReporter
-from etl.extractors import JSONURLExtractor
+from etl.extractors import (
+    HTTPCache,
+    JSONFileExtractor,
+    JSONURLExtractor,
+    MultiSourceJSONExtractor,
+    NoNewData,
+    set_query_param,
+)
+from etl.fact_record import to_facts
+from etl.json_decoder import get_decoder
 from etl.loaders.facts_loader import FactsLoader
 from etl.logging_config import LoggerManager
+from etl.metrics import metrics
 from etl.repositories.postgres_repository import PostgresRepository
+from etl.storage import (
+    read_records,
+    remove_run_directory,
+    run_directory,
+    write_records,
+)
 from etl.transformers.fact_transformer import FactTransformer
+from etl.transformers.fact_version_manager import FactVersionManager
 
 # get logging
 logging = LoggerManager.get_logger(__name__)
 
 # Initialize the ErrorReporter with console output enabled
-error_reporter = ErrorReporter(logging, enable_console=True)
+error_reporter = ErrorReporter(
+    logging,
+    enable_console=True,
+    metrics_json_path=Config.metrics_json_path,
+    metrics_prometheus_path=Config.metrics_prometheus_path,
+)
+
+# Tasks whose metrics are merged into the summary report
+METRICS_TASK_IDS = ("extract", "transform", "load")
 
 
 url = Config.resource_url
@@ -23,40 +50,171 @@ db_uri = Config.db_uri
 repository = PostgresRepository(db_uri)
 
 
+def http_cache():
+    """
+    The cache of the feed's validators, or None if it is disabled. In a
+    multi-worker deployment, point `HTTP_CACHE_DIR` at shared storage.
+    """
+    if Config.http_cache_dir:
+        return HTTPCache(Config.http_cache_dir)
+    return None
+
+
+def get_watermark():
+    """
+    The created date of the newest fact loaded by an incremental run, or None
+    if the run is not incremental or there is none yet.
+    """
+    if not Config.incremental:
+        return None
+    watermark = repository.get_checkpoint(FactsLoader.watermark_name)
+    if watermark is None:
+        return None
+    return watermark["last_created_date"]
+
+
+def collect_metrics(task):
+    """
+    Collect the metrics of a task, which runs in its own process, and hand
+    them to the summary task through XCom.
+    """
+
+    @functools.wraps(task)
+    def wrapper(**kwargs):
+        metrics.reset()
+        try:
+            return task(**kwargs)
+        finally:
+            kwargs["ti"].xcom_push(key="metrics", value=metrics.summary())
+
+    return wrapper
+
+
+@collect_metrics
 def etl_extract(**kwargs):
     try:
-        extractor = JSONURLExtractor(url)
+        source_url = url
+        source_urls = Config.resource_urls
+        since = get_watermark()
+        if since is not None and Config.watermark_param:
+            # let the source filter out what was already loaded
+            source_url = set_query_param(url, Config.watermark_param, since)
+            source_urls = [
+                set_query_param(source, Config.watermark_param, since)
+                for source in source_urls
+            ]
+        decoder = get_decoder(Config.json_decoder)
+        if Config.resource_path:
+            extractor = JSONFileExtractor(
+                Config.resource_path,
+                stream=Config.stream_extract,
+                decoder=decoder,
+            )
+        elif source_urls:
+            extractor = MultiSourceJSONExtractor(
+                source_urls,
+                max_workers=Config.extract_workers,
+                per_host_limit=Config.extract_per_host_limit,
+                decoder=decoder,
+            )
+        else:
+            extractor = JSONURLExtractor(
+                source_url,
+                stream=Config.stream_extract,
+                cache=http_cache(),
+                decoder=decoder,
+            )
         raw_data = extractor.extract()
-        return raw_data
+        if isinstance(raw_data, NoNewData):
+            return None
+        if isinstance(extractor, JSONURLExtractor) and Config.http_cache_dir:
+            # stored by the load task once the data has been loaded
+            kwargs["ti"].xcom_push(
+                key="validators",
+                value={"url": source_url, "validators": extractor.validators},
+            )
+        # only the path goes through XCom, the records stay on disk
+        return write_records(
+            os.path.join(run_directory(kwargs["run_id"]), "raw.ndjson.gz"),
+            raw_data,
+        )
     except Exception as e:
         error_reporter.report_error(f"Extraction error: {e}")
         raise e
 
 
+@collect_metrics
 def etl_transform(**kwargs):
     try:
-        raw_data = kwargs["ti"].xcom_pull(task_ids="extract")
-        transformer = FactTransformer(data_repository=repository)
-        transformed_data, expired_data = transformer.transform(raw_data)
-        return transformed_data, expired_data
+        path = kwargs["ti"].xcom_pull(task_ids="extract")
+        if path is None:
+            raw_data = NoNewData()
+        elif Config.typed_facts:
+            raw_data = list(to_facts(read_records(path)))
+        else:
+            raw_data = list(read_records(path))
+        version_manager = FactVersionManager(
+            repository,
+            num_perm=Config.lsh_num_perm,
+            num_buckets=Config.lsh_bands,
+            tokenizer=Config.lsh_tokenizer,
+            rows_per_band=Config.lsh_rows_per_band,
+        )
+        transformer = FactTransformer(
+            data_repository=repository,
+            version_manager=version_manager,
+            workers=Config.transform_workers,
+        )
+        transformed_data, expired_data = transformer.transform(
+            raw_data, since=get_watermark()
+        )
+        if isinstance(transformed_data, NoNewData):
+            return None
+        directory = run_directory(kwargs["run_id"])
+        return {
+            "transformed": write_records(
+                os.path.join(directory, "transformed.ndjson.gz"),
+                transformed_data,
+            ),
+            "expired": write_records(
+                os.path.join(directory, "expired.ndjson.gz"), expired_data
+            ),
+        }
     except Exception as e:
         error_reporter.report_error(f"Transformation error: {e}")
         raise e
 
 
+@collect_metrics
 def etl_load(**kwargs):
     try:
-        transformed_data, expired_data = kwargs["ti"].xcom_pull(
-            task_ids="transform"
-        )
+        paths = kwargs["ti"].xcom_pull(task_ids="transform")
+        if paths is None:
+            transformed_data, expired_data = NoNewData(), []
+        else:
+            transformed_data = list(read_records(paths["transformed"]))
+            expired_data = list(read_records(paths["expired"]))
         loader = FactsLoader(data_repository=repository)
-        loader.load(transformed_data, expired_data)
+        if Config.incremental:
+            loader.load_with_watermark(transformed_data, expired_data)
+        else:
+            loader.load(transformed_data, expired_data)
+        cache = http_cache()
+        fetched = kwargs["ti"].xcom_pull(task_ids="extract", key="validators")
+        if cache is not None and fetched is not None:
+            cache.store(fetched["url"], fetched["validators"])
+        remove_run_directory(kwargs["run_id"])
     except Exception as e:
         error_reporter.report_error(f"Loading error: {e}")
         raise e
 
 
 def send_summary_report(**kwargs):
+    metrics.reset()
+    for task_id in METRICS_TASK_IDS:
+        task_metrics = kwargs["ti"].xcom_pull(task_ids=task_id, key="metrics")
+        if task_metrics is not None:
+            metrics.merge_summary(task_metrics)
     error_reporter.send_summary_report()
 
 
@@ -1,37 +1,125 @@
 from dags.etl.config import Config
 from dags.etl.error_reporting import ErrorReporter
-from dags.etl.extractors import JSONURLExtractor
+from dags.etl.extractors import (
+    HTTPCache,
+    JSONFileExtractor,
+    JSONURLExtractor,
+    MultiSourceJSONExtractor,
+    set_query_param,
+)
+from dags.etl.fact_record import to_facts
+from dags.etl.json_decoder import get_decoder
 from dags.etl.loaders.facts_loader import FactsLoader
 from dags.etl.logging_config import LoggerManager
-from dags.etl.repositories.postgres_repository import PostgresRepository
+from dags.etl.metrics import metrics
+from dags.etl.repositories import InMemoryRepository, PostgresRepository
 from dags.etl.transformers.fact_transformer import FactTransformer
+from dags.etl.transformers.fact_version_manager import FactVersionManager
 
 # get logging
 logging = LoggerManager.get_logger(__name__)
 
 # Initialize the ErrorReporter with console output enabled
-error_reporter = ErrorReporter(logging, enable_console=True)
+error_reporter = ErrorReporter(
+    logging,
+    enable_console=True,
+    metrics_json_path=Config.metrics_json_path,
+    metrics_prometheus_path=Config.metrics_prometheus_path,
+)
+
+# Name of the etl_state row holding the checkpoint of a chunked run
+CHECKPOINT_NAME = "run_etl"
 
 
 def run_etl():
+    metrics.reset()
     try:
         url = Config.resource_url
+        urls = Config.resource_urls
+
+        if Config.repository == "memory":
+            repository = InMemoryRepository()
+        else:
+            db_uri = Config.db_uri
+            repository = PostgresRepository(db_uri)
+
+        since = None
+        if Config.incremental:
+            since = get_watermark(repository)
+            if since is not None and Config.watermark_param:
+                # let the source filter out what was already loaded
+                url = set_query_param(url, Config.watermark_param, since)
+                urls = [
+                    set_query_param(source, Config.watermark_param, since)
+                    for source in urls
+                ]
 
         # Step 1: Extract the data
-        extractor = JSONURLExtractor(url)
+        decoder = get_decoder(Config.json_decoder)
+        if Config.resource_path:
+            extractor = JSONFileExtractor(
+                Config.resource_path,
+                stream=Config.stream_extract,
+                decoder=decoder,
+            )
+        elif urls:
+            extractor = MultiSourceJSONExtractor(
+                urls,
+                max_workers=Config.extract_workers,
+                per_host_limit=Config.extract_per_host_limit,
+                decoder=decoder,
+            )
+        else:
+            cache = None
+            if Config.http_cache_dir:
+                cache = HTTPCache(Config.http_cache_dir)
+            extractor = JSONURLExtractor(
+                url,
+                stream=Config.stream_extract,
+                cache=cache,
+                decoder=decoder,
+            )
         raw_data = extractor.extract()
-
-        db_uri = Config.db_uri
-        repository = PostgresRepository(db_uri)
+        if Config.typed_facts:
+            raw_data = to_facts(raw_data)
 
         # Step 2: Transform the data
-        transformer = FactTransformer(data_repository=repository)
-        transformed_data, expired_data = transformer.transform(raw_data)
+        version_manager = FactVersionManager(
+            repository,
+            num_perm=Config.lsh_num_perm,
+            num_buckets=Config.lsh_bands,
+            tokenizer=Config.lsh_tokenizer,
+            rows_per_band=Config.lsh_rows_per_band,
+        )
+        transformer = FactTransformer(
+            data_repository=repository,
+            version_manager=version_manager,
+            workers=Config.transform_workers,
+        )
+
+        if Config.transform_chunk_size:
+            # Step 2 and 3: Transform and load the data chunk by chunk
+            run_chunked(
+                raw_data,
+                transformer,
+                repository,
+                chunk_size=Config.transform_chunk_size,
+                incremental=Config.incremental,
+            )
+            extractor.commit()
+            return
+
+        transformed_data, expired_data = transformer.transform(
+            raw_data, since=since
+        )
 
         # Step 3: Load the data into PostgreSQL
         loader = FactsLoader(data_repository=repository)
-        loader.load(transformed_data, expired_data)
-        pass
+        if Config.incremental:
+            loader.load_with_watermark(transformed_data, expired_data)
+        else:
+            loader.load(transformed_data, expired_data)
+        extractor.commit()
     except Exception as e:
         error_reporter.report_error(str(e))
     finally:
@@ -39,5 +127,58 @@ def run_etl():
         error_reporter.send_summary_report()
 
 
+def get_watermark(repository):
+    """
+    Read the created date of the newest fact an incremental run loaded.
+
+    :return: The created date string, or None before the first incremental
+    run
+    """
+    watermark = repository.get_checkpoint(FactsLoader.watermark_name)
+    if watermark is None:
+        return None
+    logging.info(f"Processing the records created since {watermark}")
+    return watermark["last_created_date"]
+
+
+def run_chunked(
+    raw_data, transformer, repository, chunk_size, incremental=False
+):
+    """
+    Transform and load the data one chunk at a time. Every chunk is committed
+    together with a checkpoint, so a failed run resumes after the last
+    committed chunk when it is retried. The checkpoint is cleared once the
+    whole feed has been loaded.
+
+    In an incremental run the watermark serves as the checkpoint. As chunks
+    are loaded in created date order, it is kept once the run completes and
+    the next run starts from it.
+    """
+    checkpoint_name = CHECKPOINT_NAME
+    if incremental:
+        checkpoint_name = FactsLoader.watermark_name
+    checkpoint = repository.get_checkpoint(checkpoint_name)
+    since = None
+    records_loaded = 0
+    if checkpoint is not None:
+        logging.info(f"Resuming from checkpoint {checkpoint}")
+        since = checkpoint["last_created_date"]
+        records_loaded = checkpoint["records_loaded"]
+
+    loader = FactsLoader(
+        data_repository=repository, records_loaded=records_loaded
+    )
+    for transformed_data, expired_data in transformer.transform_stream(
+        raw_data, chunk_size=chunk_size, since=since
+    ):
+        checkpoint = loader.load_chunk(
+            transformed_data, expired_data, checkpoint_name
+        )
+        logging.info(f"Committed chunk up to checkpoint {checkpoint}")
+
+    if not incremental:
+        repository.clear_checkpoint(CHECKPOINT_NAME)
+
+
 if __name__ == "__main__":
     run_etl()
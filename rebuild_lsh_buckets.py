@@ -0,0 +1,32 @@
+from dags.etl.config import Config
+from dags.etl.logging_config import LoggerManager
+from dags.etl.repositories.postgres_repository import PostgresRepository
+from dags.etl.transformers.fact_version_manager import FactVersionManager
+
+# get logging
+logging = LoggerManager.get_logger(__name__)
+
+
+def rebuild_lsh_buckets():
+    """
+    Recompute the stored LSH buckets of all current facts with the tokenizer
+    and banding configured through the `LSH_*` environment variables. Run it
+    once after changing them, before the next ETL run.
+    """
+    repository = PostgresRepository(Config.db_uri)
+    version_manager = FactVersionManager(
+        repository,
+        num_perm=Config.lsh_num_perm,
+        num_buckets=Config.lsh_bands,
+        tokenizer=Config.lsh_tokenizer,
+        rows_per_band=Config.lsh_rows_per_band,
+    )
+    rebuilt = version_manager.rebuild_lsh_buckets()
+    logging.info(
+        f"Rebuilt LSH buckets of {rebuilt} fact(s) with the "
+        f"'{Config.lsh_tokenizer}' tokenizer"
+    )
+
+
+if __name__ == "__main__":
+    rebuild_lsh_buckets()
@@ -23,4 +23,40 @@ CREATE TABLE IF NOT EXISTS lsh_buckets (
     FOREIGN KEY(fact_id) REFERENCES facts(id)
 );
 
-CREATE INDEX idx__lsh_buckets__bucket_hash ON lsh_buckets (bucket_hash);
\ No newline at end of file
+-- allocate fact numbers from a sequence instead of MAX(fact_number)
+CREATE SEQUENCE IF NOT EXISTS facts_fact_number_seq
+    OWNED BY facts.fact_number;
+
+-- never move the sequence backwards when re-applied to a live database
+SELECT setval(
+    'facts_fact_number_seq',
+    GREATEST(
+        COALESCE((SELECT MAX(fact_number) FROM facts), 0),
+        (SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END
+         FROM facts_fact_number_seq)
+    ) + 1,
+    false
+);
+
+CREATE INDEX IF NOT EXISTS idx__facts__fact_number ON facts (fact_number);
+
+-- banded LSH: every bucket hash belongs to one band of the fact's signature.
+-- Buckets stored before this migration have no band; recompute them with
+-- rebuild_lsh_buckets.py
+ALTER TABLE lsh_buckets ADD COLUMN IF NOT EXISTS band SMALLINT;
+
+CREATE INDEX IF NOT EXISTS idx__lsh_buckets__band__bucket_hash
+    ON lsh_buckets (band, bucket_hash);
+
+-- candidate lookups always filter on the band, so the index on bucket_hash
+-- alone is redundant with the one above
+DROP INDEX IF EXISTS idx__lsh_buckets__bucket_hash;
+
+-- pipeline state, e.g. the checkpoint of a chunked run
+CREATE TABLE IF NOT EXISTS etl_state(
+    name                TEXT PRIMARY KEY,
+    last_created_date   TEXT,
+    last_fact_hash      CHAR(32),
+    records_loaded      INTEGER NOT NULL DEFAULT 0,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT now()
+);
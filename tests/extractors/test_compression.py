@@ -0,0 +1,193 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from ...dags.etl.exceptions import (
+    MalformedJsonError,
+    UnsupportedCompressionError,
+)
+from ...dags.etl.extractors import compression
+from ...dags.etl.extractors.compression import (
+    ChunkDecompressor,
+    accept_encoding,
+    compression_of,
+    decompress,
+    response_body,
+    strip_compression_suffix,
+)
+
+payload = b"".join(b'{"fact": "Fact %d"}\n' % number for number in range(1000))
+
+
+def compress(data, codec):
+    if codec == "gzip":
+        return gzip.compress(data)
+    if codec == "bz2":
+        return bz2.compress(data)
+    if codec == "xz":
+        return lzma.compress(data)
+    if codec == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        # two frames, as written by parallel or appending compressors
+        middle = len(data) // 2
+        return zstandard.ZstdCompressor().compress(
+            data[:middle]
+        ) + zstandard.ZstdCompressor().compress(data[middle:])
+    if codec == "br":
+        brotli = pytest.importorskip("brotli")
+        return brotli.compress(data)
+    return data
+
+
+class PassThroughReader(ChunkDecompressor):
+    def decompress(self, chunk):
+        return chunk
+
+    def finished(self):
+        return True
+
+
+class TestCompression:
+    """
+    The `TestCompression` class contains unit tests for the decompression
+    helpers of etl.extractors.compression.
+    """
+
+    @pytest.mark.parametrize("codec", ["gzip", "bz2", "xz", "zstd", "br"])
+    def test_decompress(self, codec):
+        """
+        The function `test_decompress` tests that every codec is decompressed
+        as a stream that can be read line by line.
+        """
+        stream = decompress(io.BytesIO(compress(payload, codec)), codec)
+
+        lines = list(stream)
+
+        assert len(lines) == 1000
+        assert b"".join(lines) == payload
+
+    @pytest.mark.parametrize("codec", ["gzip", "bz2", "xz", "zstd", "br"])
+    def test_decompress_truncated(self, codec):
+        """
+        The function `test_decompress_truncated` tests that truncated data
+        raises `MalformedJsonError` naming the codec and the source.
+        """
+        compressed = compress(payload, codec)
+        stream = decompress(
+            io.BytesIO(compressed[: len(compressed) // 2]), codec, "dump"
+        )
+
+        with pytest.raises(MalformedJsonError, match=f"{codec} data of dump"):
+            stream.read()
+
+    @pytest.mark.parametrize("codec", ["gzip", "bz2", "xz", "zstd", "br"])
+    def test_decompress_corrupt(self, codec):
+        """
+        The function `test_decompress_corrupt` tests that corrupt data raises
+        `MalformedJsonError` instead of the codec's own exception.
+        """
+        compressed = bytearray(compress(payload, codec))
+        for position in range(len(compressed) // 4, len(compressed) // 2):
+            compressed[position] ^= 0xFF
+
+        with pytest.raises(MalformedJsonError, match="is corrupt"):
+            decompress(io.BytesIO(bytes(compressed)), codec).read()
+
+    def test_decompress_not_compressed(self):
+        """
+        The function `test_decompress_not_compressed` tests that data which
+        is not compressed at all raises `MalformedJsonError` too.
+        """
+        with pytest.raises(MalformedJsonError, match="gzip data of dump"):
+            decompress(io.BytesIO(payload), "gzip", "dump").read()
+
+    def test_decompress_missing_library(self, mocker):
+        """
+        The function `test_decompress_missing_library` tests that a codec
+        whose optional library is missing raises
+        `UnsupportedCompressionError`.
+        """
+        mocker.patch.object(compression, "zstandard", None)
+
+        with pytest.raises(UnsupportedCompressionError, match="zstandard"):
+            decompress(io.BytesIO(b""), "zstd")
+
+    def test_chunk_decompressor_small_reads(self):
+        """
+        The function `test_chunk_decompressor_small_reads` tests that the
+        decompressed chunks are handed out in order whatever the size of the
+        reads, including reads smaller than a chunk.
+        """
+        reader = PassThroughReader(io.BytesIO(payload), chunk_size=1000)
+
+        parts = iter(lambda: reader.read(7), b"")
+
+        assert b"".join(parts) == payload
+
+    def test_compression_of(self):
+        """
+        The function `test_compression_of` tests that the codec is told from
+        the extension, ignoring the query string.
+        """
+        assert compression_of("dumps/2024-01-01.json.gz") == "gzip"
+        assert compression_of("https://example.com/f.ndjson.zst?x=1") == "zstd"
+        assert compression_of("https://example.com/facts.json") is None
+        assert strip_compression_suffix("a/dump.ndjson.GZ") == "a/dump.ndjson"
+
+    def test_accept_encoding(self, mocker):
+        """
+        The function `test_accept_encoding` tests that brotli and zstd are
+        only advertised when they can be decoded.
+        """
+        mocker.patch.object(compression, "brotli", None)
+        mocker.patch.object(compression, "zstandard", None)
+        mocker.patch.object(compression, "urllib3_decodes_zstd", False)
+
+        assert accept_encoding() == "gzip, deflate"
+
+        mocker.patch.object(compression, "brotli", mocker.Mock())
+        mocker.patch.object(compression, "zstandard", mocker.Mock())
+
+        assert accept_encoding() == "gzip, deflate, br, zstd"
+
+    @pytest.mark.parametrize(
+        "url, content_encoding, compressed",
+        [
+            ("https://example.com/dump.json.gz", None, True),
+            ("https://example.com/dump.json.gz", "gzip", False),
+            ("https://example.com/facts", "identity", False),
+        ],
+    )
+    def test_response_body(
+        self, mocker, url, content_encoding, compressed
+    ):
+        """
+        The function `test_response_body` tests that a compressed payload is
+        decompressed by its extension, unless the server declared it as the
+        content coding, which requests already decoded.
+        """
+        response = mocker.Mock()
+        response.headers = {}
+        if content_encoding is not None:
+            response.headers["Content-Encoding"] = content_encoding
+        response.content = compress(payload, "gzip") if compressed else payload
+
+        assert response_body(response, url).read() == payload
+
+    def test_response_body_zstd_content_encoding(self, mocker):
+        """
+        The function `test_response_body_zstd_content_encoding` tests that a
+        zstd content coding urllib3 cannot decode is decoded while streaming.
+        """
+        mocker.patch.object(compression, "urllib3_decodes_zstd", False)
+        response = mocker.Mock()
+        response.headers = {"Content-Encoding": "zstd"}
+        response.raw = io.BytesIO(compress(payload, "zstd"))
+
+        body = response_body(response, "https://example.com/facts", True)
+
+        assert body.read() == payload
+        assert response.raw.decode_content is False
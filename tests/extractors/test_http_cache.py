@@ -0,0 +1,64 @@
+from ...dags.etl.extractors import HTTPCache
+
+
+class TestHTTPCache:
+    """
+    The `TestHTTPCache` class contains unit tests for etl.extractors.HTTPCache,
+    storing and reading the validators of resources in a temporary directory.
+    """
+
+    def test_store_and_get(self, tmp_path, mocker):
+        """
+        The function `test_store_and_get` tests that the validators of a
+        response are stored per URL and turned into conditional headers.
+        """
+        cache = HTTPCache(str(tmp_path / "cache"))
+        response = mocker.Mock()
+        response.headers = {
+            "ETag": '"abc"',
+            "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+        cache.store("https://example.com/facts", cache.validators(response))
+
+        assert cache.get("https://example.com/facts") == {
+            "etag": '"abc"',
+            "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+        assert cache.conditional_headers("https://example.com/facts") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+        assert cache.get("https://example.com/other") is None
+        assert cache.conditional_headers("https://example.com/other") == {}
+
+    def test_response_without_validators(self, tmp_path, mocker):
+        """
+        The function `test_response_without_validators` tests that storing a
+        response without `ETag` and `Last-Modified` removes the validators
+        stored before, so they are no longer sent.
+        """
+        cache = HTTPCache(str(tmp_path))
+        response = mocker.Mock()
+        response.headers = {"ETag": '"abc"'}
+        cache.store("https://example.com/facts", cache.validators(response))
+        response.headers = {}
+
+        cache.store("https://example.com/facts", cache.validators(response))
+
+        assert cache.get("https://example.com/facts") is None
+        assert cache.conditional_headers("https://example.com/facts") == {}
+        cache.store("https://example.com/other", None)
+        assert cache.get("https://example.com/other") is None
+
+    def test_corrupt_entry(self, tmp_path):
+        """
+        The function `test_corrupt_entry` tests that an unreadable entry is
+        ignored, so the resource is fetched unconditionally.
+        """
+        cache = HTTPCache(str(tmp_path))
+        with open(cache.path("https://example.com/facts"), "w") as file:
+            file.write('{"etag": ')
+
+        assert cache.get("https://example.com/facts") is None
+        assert cache.conditional_headers("https://example.com/facts") == {}
@@ -0,0 +1,91 @@
+import gzip
+import json
+import types
+
+import pytest
+
+from ...dags.etl.exceptions import MalformedJsonError
+from ...dags.etl.extractors import JSONFileExtractor
+
+
+class TestJSONFileExtractor:
+    """
+    The `TestJSONFileExtractor` class contains unit tests for
+    etl.extractors.JSONFileExtractor, reading plain and compressed files from
+    a temporary directory.
+    """
+
+    def test_extract_compressed_files(self, tmp_path):
+        """
+        The function `test_extract_compressed_files` tests that the files
+        matching a pattern are read in name order, decompressed and parsed
+        according to their extensions.
+        """
+        with gzip.open(str(tmp_path / "2024-01-01.json.gz"), "wb") as file:
+            file.write(b'[{"fact": "Fact 1"}, {"fact": "Fact 2"}]')
+        with gzip.open(str(tmp_path / "2024-01-02.ndjson.gz"), "wb") as file:
+            file.write(b'{"fact": "Fact 3"}\n')
+        (tmp_path / "notes.txt").write_text("not a dump")
+
+        records = JSONFileExtractor(str(tmp_path / "*.*json.gz")).extract()
+
+        assert records == [
+            {"fact": "Fact 1"},
+            {"fact": "Fact 2"},
+            {"fact": "Fact 3"},
+        ]
+
+    def test_extract_decodes_arrays_with_decoder(self, mocker, tmp_path):
+        """
+        The function `test_extract_decodes_arrays_with_decoder` tests that
+        outside of stream mode a JSON array is decoded at once with the
+        configured decoder instead of being parsed incrementally.
+        """
+        path = tmp_path / "dump.json"
+        path.write_bytes(b'[{"fact": "Fact 1"}, {"fact": "Fact 2"}]')
+        decoder = mocker.Mock(side_effect=json.loads)
+
+        records = JSONFileExtractor(str(path), decoder=decoder).extract()
+
+        assert records == [{"fact": "Fact 1"}, {"fact": "Fact 2"}]
+        decoder.assert_called_once_with(path.read_bytes())
+
+    def test_extract_stream(self, tmp_path):
+        """
+        The function `test_extract_stream` tests that stream mode returns a
+        generator and raises `MalformedJsonError` on malformed input.
+        """
+        path = tmp_path / "dump.jsonl"
+        path.write_bytes(b'{"fact": "Fact 1"}\n{"fact": \n')
+
+        records = JSONFileExtractor(str(path), stream=True).extract()
+
+        assert isinstance(records, types.GeneratorType)
+        assert next(records) == {"fact": "Fact 1"}
+        with pytest.raises(MalformedJsonError):
+            next(records)
+
+    def test_extract_truncated_file(self, tmp_path):
+        """
+        The function `test_extract_truncated_file` tests that a truncated
+        compressed file raises `MalformedJsonError` naming the file, rather
+        than the codec's own exception.
+        """
+        path = tmp_path / "dump.ndjson.gz"
+        compressed = gzip.compress(b'{"fact": "Fact 1"}\n' * 1000)
+        path.write_bytes(compressed[: len(compressed) // 2])
+
+        with pytest.raises(MalformedJsonError, match="dump.ndjson.gz"):
+            JSONFileExtractor(str(path)).extract()
+
+    def test_extract_missing_file(self, tmp_path):
+        """
+        The function `test_extract_missing_file` tests that a path matching no
+        file raises `FileNotFoundError`, even in stream mode.
+        """
+        extractor = JSONFileExtractor(
+            str(tmp_path / "missing.json"), stream=True
+        )
+
+        with pytest.raises(FileNotFoundError):
+            extractor.extract()
@@ -1,3 +1,7 @@
+import io
+import json
+import types
+
 import pytest
 import requests
 
@@ -119,7 +123,8 @@ class TestJSONURLExtractor:
             }
         ]
         mock_response = mocker.Mock()
-        mock_response.json.return_value = mock_json_data
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.content = json.dumps(mock_json_data).encode()
         mocker.patch("requests.get", return_value=mock_response)
 
         from ...dags.etl.extractors import JSONURLExtractor
@@ -140,9 +145,8 @@ class TestJSONURLExtractor:
         `requests.get` function to return this mock response.
         """
         mock_response = mocker.Mock()
-        mock_response.json.side_effect = MalformedJsonError(
-            "The JSON file is malformed"
-        )
+        mock_response.headers = {"Content-Type": "text/html"}
+        mock_response.content = b"<html><body>Not found</body></html>"
         mocker.patch("requests.get", return_value=mock_response)
 
         from ...dags.etl.extractors import JSONURLExtractor
@@ -165,7 +169,8 @@ class TestJSONURLExtractor:
         """
         # Mock the response object to simulate a malformed JSON
         mock_response = mocker.Mock()
-        mock_response.json.side_effect = ValueError("Malformed JSON")
+        mock_response.headers = {}
+        mock_response.content = b'[{"fact": "A great fact about dogs!"'
         mocker.patch("requests.get", return_value=mock_response)
 
         from ...dags.etl.extractors import JSONURLExtractor
@@ -175,3 +180,188 @@ class TestJSONURLExtractor:
             MalformedJsonError, match="The JSON file is malformed"
         ):
             JSONURLExtractor("www.example.com").extract()
+
+    def test_extract_stream_json_array(self, mocker):
+        """
+        The function `test_extract_stream_json_array` tests that stream mode
+        requests a streamed response and yields the records of a JSON array
+        one by one.
+        """
+        mock_response = mocker.Mock()
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.raw = io.BytesIO(
+            b'[{"fact": "Fact 1", "created_date": "2023-10-02T02:22:00.272Z"},'
+            b' {"fact": "Fact 2", "rating": 4.5}]'
+        )
+        get_mock = mocker.patch("requests.get", return_value=mock_response)
+
+        from ...dags.etl.extractors import JSONURLExtractor
+
+        records = JSONURLExtractor("www.example.com", stream=True).extract()
+
+        assert isinstance(records, types.GeneratorType)
+        assert list(records) == [
+            {"fact": "Fact 1", "created_date": "2023-10-02T02:22:00.272Z"},
+            {"fact": "Fact 2", "rating": 4.5},
+        ]
+        assert get_mock.call_args.kwargs["stream"] is True
+        mock_response.close.assert_called_once()
+
+    def test_extract_stream_ndjson(self, mocker):
+        """
+        The function `test_extract_stream_ndjson` tests that newline-delimited
+        JSON is detected from the content type and parsed line by line,
+        skipping blank lines.
+        """
+        mock_response = mocker.Mock()
+        mock_response.headers = {"Content-Type": "application/x-ndjson"}
+        mock_response.raw = io.BytesIO(
+            b'{"fact": "Fact 1"}\n\n{"fact": "Fact 2"}\n'
+        )
+        mocker.patch("requests.get", return_value=mock_response)
+
+        from ...dags.etl.extractors import JSONURLExtractor
+
+        records = JSONURLExtractor("www.example.com", stream=True).extract()
+
+        assert list(records) == [{"fact": "Fact 1"}, {"fact": "Fact 2"}]
+
+    @pytest.mark.parametrize(
+        "ndjson, payload",
+        [
+            (False, b'[{"fact": "Fact 1"}, {"fact": '),
+            (True, b'{"fact": "Fact 1"}\n{"fact": \n'),
+        ],
+    )
+    def test_extract_stream_malformed_json(self, mocker, ndjson, payload):
+        """
+        The function `test_extract_stream_malformed_json` tests that stream
+        mode raises `MalformedJsonError` for malformed input after yielding
+        the records parsed so far.
+        """
+        mock_response = mocker.Mock()
+        mock_response.headers = {}
+        mock_response.raw = io.BytesIO(payload)
+        mocker.patch("requests.get", return_value=mock_response)
+
+        from ...dags.etl.extractors import JSONURLExtractor
+
+        records = JSONURLExtractor(
+            "www.example.com", stream=True, ndjson=ndjson
+        ).extract()
+
+        assert next(records) == {"fact": "Fact 1"}
+        with pytest.raises(
+            MalformedJsonError, match="The JSON file is malformed"
+        ):
+            next(records)
+        mock_response.close.assert_called_once()
+
+    def test_extract_not_modified(self, mocker, tmp_path):
+        """
+        The function `test_extract_not_modified` tests that the stored
+        validators are sent and that a `304` response yields `NoNewData`
+        without storing anything.
+        """
+        from ...dags.etl.extractors import (
+            HTTPCache,
+            JSONURLExtractor,
+            NoNewData,
+        )
+
+        cache = HTTPCache(str(tmp_path))
+        cache.store("www.example.com", {"etag": '"v1"', "last_modified": None})
+        mock_response = mocker.Mock()
+        mock_response.status_code = 304
+        get_mock = mocker.patch("requests.get", return_value=mock_response)
+
+        for stream in (False, True):
+            extractor = JSONURLExtractor(
+                "www.example.com", stream=stream, cache=cache
+            )
+            records = extractor.extract()
+            extractor.commit()
+
+            assert isinstance(records, NoNewData)
+            assert records == []
+            headers = get_mock.call_args.kwargs["headers"]
+            assert headers["If-None-Match"] == '"v1"'
+            assert "If-Modified-Since" not in headers
+        assert cache.get("www.example.com")["etag"] == '"v1"'
+
+    def test_extract_commits_validators(self, mocker, tmp_path):
+        """
+        The function `test_extract_commits_validators` tests that the
+        validators of a changed resource are only stored on `commit`.
+        """
+        from ...dags.etl.extractors import HTTPCache, JSONURLExtractor
+
+        cache = HTTPCache(str(tmp_path))
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_response.content = b'[{"fact": "Fact 1"}]'
+        get_mock = mocker.patch("requests.get", return_value=mock_response)
+
+        extractor = JSONURLExtractor("www.example.com", cache=cache)
+
+        assert extractor.extract() == [{"fact": "Fact 1"}]
+        assert "If-None-Match" not in get_mock.call_args.kwargs["headers"]
+        assert cache.get("www.example.com") is None
+        extractor.commit()
+        assert cache.get("www.example.com") == {
+            "etag": '"v2"',
+            "last_modified": None,
+        }
+
+    def test_extract_commit_clears_stale_validators(self, mocker, tmp_path):
+        """
+        The function `test_extract_commit_clears_stale_validators` tests that
+        committing a changed resource served without validators removes the
+        validators stored before, so the next request is unconditional.
+        """
+        from ...dags.etl.extractors import HTTPCache, JSONURLExtractor
+
+        cache = HTTPCache(str(tmp_path))
+        cache.store("www.example.com", {"etag": '"v1"', "last_modified": None})
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = b'[{"fact": "Fact 1"}]'
+        get_mock = mocker.patch("requests.get", return_value=mock_response)
+
+        extractor = JSONURLExtractor("www.example.com", cache=cache)
+        extractor.extract()
+        extractor.commit()
+        extractor.extract()
+
+        assert cache.get("www.example.com") is None
+        assert "If-None-Match" not in get_mock.call_args.kwargs["headers"]
+
+    def test_extract_compressed_payload(self, mocker):
+        """
+        The function `test_extract_compressed_payload` tests that a gzip dump
+        served without a content coding is decompressed in both modes, and
+        that the decodable content codings are requested.
+        """
+        import gzip
+
+        from ...dags.etl.extractors import JSONURLExtractor
+
+        payload = gzip.compress(b'{"fact": "Fact 1"}\n{"fact": "Fact 2"}\n')
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/gzip"}
+        mock_response.content = payload
+        get_mock = mocker.patch("requests.get", return_value=mock_response)
+
+        records = JSONURLExtractor("www.example.com/dump.ndjson.gz").extract()
+        mock_response.raw = io.BytesIO(payload)
+        streamed = JSONURLExtractor(
+            "www.example.com/dump.ndjson.gz", stream=True
+        ).extract()
+
+        assert records == [{"fact": "Fact 1"}, {"fact": "Fact 2"}]
+        assert list(streamed) == records
+        headers = get_mock.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"].startswith("gzip, deflate")
@@ -0,0 +1,217 @@
+import threading
+import time
+import types
+
+import pytest
+import requests
+
+from ...dags.etl.exceptions import MalformedJsonError
+from ...dags.etl.extractors import MultiSourceJSONExtractor, page_urls
+
+
+def make_response(mocker, content, content_type="application/json"):
+    response = mocker.Mock()
+    response.content = content
+    response.headers = {"Content-Type": content_type}
+    return response
+
+
+class TestMultiSourceJSONExtractor:
+    """
+    The `TestMultiSourceJSONExtractor` class contains unit tests for
+    etl.extractors.MultiSourceJSONExtractor, mocking the shared session to
+    test concurrent fetching, per-host limits, retries and parse errors.
+    """
+
+    def test_extract_yields_records_of_all_sources(self, mocker):
+        """
+        The function `test_extract_yields_records_of_all_sources` tests that
+        the records of every source are yielded through the shared session.
+        """
+        payloads = {
+            "https://a.example.com/facts": b'[{"fact": "Fact 1"}]',
+            "https://b.example.com/facts.ndjson": (
+                b'{"fact": "Fact 2"}\n{"fact": "Fact 3"}\n'
+            ),
+        }
+        session = mocker.Mock()
+        session.get.side_effect = lambda url, **kwargs: make_response(
+            mocker, payloads[url], "text/plain"
+        )
+
+        records = MultiSourceJSONExtractor(
+            list(payloads), session=session
+        ).extract()
+
+        assert isinstance(records, types.GeneratorType)
+        assert sorted(record["fact"] for record in records) == [
+            "Fact 1",
+            "Fact 2",
+            "Fact 3",
+        ]
+        assert session.get.call_count == 2
+
+    def test_extract_fetches_concurrently(self, mocker):
+        """
+        The function `test_extract_fetches_concurrently` tests that sources on
+        different hosts are in flight at the same time.
+        """
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get(url, **kwargs):
+            # fails with BrokenBarrierError unless all three run at once
+            barrier.wait()
+            return make_response(mocker, b"[]")
+
+        session = mocker.Mock()
+        session.get.side_effect = get
+        urls = [f"https://{host}.example.com/facts" for host in "abc"]
+
+        records = MultiSourceJSONExtractor(urls, session=session).extract()
+
+        assert list(records) == []
+
+    def test_extract_limits_requests_per_host(self, mocker):
+        """
+        The function `test_extract_limits_requests_per_host` tests that no more
+        than `per_host_limit` requests to a host are in flight at once.
+        """
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+
+        def get(url, **kwargs):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["current"] -= 1
+            return make_response(mocker, b'[{"fact": "Fact"}]')
+
+        session = mocker.Mock()
+        session.get.side_effect = get
+        urls = page_urls("https://example.com/facts", 8)
+
+        records = MultiSourceJSONExtractor(
+            urls, max_workers=8, per_host_limit=2, session=session
+        ).extract()
+
+        assert len(list(records)) == 8
+        assert in_flight["max"] == 2
+
+    def test_extract_slow_host_does_not_block_other_hosts(self, mocker):
+        """
+        The function `test_extract_slow_host_does_not_block_other_hosts` tests
+        that URLs waiting for a busy host do not take up the workers, so the
+        other hosts are fetched meanwhile.
+        """
+        other_host_fetched = threading.Event()
+
+        def get(url, **kwargs):
+            if url.startswith("https://slow.example.com"):
+                # the slow host only answers once the other host was fetched
+                assert other_host_fetched.wait(timeout=5)
+            else:
+                other_host_fetched.set()
+            return make_response(mocker, b'[{"fact": "Fact"}]')
+
+        session = mocker.Mock()
+        session.get.side_effect = get
+        urls = page_urls("https://slow.example.com/facts", 3) + [
+            "https://fast.example.com/facts"
+        ]
+
+        records = MultiSourceJSONExtractor(
+            urls, max_workers=2, per_host_limit=1, session=session
+        ).extract()
+
+        assert len(list(records)) == 4
+        assert other_host_fetched.is_set()
+
+    def test_extract_closes_own_session(self, mocker):
+        """
+        The function `test_extract_closes_own_session` tests that the session
+        the extractor created is closed once the records are extracted, even
+        on failure, while a session passed in is left open.
+        """
+        session = mocker.Mock()
+        session.get.return_value = make_response(mocker, b'[{"fact": ')
+        create_session = mocker.patch.object(
+            MultiSourceJSONExtractor, "create_session", return_value=session
+        )
+
+        with pytest.raises(MalformedJsonError):
+            list(MultiSourceJSONExtractor(["https://example.com/a"]).extract())
+
+        create_session.assert_called_once()
+        session.close.assert_called_once()
+
+        shared_session = mocker.Mock()
+        shared_session.get.return_value = make_response(mocker, b"[]")
+        records = MultiSourceJSONExtractor(
+            ["https://example.com/a"], session=shared_session
+        ).extract()
+
+        assert list(records) == []
+        shared_session.close.assert_not_called()
+
+    def test_fetch_page_retries_with_backoff(self, mocker):
+        """
+        The function `test_fetch_page_retries_with_backoff` tests that a
+        connection error is retried with the backoff of `get_with_backoff`.
+        """
+        sleep_mock = mocker.patch("time.sleep")
+        session = mocker.Mock()
+        session.get.side_effect = [
+            requests.exceptions.ConnectionError("Network is down"),
+            make_response(mocker, b'[{"fact": "Fact 1"}]'),
+        ]
+
+        records = MultiSourceJSONExtractor(
+            ["https://example.com/facts"], session=session
+        ).fetch_page("https://example.com/facts")
+
+        assert records == [{"fact": "Fact 1"}]
+        sleep_mock.assert_called_once_with(1)
+
+    def test_extract_raises_on_failed_source(self, mocker):
+        """
+        The function `test_extract_raises_on_failed_source` tests that an
+        error fetching or parsing any source is raised from the generator.
+        """
+        session = mocker.Mock()
+        session.get.return_value = make_response(mocker, b'[{"fact": ')
+
+        records = MultiSourceJSONExtractor(
+            ["https://example.com/facts"], session=session
+        ).extract()
+
+        with pytest.raises(MalformedJsonError):
+            list(records)
+
+    @pytest.mark.parametrize(
+        "limits", [{"max_workers": 0}, {"per_host_limit": 0}]
+    )
+    def test_init_rejects_limits_below_one(self, mocker, limits):
+        """
+        The function `test_init_rejects_limits_below_one` tests that a pool
+        without workers or hosts without slots are rejected up front, as no
+        URL could ever be fetched.
+        """
+        with pytest.raises(ValueError):
+            MultiSourceJSONExtractor(
+                ["https://example.com/facts"], session=mocker.Mock(), **limits
+            )
+
+    def test_page_urls(self):
+        """
+        The function `test_page_urls` tests that the page parameter is added
+        to, or replaced in, the query string.
+        """
+        assert page_urls("https://example.com/facts?page=9&size=10", 2) == [
+            "https://example.com/facts?size=10&page=1",
+            "https://example.com/facts?size=10&page=2",
+        ]
+        assert page_urls("https://example.com/facts", 1, "p", start=0) == [
+            "https://example.com/facts?p=0",
+        ]
@@ -28,3 +28,115 @@ class TestFactsLoader:
         # Call the function with test data
         FactsLoader(data_repository).load(test_data, [])
         data_repository.save_facts_batch.assert_called_once()
+
+    def test_load_expires_facts(self, mocker, caplog):
+        """
+        Test that the loader expires the given facts and does not warn when
+        the affected row count matches the expected count.
+        """
+        data_repository = mocker.Mock()
+        data_repository.mark_as_expired.return_value = 2
+        from ...dags.etl.loaders import FactsLoader
+
+        FactsLoader(data_repository).load([], [11, 12, 11])
+
+        data_repository.mark_as_expired.assert_called_once_with([11, 12, 11])
+        assert "Expected to expire" not in caplog.text
+
+    def test_load_expired_count_mismatch(self, mocker, caplog):
+        """
+        Test that the loader warns when fewer facts were expired than
+        expected.
+        """
+        data_repository = mocker.Mock()
+        data_repository.mark_as_expired.return_value = 1
+        from ...dags.etl.loaders import FactsLoader
+
+        FactsLoader(data_repository).load([], [11, 12])
+
+        assert "Expected to expire 2 fact(s), but 1 were updated" in (
+            caplog.text
+        )
+        data_repository.save_facts_batch.assert_called_once_with([])
+
+    def test_load_chunk(self, mocker):
+        """
+        Test that load_chunk loads the chunk with a checkpoint of its last
+        fact and keeps counting the loaded records across chunks.
+        """
+        data_repository = mocker.Mock()
+        data_repository.load_facts_chunk.return_value = 0
+        from ...dags.etl.loaders import FactsLoader
+
+        loader = FactsLoader(data_repository, records_loaded=10)
+        first = loader.load_chunk(
+            [
+                {"created_date": "2024-01-01", "fact_hash": "hash1"},
+                {"created_date": "2024-01-02", "fact_hash": "hash2"},
+            ],
+            [],
+            "run_etl",
+        )
+        second = loader.load_chunk(
+            [{"created_date": "2024-01-03", "fact_hash": "hash3"}],
+            [],
+            "run_etl",
+        )
+
+        assert first == {
+            "last_created_date": "2024-01-02",
+            "last_fact_hash": "hash2",
+            "records_loaded": 12,
+        }
+        assert second["records_loaded"] == 13
+        assert data_repository.load_facts_chunk.call_args[0][2:] == (
+            "run_etl",
+            second,
+        )
+
+    def test_load_no_new_data(self, mocker):
+        """
+        Test that the loader leaves the repository untouched when the
+        extractor found no new data.
+        """
+        data_repository = mocker.Mock()
+        from ...dags.etl.extractors import NoNewData
+        from ...dags.etl.loaders import FactsLoader
+
+        FactsLoader(data_repository).load(NoNewData(), [])
+
+        assert data_repository.method_calls == []
+
+    def test_load_with_watermark(self, mocker):
+        """
+        Test that load_with_watermark loads the facts together with a
+        watermark at the newest created date, and leaves the watermark alone
+        when there is nothing to load.
+        """
+        data_repository = mocker.Mock()
+        data_repository.load_facts_chunk.return_value = 1
+        data_repository.mark_as_expired.return_value = 0
+        from ...dags.etl.loaders import FactsLoader
+
+        loader = FactsLoader(data_repository)
+        watermark = loader.load_with_watermark(
+            [
+                {"created_date": "2024-01-03", "fact_hash": "hash3"},
+                {"created_date": "2024-01-02", "fact_hash": "hash2"},
+            ],
+            [11],
+        )
+
+        assert watermark == {
+            "last_created_date": "2024-01-03",
+            "last_fact_hash": "hash3",
+            "records_loaded": 2,
+        }
+        assert data_repository.load_facts_chunk.call_args[0][1:] == (
+            [11],
+            "watermark",
+            watermark,
+        )
+        assert loader.load_with_watermark([], []) is None
+        data_repository.load_facts_chunk.assert_called_once()
+        data_repository.save_facts_batch.assert_called_once_with([])
@@ -0,0 +1,215 @@
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def in_memory_repository():
+    from ...dags.etl.repositories import InMemoryRepository
+
+    return InMemoryRepository()
+
+
+def make_fact(fact_hash, fact, bucket_hashes, **kwargs):
+    return {
+        "fact_hash": fact_hash,
+        "fact": fact,
+        "parsed_date": datetime(2024, 8, 14),
+        "is_numeric": False,
+        "bucket_hashes": bucket_hashes,
+        **kwargs,
+    }
+
+
+class TestInMemoryRepository:
+    """
+    This class contains the testing logic for the InMemoryRepository.
+    """
+
+    def test_implements_base_repository(self, in_memory_repository):
+        """
+        Test that the repository implements the whole BaseRepository.
+        """
+        from ...dags.etl.repositories.base_repository import BaseRepository
+
+        assert isinstance(in_memory_repository, BaseRepository)
+
+    def test_save_facts_batch(self, in_memory_repository):
+        """
+        Test that saved facts are found by hash and numbered like in
+        PostgresRepository, including versions within the batch.
+        """
+        in_memory_repository.save_facts_batch(
+            [
+                make_fact("hash1", "Fact 1", [1, 2]),
+                make_fact("hash2", "Fact 2", [3, 4], is_current=False),
+                make_fact(
+                    "hash3", "Fact 2!", [3, 5], previous_fact_hash="hash2"
+                ),
+                make_fact("hash4", "Fact 4", [6, 7], fact_number=10),
+            ]
+        )
+
+        assert in_memory_repository.fact_exists("hash1") is True
+        assert in_memory_repository.fact_exists("hash5") is False
+        assert in_memory_repository.existing_hashes(
+            ["hash1", "hash3", "hash5"]
+        ) == {"hash1", "hash3"}
+        assert [
+            fact["fact_number"]
+            for fact in in_memory_repository.facts.values()
+        ] == [1, 2, 2, 10]
+        assert in_memory_repository.get_last_fact_number() == 10
+
+    def test_save_facts_batch_duplicate_hash(self, in_memory_repository):
+        """
+        Test that a batch reusing a stored fact hash is rejected as a whole.
+        """
+        in_memory_repository.save_facts_batch(
+            [make_fact("hash1", "Fact 1", [1, 2])]
+        )
+
+        with pytest.raises(ValueError):
+            in_memory_repository.save_facts_batch(
+                [
+                    make_fact("hash2", "Fact 2", [3, 4]),
+                    make_fact("hash1", "Fact 1", [1, 2]),
+                ]
+            )
+
+        assert in_memory_repository.fact_exists("hash2") is False
+
+    def test_find_similar_facts(self, in_memory_repository):
+        """
+        Test that only current facts sharing a bucket hash of the same band
+        are returned.
+        """
+        in_memory_repository.save_facts_batch(
+            [
+                make_fact("hash1", "Fact 1", [1, 2]),
+                make_fact("hash2", "Fact 2", [2, 1]),
+                make_fact("hash3", "Fact 3", [1, 9]),
+            ]
+        )
+        in_memory_repository.mark_as_expired([3])
+
+        assert in_memory_repository.find_similar_facts_by_buckets([1, 5]) == [
+            (1, 1, "Fact 1")
+        ]
+        assert in_memory_repository.find_similar_facts_for_batch(
+            [[5, 1], [8, 8]]
+        ) == [[(2, 2, "Fact 2")], []]
+
+    def test_mark_as_expired(self, in_memory_repository):
+        """
+        Test that mark_as_expired counts the facts found only once.
+        """
+        in_memory_repository.save_facts_batch(
+            [make_fact("hash1", "Fact 1", [1, 2])]
+        )
+
+        assert in_memory_repository.mark_as_expired([1, 1, 99]) == 1
+        assert in_memory_repository.get_current_facts() == []
+
+    def test_get_current_facts_and_replace_buckets(
+        self, in_memory_repository
+    ):
+        """
+        Test paging through current facts and replacing their buckets.
+        """
+        in_memory_repository.save_facts_batch(
+            [
+                make_fact("hash1", "Fact 1", [1, 2]),
+                make_fact("hash2", "Fact 2", [3, 4]),
+                make_fact("hash3", "Fact 3", [5, 6]),
+            ]
+        )
+
+        assert in_memory_repository.get_current_facts(limit=2) == [
+            (1, "Fact 1"),
+            (2, "Fact 2"),
+        ]
+        assert in_memory_repository.get_current_facts(after_id=2) == [
+            (3, "Fact 3")
+        ]
+
+        in_memory_repository.replace_lsh_buckets({1: [7, 8]})
+
+        assert in_memory_repository.find_similar_facts_by_buckets([1]) == []
+        assert in_memory_repository.find_similar_facts_by_buckets([7]) == [
+            (1, 1, "Fact 1")
+        ]
+
+    def test_load_facts_chunk_and_checkpoint(self, in_memory_repository):
+        """
+        Test that a chunk is expired, inserted and checkpointed, and that the
+        checkpoint can be read back and cleared.
+        """
+        in_memory_repository.save_facts_batch(
+            [make_fact("hash1", "Fact 1", [1, 2])]
+        )
+        checkpoint = {
+            "last_created_date": "2024-08-14T00:00:00.000Z",
+            "last_fact_hash": "hash2",
+            "records_loaded": 2,
+        }
+
+        expired = in_memory_repository.load_facts_chunk(
+            [make_fact("hash2", "Fact 1!", [1, 3], fact_number=1)],
+            [1],
+            "run_etl",
+            checkpoint,
+        )
+
+        assert expired == 1
+        assert in_memory_repository.get_current_facts() == [(2, "Fact 1!")]
+        assert in_memory_repository.get_checkpoint("run_etl") == checkpoint
+
+        in_memory_repository.clear_checkpoint("run_etl")
+
+        assert in_memory_repository.get_checkpoint("run_etl") is None
+
+    def test_pipeline(self, in_memory_repository):
+        """
+        Test the transformer and loader end to end on the repository: a
+        reworded fact loaded in a later run expires its earlier version.
+        """
+        from ...dags.etl.loaders import FactsLoader
+        from ...dags.etl.transformers import (
+            FactTransformer,
+            FactVersionManager,
+        )
+
+        transformer = FactTransformer(
+            data_repository=in_memory_repository,
+            version_manager=FactVersionManager(
+                in_memory_repository, tokenizer="words"
+            ),
+        )
+        loader = FactsLoader(data_repository=in_memory_repository)
+
+        first_run = [
+            {
+                "fact": "Dogs can smell fear",
+                "created_date": "2024-01-01T00:00:00.000Z",
+            },
+            {
+                "fact": "Dogs have 42 teeth",
+                "created_date": "2024-01-02T00:00:00.000Z",
+            },
+        ]
+        second_run = first_run + [
+            {
+                "fact": "Dogs can smell fear.",
+                "created_date": "2024-01-03T00:00:00.000Z",
+            },
+        ]
+        loader.load(*transformer.transform(first_run))
+        loader.load(*transformer.transform(second_run))
+
+        assert in_memory_repository.get_current_facts() == [
+            (2, "Dogs have 42 teeth"),
+            (3, "Dogs can smell fear."),
+        ]
+        assert in_memory_repository.facts[3]["fact_number"] == 1
+        assert in_memory_repository.facts[2]["is_numeric"] is True
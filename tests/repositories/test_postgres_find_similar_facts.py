@@ -40,9 +40,10 @@ class TestFindSimilarFacts:
         Test case with multiple bucket hashes
         """
         mock_cursor = db_connect_mock["mock_cursor"]
-        mock_cursor.fetchall.side_effect = [
-            [(1, 101, "Fact 1")],
-            [(2, 102, "Fact 2"), (3, 103, "Fact 3")],
+        mock_cursor.fetchall.return_value = [
+            (1, 101, "Fact 1"),
+            (2, 102, "Fact 2"),
+            (3, 103, "Fact 3"),
         ]
 
         result = postgres_repository.find_similar_facts_by_buckets(
@@ -58,6 +59,13 @@ class TestFindSimilarFacts:
             expected_result
         )  # Should return facts associated with both bucket hashes
 
+        # All bucket hashes should be resolved with a single query
+        mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == (
+            [0, 1],
+            ["hash1", "hash2"],
+        )  # Each bucket hash is matched within its own band
+
     def test_find_similar_facts_duplicate_entries(
         self, db_connect_mock, postgres_repository
     ):
@@ -65,9 +73,10 @@ class TestFindSimilarFacts:
         Test case with duplicate entries across bucket hashes
         """
         mock_cursor = db_connect_mock["mock_cursor"]
-        mock_cursor.fetchall.side_effect = [
-            [(1, 101, "Fact 1")],
-            [(1, 101, "Fact 1"), (2, 102, "Fact 2")],
+        mock_cursor.fetchall.return_value = [
+            (1, 101, "Fact 1"),
+            (1, 101, "Fact 1"),
+            (2, 102, "Fact 2"),
         ]
 
         result = postgres_repository.find_similar_facts_by_buckets(
@@ -103,3 +112,46 @@ class TestFindSimilarFacts:
         db_connect_mock[
             "connection_pool_mock"
         ].return_value.putconn.assert_not_called()
+
+    def test_find_similar_facts_for_batch(
+        self, db_connect_mock, postgres_repository
+    ):
+        """
+        Test case where the candidates of a whole batch are fetched with one
+        query and grouped by input fact
+        """
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.fetchall.return_value = [
+            (0, 1, 101, "Fact 1"),
+            (2, 1, 101, "Fact 1"),
+            (2, 2, 102, "Fact 2"),
+        ]
+
+        result = postgres_repository.find_similar_facts_for_batch(
+            [[11, 12], [13], [14, 15]]
+        )
+
+        assert result == [
+            [(1, 101, "Fact 1")],
+            [],
+            [(1, 101, "Fact 1"), (2, 102, "Fact 2")],
+        ]
+        mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == (
+            [0, 0, 1, 2, 2],
+            [0, 1, 0, 0, 1],
+            [11, 12, 13, 14, 15],
+        )
+
+    def test_find_similar_facts_for_batch_empty(
+        self, db_connect_mock, postgres_repository
+    ):
+        """
+        Test case where the batch holds no bucket hashes
+        """
+        result = postgres_repository.find_similar_facts_for_batch([[], []])
+
+        assert result == [[], []]
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.getconn.assert_not_called()
@@ -76,7 +76,9 @@ class TestPostgresRepository:
             "connection_pool_mock"
         ].return_value.putconn.assert_not_called()
 
-    def test_save_facts_batch(self, db_connect_mock, postgres_repository):
+    def test_save_facts_batch(
+        self, mocker, db_connect_mock, postgres_repository
+    ):
         """
         The `test_save_facts_batch` function tests the batch saving of facts to
         a PostgreSQL  repository using mocked objects.
@@ -87,8 +89,12 @@ class TestPostgresRepository:
         mock instance of PostgresRepository class.
         """
         mock_cursor = db_connect_mock["mock_cursor"]
+        execute_values_mock = mocker.patch(
+            "psycopg2.extras.execute_values",
+            return_value=[(1, "hash1"), (2, "hash2")],
+        )
 
-        mock_cursor.fetchone.return_value = [1]
+        mock_cursor.fetchall.return_value = [(3,), (2,)]
         created_date_1 = "2024-08-14T12:34:56.789Z"
         created_date_2 = "2024-08-15T12:34:56.789Z"
         facts = [
@@ -114,10 +120,113 @@ class TestPostgresRepository:
 
         postgres_repository.save_facts_batch(facts)
 
-        # need to check +1 for since get_last_fact_number, calls it
-        assert mock_cursor.execute.call_count == len(facts) + 1
+        # fact numbers are reserved with a single sequence query
+        mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == (2,)
+        # all facts are inserted with a single bulk statement
+        execute_values_mock.assert_called_once()
+        rows = execute_values_mock.call_args[0][2]
+        assert [row[:3] for row in rows] == [
+            (2, "hash1", "Fact 1"),
+            (3, "hash2", "Fact 2"),
+        ]
+        # no buckets were given, so nothing is copied
+        mock_cursor.copy_from.assert_not_called()
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+
+    def test_save_facts_batch_copies_buckets(
+        self, mocker, db_connect_mock, postgres_repository
+    ):
+        """
+        Test that the LSH buckets of all facts are mapped to the returned ids
+        and loaded with a single COPY in the same transaction.
+        """
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mocker.patch(
+            "psycopg2.extras.execute_values",
+            return_value=[(20, "hash2"), (10, "hash1")],
+        )
+        mock_cursor.fetchall.return_value = [(1,)]
+
+        copied = []
+        mock_cursor.copy_from.side_effect = (
+            lambda buffer, *args, **kwargs: copied.append(buffer.read())
+        )
+
+        facts = [
+            {
+                "fact_hash": "hash1",
+                "fact": "Fact 1",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 14),
+                "bucket_hashes": [111, 112],
+            },
+            {
+                "fact_hash": "hash2",
+                "fact": "Fact 2",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 15),
+                "bucket_hashes": [221],
+                "fact_number": 7,
+            },
+        ]
+
+        postgres_repository.save_facts_batch(facts)
+
+        mock_cursor.copy_from.assert_called_once()
+        assert copied == ["10\t0\t111\n10\t1\t112\n20\t0\t221\n"]
         db_connect_mock["mock_conn"].commit.assert_called_once()
 
+    def test_save_facts_batch_versions_within_batch(
+        self, mocker, db_connect_mock, postgres_repository
+    ):
+        """
+        Test that facts referencing an earlier fact of the batch reuse its
+        fact number, so only the first fact draws a new number, and that
+        superseded facts are inserted as not current.
+        """
+        mock_cursor = db_connect_mock["mock_cursor"]
+        execute_values_mock = mocker.patch(
+            "psycopg2.extras.execute_values",
+            return_value=[(1, "hash1"), (2, "hash2"), (3, "hash3")],
+        )
+        mock_cursor.fetchall.return_value = [(5,)]
+
+        facts = [
+            {
+                "fact_hash": "hash1",
+                "fact": "Fact 1",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 14),
+                "is_current": False,
+            },
+            {
+                "fact_hash": "hash2",
+                "fact": "Fact 1.",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 15),
+                "previous_fact_hash": "hash1",
+                "is_current": False,
+            },
+            {
+                "fact_hash": "hash3",
+                "fact": "Fact 1!",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 16),
+                "previous_fact_hash": "hash2",
+            },
+        ]
+
+        postgres_repository.save_facts_batch(facts)
+
+        assert mock_cursor.execute.call_args[0][1] == (1,)
+        rows = execute_values_mock.call_args[0][2]
+        assert [(row[0], row[5]) for row in rows] == [
+            (5, False),
+            (5, False),
+            (5, True),
+        ]
+
     def test_save_facts_batch_empty(
         self, db_connect_mock, postgres_repository
     ):
@@ -201,3 +310,269 @@ class TestPostgresRepository:
         db_connect_mock["mock_cursor"].fetchone.return_value = [None]
         last_number = postgres_repository.get_last_fact_number()
         assert last_number is None
+
+    def test_existing_hashes(self, db_connect_mock, postgres_repository):
+        """Test existing_hashes resolves the whole batch with one query."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.fetchall.return_value = [("hash1",), ("hash3",)]
+
+        result = postgres_repository.existing_hashes(
+            ["hash1", "hash2", "hash3"]
+        )
+
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT fact_hash FROM facts WHERE fact_hash = ANY(%s)",
+            (["hash1", "hash2", "hash3"],),
+        )
+        assert result == {"hash1", "hash3"}
+
+    def test_existing_hashes_empty(self, db_connect_mock, postgres_repository):
+        """Test existing_hashes skips the database for an empty batch."""
+        result = postgres_repository.existing_hashes([])
+
+        assert result == set()
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.getconn.assert_not_called()
+
+    def test_existing_hashes_db_error(
+        self, db_connect_mock, postgres_repository
+    ):
+        """Test that a database error is raised from existing_hashes."""
+        db_connect_mock["mock_cursor"].execute.side_effect = OperationalError(
+            "DB Error"
+        )
+        with pytest.raises(OperationalError):
+            postgres_repository.existing_hashes(["hash1"])
+
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.putconn.assert_called_once()
+
+    def test_mark_as_expired(self, db_connect_mock, postgres_repository):
+        """Test mark_as_expired expires all ids with one UPDATE statement."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.rowcount = 3
+
+        result = postgres_repository.mark_as_expired([1, 2, 3])
+
+        mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == ([1, 2, 3],)
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+        assert result == 3
+
+    def test_mark_as_expired_chunked(
+        self, db_connect_mock, postgres_repository
+    ):
+        """Test mark_as_expired splits large id lists into chunks."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.rowcount = 2
+        postgres_repository.expire_chunk_size = 2
+
+        result = postgres_repository.mark_as_expired([1, 2, 3, 4])
+
+        assert mock_cursor.execute.call_count == 2
+        assert [
+            call[0][1] for call in mock_cursor.execute.call_args_list
+        ] == [([1, 2],), ([3, 4],)]
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+        assert result == 4
+
+    def test_mark_as_expired_empty(
+        self, db_connect_mock, postgres_repository
+    ):
+        """Test mark_as_expired skips the database for an empty list."""
+        result = postgres_repository.mark_as_expired([])
+
+        assert result == 0
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.getconn.assert_not_called()
+
+    def test_reserve_fact_numbers(self, db_connect_mock, postgres_repository):
+        """Test reserve_fact_numbers draws a block from the sequence."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.fetchall.return_value = [(12,), (10,), (11,)]
+
+        result = postgres_repository.reserve_fact_numbers(3)
+
+        mock_cursor.execute.assert_called_once()
+        query, params = mock_cursor.execute.call_args[0]
+        assert "nextval('facts_fact_number_seq')" in query
+        assert "generate_series(1, %s)" in query
+        assert params == (3,)
+        assert result == [10, 11, 12]
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.putconn.assert_called_once()
+
+    def test_reserve_fact_numbers_zero(
+        self, db_connect_mock, postgres_repository
+    ):
+        """Test reserve_fact_numbers skips the database for zero numbers."""
+        assert postgres_repository.reserve_fact_numbers(0) == []
+        db_connect_mock[
+            "connection_pool_mock"
+        ].return_value.getconn.assert_not_called()
+
+    def test_get_current_facts(self, db_connect_mock, postgres_repository):
+        """Test get_current_facts pages through current facts by id."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.fetchall.return_value = [(3, "Fact 3"), (5, "Fact 5")]
+
+        result = postgres_repository.get_current_facts(after_id=2, limit=2)
+
+        assert result == [(3, "Fact 3"), (5, "Fact 5")]
+        assert mock_cursor.execute.call_args[0][1] == (2, 2)
+
+    def test_replace_lsh_buckets(self, db_connect_mock, postgres_repository):
+        """
+        Test replace_lsh_buckets deletes the old buckets and copies the new
+        ones in a single transaction.
+        """
+        mock_cursor = db_connect_mock["mock_cursor"]
+        copied = []
+        mock_cursor.copy_from.side_effect = (
+            lambda buffer, *args, **kwargs: copied.append(buffer.read())
+        )
+
+        postgres_repository.replace_lsh_buckets({1: [11, 12], 2: [21]})
+
+        mock_cursor.execute.assert_called_once_with(
+            "DELETE FROM lsh_buckets WHERE fact_id = ANY(%s)", ([1, 2],)
+        )
+        assert copied == ["1\t0\t11\n1\t1\t12\n2\t0\t21\n"]
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+
+    def test_load_facts_chunk(
+        self, mocker, db_connect_mock, postgres_repository
+    ):
+        """
+        Test load_facts_chunk expires, inserts and stores the checkpoint with
+        a single commit.
+        """
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchall.return_value = [(1,)]
+        execute_values_mock = mocker.patch(
+            "psycopg2.extras.execute_values", return_value=[(10, "hash1")]
+        )
+        facts = [
+            {
+                "fact_hash": "hash1",
+                "fact": "Fact 1",
+                "created_date": "2024-08-14T12:34:56.789Z",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 14),
+            },
+        ]
+        checkpoint = {
+            "last_created_date": "2024-08-14T12:34:56.789Z",
+            "last_fact_hash": "hash1",
+            "records_loaded": 5,
+        }
+
+        result = postgres_repository.load_facts_chunk(
+            facts, [3], "run_etl", checkpoint
+        )
+
+        assert result == 1
+        execute_values_mock.assert_called_once()
+        queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert "UPDATE facts" in queries[0]
+        assert "INSERT INTO etl_state" in queries[-1]
+        assert mock_cursor.execute.call_args_list[-1][0][1] == (
+            "run_etl",
+            "2024-08-14T12:34:56.789Z",
+            "hash1",
+            5,
+        )
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+
+    def test_load_facts_chunk_rollback(
+        self, mocker, db_connect_mock, postgres_repository
+    ):
+        """
+        Test load_facts_chunk rolls the whole chunk back when a statement
+        fails, without committing.
+        """
+        mocker.patch(
+            "psycopg2.extras.execute_values",
+            side_effect=OperationalError("DB Error"),
+        )
+        db_connect_mock["mock_cursor"].fetchall.return_value = [(1,)]
+        facts = [
+            {
+                "fact_hash": "hash1",
+                "fact": "Fact 1",
+                "is_numeric": False,
+                "parsed_date": datetime(2024, 8, 14),
+            },
+        ]
+
+        with pytest.raises(OperationalError):
+            postgres_repository.load_facts_chunk(
+                facts,
+                [3],
+                "run_etl",
+                {
+                    "last_created_date": "2024-08-14",
+                    "last_fact_hash": "hash1",
+                    "records_loaded": 1,
+                },
+            )
+
+        db_connect_mock["mock_conn"].rollback.assert_called_once()
+        db_connect_mock["mock_conn"].commit.assert_not_called()
+
+    def test_get_checkpoint(self, db_connect_mock, postgres_repository):
+        """Test get_checkpoint returns the stored checkpoint."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+        mock_cursor.fetchone.return_value = ("2024-08-14", "hash1", 5)
+
+        result = postgres_repository.get_checkpoint("run_etl")
+
+        assert result == {
+            "last_created_date": "2024-08-14",
+            "last_fact_hash": "hash1",
+            "records_loaded": 5,
+        }
+        assert mock_cursor.execute.call_args[0][1] == ("run_etl",)
+
+    def test_get_checkpoint_missing(
+        self, db_connect_mock, postgres_repository
+    ):
+        """Test get_checkpoint returns None when nothing is stored."""
+        db_connect_mock["mock_cursor"].fetchone.return_value = None
+
+        assert postgres_repository.get_checkpoint("run_etl") is None
+
+    def test_clear_checkpoint(self, db_connect_mock, postgres_repository):
+        """Test clear_checkpoint deletes the checkpoint and commits."""
+        mock_cursor = db_connect_mock["mock_cursor"]
+
+        postgres_repository.clear_checkpoint("run_etl")
+
+        mock_cursor.execute.assert_called_once_with(
+            "DELETE FROM etl_state WHERE name = %s", ("run_etl",)
+        )
+        db_connect_mock["mock_conn"].commit.assert_called_once()
+
+    def test_connections_record_metrics(
+        self, db_connect_mock, postgres_repository, db_uri
+    ):
+        """
+        Test that the pool's connections use the cursor recording database
+        round trips in the run metrics.
+        """
+        from ...dags.etl.repositories.postgres_repository import (
+            MetricsCursor,
+            statement_type,
+        )
+
+        db_connect_mock["connection_pool_mock"].assert_called_once_with(
+            minconn=1, maxconn=10, dsn=db_uri, cursor_factory=MetricsCursor
+        )
+        assert statement_type("\n  select 1") == "SELECT"
+        assert statement_type(b"INSERT INTO facts VALUES (1)") == "INSERT"
+        assert statement_type("") == "QUERY"
@@ -0,0 +1,124 @@
+import copy
+import pickle
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def run_metrics():
+    from ..dags.etl.metrics import metrics
+
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+class TestFactRecord:
+    """
+    This class contains the testing logic for the `Fact` record and the
+    `to_facts` conversion.
+    """
+
+    def test_mapping_interface(self):
+        """
+        Test that a fact reads, writes and deletes its fields and the extra
+        keys of the source record like a dictionary.
+        """
+        from ..dags.etl.fact_record import Fact
+
+        record = {"fact": "Dogs bark", "created_date": "2024", "rating": 4.5}
+        fact = Fact.from_record(record)
+
+        assert fact == record
+        assert fact["rating"] == 4.5
+        assert "fact_hash" not in fact
+        assert fact.get("fact_hash") is None
+        with pytest.raises(KeyError):
+            fact["fact_hash"]
+
+        fact["fact_hash"] = "hash"
+        fact["source"] = "partner"
+        del fact["rating"]
+
+        assert dict(fact) == {
+            "fact": "Dogs bark",
+            "created_date": "2024",
+            "fact_hash": "hash",
+            "source": "partner",
+        }
+        assert len(fact) == 4
+        with pytest.raises(KeyError):
+            del fact["rating"]
+
+    def test_copies(self):
+        """
+        Test that facts survive pickling, as done for the process pool, and
+        copying.
+        """
+        from ..dags.etl.fact_record import Fact
+
+        fact = Fact("Dogs bark", "2024", is_numeric=False, rating=4.5)
+
+        assert pickle.loads(pickle.dumps(fact)) == fact
+        assert copy.deepcopy(fact) == fact
+        assert not hasattr(fact, "__dict__")
+
+    def test_to_facts(self, run_metrics):
+        """
+        Test that records missing a required key are dropped and counted,
+        and that `NoNewData` is passed through.
+        """
+        from ..dags.etl.extractors import NoNewData
+        from ..dags.etl.fact_record import Fact, to_facts
+
+        records = [
+            {"fact": "Dogs bark", "created_date": "2024", "source": "a"},
+            {"fact": "Dogs bark", "created_date": "2024"},
+            {"fact": "Dogs bark"},
+        ]
+
+        facts = list(to_facts(iter(records), required_keys=["source"]))
+        no_new_data = NoNewData()
+
+        assert facts == records[:1]
+        assert all(type(fact) is Fact for fact in facts)
+        assert run_metrics.drop_counts() == [("to_facts", "missing_keys", 2)]
+        assert to_facts(no_new_data) is no_new_data
+
+    def test_to_facts_converts_lists_in_place(self, run_metrics):
+        """
+        Test that a list is converted in place, so the decoded dictionaries
+        are not held until the whole list is converted.
+        """
+        from ..dags.etl.fact_record import Fact, to_facts
+
+        records = [
+            {"fact": "Dogs bark", "created_date": "2024"},
+            {"fact": "Dogs bark"},
+            {"fact": "Cats purr", "created_date": "2025"},
+        ]
+        expected = [records[0], records[2]]
+
+        facts = to_facts(records)
+
+        assert facts is records
+        assert facts == expected
+        assert all(type(fact) is Fact for fact in facts)
+        assert run_metrics.drop_counts() == [("to_facts", "missing_keys", 1)]
+
+    def test_write_and_read_facts(self, tmp_path):
+        """
+        Test that facts can be written to the intermediate storage and are
+        read back as dictionaries.
+        """
+        from ..dags.etl.fact_record import Fact
+        from ..dags.etl.storage import read_records, write_records
+
+        fact = Fact(
+            "Dogs bark", "2024", parsed_date=datetime(2024, 1, 1), rating=4.5
+        )
+
+        path = write_records(str(tmp_path / "facts.ndjson.gz"), [fact])
+
+        assert list(read_records(path)) == [fact]
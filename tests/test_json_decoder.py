@@ -0,0 +1,55 @@
+import pytest
+
+from ..dags.etl import json_decoder
+from ..dags.etl.json_decoder import available_decoders, get_decoder
+
+
+class TestJSONDecoder:
+    """
+    This class contains the testing logic for the pluggable JSON decoders.
+    """
+
+    @pytest.mark.parametrize("name", ["orjson", "msgspec", "json"])
+    def test_decoders_agree(self, name):
+        """
+        Test that every installed decoder gives the same records from bytes
+        and str, and raises a ValueError on malformed input.
+        """
+        if name not in available_decoders():
+            pytest.skip(f"{name} is not installed")
+        decode = get_decoder(name)
+        document = '[{"fact": "Dogs \\u2764 bones", "rating": 4.5, "n": 3}]'
+
+        assert decode(document) == decode(document.encode()) == [
+            {"fact": "Dogs ❤ bones", "rating": 4.5, "n": 3}
+        ]
+        with pytest.raises(ValueError):
+            decode(b'[{"fact": ')
+
+    def test_auto_prefers_fastest_installed(self, mocker):
+        """
+        Test that "auto" picks orjson, then msgspec, then the standard
+        library.
+        """
+        mocker.patch.object(json_decoder, "orjson", None)
+        mocker.patch.object(json_decoder, "msgspec", None)
+
+        assert available_decoders() == ["json"]
+        assert get_decoder() is json_decoder.json.loads
+
+        orjson = mocker.Mock()
+        mocker.patch.object(json_decoder, "orjson", orjson)
+
+        assert get_decoder("auto") is orjson.loads
+
+    def test_missing_or_unknown_decoder(self, mocker):
+        """
+        Test that asking for a decoder that is not installed raises an
+        ImportError, and an unknown one a ValueError.
+        """
+        mocker.patch.object(json_decoder, "orjson", None)
+
+        with pytest.raises(ImportError, match="orjson"):
+            get_decoder("orjson")
+        with pytest.raises(ValueError, match="simdjson"):
+            get_decoder("simdjson")
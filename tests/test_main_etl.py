@@ -0,0 +1,142 @@
+import importlib
+from pathlib import Path
+
+import pytest
+
+facts = [
+    "Dogs have a sense of smell far stronger than humans",
+    "Puppies are born deaf and blind",
+    "Greyhounds can run faster than forty miles an hour",
+    "A Bloodhound can follow a trail that is days old",
+    "Basenjis yodel instead of barking",
+    "Dalmatians are born completely white",
+    "Newfoundlands have webbed feet for swimming",
+    "The Chow Chow has a blue black tongue",
+    "Border Collies learn hundreds of words",
+    "Saint Bernards once rescued travellers in the Alps",
+]
+
+
+def make_records(days):
+    return [
+        {
+            "fact": facts[day],
+            "created_date": f"2024-01-{day + 1:02d}T12:00:00.000Z",
+        }
+        for day in days
+    ]
+
+
+@pytest.fixture
+def main_etl(monkeypatch):
+    """
+    The `main_etl` script, which imports the pipeline from the repository
+    root like it does when it is run.
+    """
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[1]))
+    return importlib.import_module("main_etl")
+
+
+@pytest.fixture
+def repository(main_etl):
+    return main_etl.InMemoryRepository()
+
+
+@pytest.fixture
+def make_transformer(main_etl, repository):
+    def make_transformer():
+        return main_etl.FactTransformer(
+            data_repository=repository,
+            version_manager=main_etl.FactVersionManager(repository),
+        )
+
+    return make_transformer
+
+
+def stored_facts(repository):
+    return sorted(fact["fact"] for fact in repository.facts.values())
+
+
+class TestRunChunked:
+    """
+    This class contains the testing logic for `run_chunked`, loading chunks
+    into the in-memory repository.
+    """
+
+    def test_resume_after_failure(
+        self, mocker, main_etl, repository, make_transformer
+    ):
+        """
+        Test that a run failing after some chunks were committed resumes
+        after the last committed chunk, without duplicating or missing facts,
+        and clears its checkpoint once the whole feed is loaded.
+        """
+        records = make_records(range(10))
+        load_facts_chunk = repository.load_facts_chunk
+        calls = []
+
+        def fail_on_third_chunk(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise OSError("Connection lost")
+            return load_facts_chunk(*args)
+
+        mocker.patch.object(
+            repository, "load_facts_chunk", side_effect=fail_on_third_chunk
+        )
+
+        with pytest.raises(OSError):
+            main_etl.run_chunked(
+                records, make_transformer(), repository, chunk_size=3
+            )
+
+        checkpoint = repository.get_checkpoint(main_etl.CHECKPOINT_NAME)
+        assert checkpoint["records_loaded"] == 6
+        assert checkpoint["last_created_date"] == records[5]["created_date"]
+        assert stored_facts(repository) == sorted(facts[:6])
+
+        mocker.stopall()
+        main_etl.run_chunked(
+            make_records(range(10)),
+            make_transformer(),
+            repository,
+            chunk_size=3,
+        )
+
+        assert stored_facts(repository) == sorted(facts)
+        assert repository.get_checkpoint(main_etl.CHECKPOINT_NAME) is None
+
+    def test_incremental(self, main_etl, repository, make_transformer):
+        """
+        Test that an incremental run keeps the watermark, and that the next
+        run only loads the records created since.
+        """
+        watermark_name = main_etl.FactsLoader.watermark_name
+
+        main_etl.run_chunked(
+            make_records(range(5)),
+            make_transformer(),
+            repository,
+            chunk_size=2,
+            incremental=True,
+        )
+
+        watermark = repository.get_checkpoint(watermark_name)
+        assert watermark["last_created_date"] == "2024-01-05T12:00:00.000Z"
+        assert watermark["records_loaded"] == 5
+        assert stored_facts(repository) == sorted(facts[:5])
+
+        # the feed serves the old records again along with the new ones
+        main_etl.run_chunked(
+            make_records(range(10)),
+            make_transformer(),
+            repository,
+            chunk_size=2,
+            incremental=True,
+        )
+
+        watermark = repository.get_checkpoint(watermark_name)
+        assert watermark["last_created_date"] == "2024-01-10T12:00:00.000Z"
+        assert watermark["records_loaded"] == 10
+        assert stored_facts(repository) == sorted(facts)
+        assert repository.get_checkpoint(main_etl.CHECKPOINT_NAME) is None
@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def run_metrics():
+    from ..dags.etl.metrics import metrics
+
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+class TestMetrics:
+    """
+    This class contains the testing logic for the run metrics.
+    """
+
+    def test_log_execution_records_stage(self, run_metrics):
+        """
+        Test that log_execution records calls, times and record counts per
+        stage, including calls that raise.
+        """
+        from ..dags.etl.logging_config import LoggerManager
+
+        class Stage:
+            @LoggerManager.log_execution
+            def run(self, data, fail=False):
+                if fail:
+                    raise ValueError("failed")
+                return data[:1], []
+
+        Stage().run([1, 2, 3])
+        with pytest.raises(ValueError):
+            Stage().run([1, 2], fail=True)
+
+        stage = run_metrics.summary()["stages"][
+            "TestMetrics.test_log_execution_records_stage.<locals>.Stage.run"
+        ]
+        assert stage["calls"] == 2
+        assert stage["input_count"] == 5
+        assert stage["output_count"] == 1
+        assert stage["wall_seconds"] >= 0
+        assert stage["cpu_seconds"] >= 0
+
+    def test_transformer_records_drops(self, mocker, run_metrics):
+        """
+        Test that the cleanup stages record the records they drop by reason.
+        """
+        from ..dags.etl.transformers import FactTransformer
+
+        data_repository = mocker.Mock()
+        data_repository.existing_hashes.side_effect = lambda hashes: {
+            hashes[0]
+        }
+        transformer = FactTransformer(
+            data_repository=data_repository, version_manager=object()
+        )
+
+        transformer.cleanup_data(
+            [
+                {"fact": "Fact 1", "created_date": "2024-01-01T00:00:00.000Z"},
+                {"fact": "Fact 2", "created_date": "2024-01-02T00:00:00.000Z"},
+                {"fact": "Fact 2", "created_date": "2024-01-03T00:00:00.000Z"},
+                {"fact": " ", "created_date": "2024-01-04T00:00:00.000Z"},
+                {"fact": "Fact 5", "created_date": "yesterday"},
+                {"fact": "Fact 6", "created_date": ""},
+                {"fact": "Fact 7"},
+            ]
+        )
+
+        assert sorted(run_metrics.drop_counts()) == [
+            ("deduplication", "already_stored", 1),
+            ("deduplication", "duplicate_in_batch", 1),
+            ("drop_blanks", "blank_fact", 1),
+            ("validate_datetime", "invalid_created_date", 1),
+            ("validate_datetime", "missing_created_date", 1),
+            ("validate_keys", "missing_keys", 1),
+        ]
+
+    def test_track_db(self, run_metrics):
+        """
+        Test that database round trips are counted and timed per operation.
+        """
+        with run_metrics.track_db("SELECT"):
+            pass
+        with pytest.raises(RuntimeError):
+            with run_metrics.track_db("SELECT"):
+                raise RuntimeError("connection lost")
+
+        call = run_metrics.summary()["db"]["SELECT"]
+        assert call["calls"] == 2
+        assert call["max_seconds"] <= call["total_seconds"]
+
+    def test_merge_summary(self, run_metrics):
+        """
+        Test that metrics collected in another process add up.
+        """
+        run_metrics.record_stage("cleanup_data", 1.0, 0.5, 10, 8)
+        run_metrics.record_drop("drop_blanks", "blank_fact", 2)
+        run_metrics.record_db_call("SELECT", 0.1)
+        other = run_metrics.summary()
+        other["peak_rss_bytes"] = 1 << 50
+
+        run_metrics.merge_summary(other)
+        summary = run_metrics.summary()
+
+        assert summary["stages"]["cleanup_data"] == {
+            "calls": 2,
+            "wall_seconds": 2.0,
+            "cpu_seconds": 1.0,
+            "input_count": 20,
+            "output_count": 16,
+        }
+        assert summary["drops"] == [
+            {"stage": "drop_blanks", "reason": "blank_fact", "count": 4}
+        ]
+        assert summary["db"]["SELECT"] == {
+            "calls": 2,
+            "total_seconds": 0.2,
+            "max_seconds": 0.1,
+        }
+        assert summary["peak_rss_bytes"] == 1 << 50
+
+    def test_exports(self, run_metrics, tmp_path):
+        """
+        Test the JSON and Prometheus textfile exports.
+        """
+        run_metrics.record_stage("FactTransformer.transform", 1.5, 1.0, 3, 2)
+        run_metrics.record_drop("validate_keys", 'missing "fact"', 1)
+        run_metrics.record_db_call("INSERT", 0.25)
+        json_path = tmp_path / "metrics.json"
+        prometheus_path = tmp_path / "metrics.prom"
+
+        run_metrics.write_json(str(json_path))
+        run_metrics.write_prometheus(str(prometheus_path))
+
+        summary = json.loads(json_path.read_text())
+        assert summary["stages"]["FactTransformer.transform"]["calls"] == 1
+        text = prometheus_path.read_text()
+        assert "# TYPE etl_stage_wall_seconds gauge" in text
+        assert (
+            'etl_stage_wall_seconds{stage="FactTransformer.transform"} 1.5'
+            in text
+        )
+        assert (
+            'etl_dropped_records{stage="validate_keys",'
+            'reason="missing \\"fact\\""} 1' in text
+        )
+        assert 'etl_db_calls{operation="INSERT"} 1' in text
+
+    def test_summary_report_includes_metrics(
+        self, mocker, run_metrics, tmp_path
+    ):
+        """
+        Test that the summary report includes the run metrics and writes them
+        to the configured files.
+        """
+        from ..dags.etl.error_reporting import ErrorReporter
+
+        logger = mocker.Mock()
+        error_reporter = ErrorReporter(
+            logger,
+            metrics_json_path=str(tmp_path / "metrics.json"),
+            metrics_prometheus_path=str(tmp_path / "metrics.prom"),
+        )
+        run_metrics.record_drop("drop_blanks", "blank_fact", 1)
+
+        error_reporter.send_summary_report()
+
+        summary_message = logger.info.call_args[0][0]
+        assert "No errors occurred." in summary_message
+        assert "blank_fact" in summary_message
+        assert (tmp_path / "metrics.json").exists()
+        assert (tmp_path / "metrics.prom").exists()
@@ -0,0 +1,71 @@
+import gzip
+import os
+from datetime import datetime
+
+
+class TestStorage:
+    """
+    This class contains the testing logic for the intermediate storage
+    helpers shared by the DAG tasks.
+    """
+
+    def test_write_and_read_records(self, tmp_path):
+        """
+        Test that records survive a round trip through a compressed NDJSON
+        file, including datetime values.
+        """
+        from ..dags.etl.storage import read_records, write_records
+
+        records = [
+            {
+                "fact": "Fact 1",
+                "parsed_date": datetime(2024, 8, 14, 12, 34, 56),
+                "bucket_hashes": [1, 2],
+            },
+            {"fact": "Fact 2", "parsed_date": None},
+        ]
+        path = str(tmp_path / "facts.ndjson.gz")
+
+        result = write_records(path, iter(records))
+
+        assert result == path
+        assert list(read_records(path)) == records
+        with gzip.open(path, "rt") as file:
+            assert len(file.readlines()) == 2
+        assert not os.path.exists(f"{path}.tmp")
+
+    def test_write_records_failure_keeps_no_file(self, tmp_path):
+        """
+        Test that a failing write does not leave a readable file behind.
+        """
+        import pytest
+
+        from ..dags.etl.storage import write_records
+
+        path = str(tmp_path / "facts.ndjson.gz")
+
+        with pytest.raises(TypeError):
+            write_records(path, [{"fact": object()}])
+
+        assert not os.path.exists(path)
+
+    def test_run_directory(self, tmp_path):
+        """
+        Test that every run gets its own directory, which is removed with
+        remove_run_directory.
+        """
+        from ..dags.etl.storage import remove_run_directory, run_directory
+
+        path = run_directory(
+            "scheduled__2024-08-14T00:00:00+00:00", base_dir=str(tmp_path)
+        )
+
+        assert os.path.isdir(path)
+        assert os.path.dirname(path) == str(tmp_path)
+        assert ":" not in os.path.basename(path)
+
+        remove_run_directory(
+            "scheduled__2024-08-14T00:00:00+00:00", base_dir=str(tmp_path)
+        )
+
+        assert not os.path.exists(path)
@@ -17,9 +17,18 @@ def version_manager_mock(mocker):
 @pytest.fixture
 def datetime_validator_mock(mocker):
     """
-    Fixture to create a mock of the validator dependency.
+    Fixture to create a mock of the validator dependency. Its batch
+    `validate_many` answers through the mocked `validate`, so tests only set
+    up the result per date.
     """
-    return mocker.Mock()
+    validator = mocker.Mock()
+
+    def validate_many(date_strings):
+        parsed_dates = [validator.validate(date) for date in date_strings]
+        return parsed_dates, [not date for date in parsed_dates]
+
+    validator.validate_many.side_effect = validate_many
+    return validator
 
 
 @pytest.fixture
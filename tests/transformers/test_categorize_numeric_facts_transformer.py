@@ -17,8 +17,8 @@ class TestCategorizeNumericFacts:
 
         instance = FactTransformer(data_repository=data_repository_mock)
 
-        # Mock the contains_number method
-        mocker.patch.object(instance, "contains_number", autospec=True)
+        # Mock the contains_numbers method
+        mocker.patch.object(instance, "contains_numbers", autospec=True)
         return instance
 
     def test_categorize_numeric_facts_all_numeric(
@@ -27,7 +27,7 @@ class TestCategorizeNumericFacts:
         """
         Test categorize_numeric_facts where all facts contain numbers.
         """
-        fact_transformer_instance.contains_number.return_value = True
+        fact_transformer_instance.contains_numbers.return_value = [True, True]
 
         data = [{"fact": "Fact 1"}, {"fact": "There are twenty apples."}]
 
@@ -41,7 +41,10 @@ class TestCategorizeNumericFacts:
         """
         Test categorize_numeric_facts where no facts contain numbers.
         """
-        fact_transformer_instance.contains_number.return_value = False
+        fact_transformer_instance.contains_numbers.return_value = [
+            False,
+            False,
+        ]
 
         data = [
             {"fact": "This is a fact."},
@@ -64,8 +67,8 @@ class TestCategorizeNumericFacts:
             {"fact": "Just some words."},
         ]
 
-        # Mock contains_number to return True for specific facts
-        fact_transformer_instance.contains_number.side_effect = [
+        # Mock contains_numbers to return True for specific facts
+        fact_transformer_instance.contains_numbers.return_value = [
             True,
             False,
             True,
@@ -104,10 +107,10 @@ class TestCategorizeNumericFacts:
             {"fact": "This is numeric 100."},
         ]
 
-        # Mock contains_number to return True only for valid facts
-        fact_transformer_instance.contains_number.side_effect = lambda x: (
-            "100" in x if isinstance(x, str) else False
-        )
+        # Mock contains_numbers to return True only for valid facts
+        fact_transformer_instance.contains_numbers.side_effect = lambda x: [
+            "100" in text for text in x
+        ]
 
         result = fact_transformer_instance.categorize_numeric_facts(data)
         assert (
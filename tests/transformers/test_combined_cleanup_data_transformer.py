@@ -3,7 +3,7 @@ class TestCleanupDataTransformer:
     def test_cleanup_data_no_blanks_no_duplicates(
         self, data_repository_mock, fact_transformer_instance
     ):
-        data_repository_mock.fact_exists.return_value = False
+        data_repository_mock.existing_hashes.return_value = set()
         data = [
             {"fact": "Fact 1", "created_date": "2024-01-01"},
             {"fact": "Fact 2", "created_date": "2024-01-02"},
@@ -17,7 +17,7 @@ class TestCleanupDataTransformer:
     def test_cleanup_data_with_blanks(
         self, data_repository_mock, fact_transformer_instance
     ):
-        data_repository_mock.fact_exists.return_value = False
+        data_repository_mock.existing_hashes.return_value = set()
         data = [
             {"fact": "Fact 1", "created_date": "2024-01-01"},
             {"fact": "", "created_date": "2024-01-02"},
@@ -41,7 +41,7 @@ class TestCleanupDataTransformer:
     def test_cleanup_data_with_duplicates(
         self, data_repository_mock, fact_transformer_instance
     ):
-        data_repository_mock.fact_exists.return_value = False
+        data_repository_mock.existing_hashes.return_value = set()
         data = [
             {"fact": "Fact 1", "created_date": "2024-01-03"},
             {"fact": "Fact 2", "created_date": "2024-01-01"},
@@ -66,7 +66,7 @@ class TestCleanupDataTransformer:
     def test_cleanup_data_with_whitespaces(
         self, data_repository_mock, fact_transformer_instance
     ):
-        data_repository_mock.fact_exists.return_value = False
+        data_repository_mock.existing_hashes.return_value = set()
         data = [
             {"fact": " Fact 1 ", "created_date": "2024-01-01"},
             {"fact": "Fact 2", "created_date": "2024-01-02"},
@@ -89,7 +89,7 @@ class TestCleanupDataTransformer:
     def test_cleanup_data_all_steps_combined(
         self, data_repository_mock, fact_transformer_instance
     ):
-        data_repository_mock.fact_exists.return_value = False
+        data_repository_mock.existing_hashes.return_value = set()
         data = [
             {
                 "fact": " Fact 1 ",
@@ -97,3 +97,99 @@ class TestDateTimeValidator:
         """
         out_of_bounds_date_string = "1899-12-31T23:59:59.999Z"
         assert date_time_validator.validate(out_of_bounds_date_string) is None
+
+    def test_validate_invalid_date(self, date_time_validator):
+        """
+        Test the full validate method with a well formed but impossible date.
+        """
+        assert date_time_validator.validate("2024-02-30T12:34:56.789Z") is None
+
+    def test_validate_trailing_characters(self, date_time_validator):
+        """
+        Test that the format has to match the whole string.
+        """
+        validate = date_time_validator.validate
+
+        assert validate("2024-08-14T12:34:56.789Z\n") is None
+        assert validate("2024-08-14T12:34:56.7890Z") is None
+
+    def test_validate_matches_strptime(self, date_time_validator):
+        """
+        Test that the single-pass parse gives the same datetime as strptime
+        with the feed's format.
+        """
+        date_string = "2024-12-31T23:59:59.001Z"
+
+        assert date_time_validator.validate(date_string) == datetime.strptime(
+            date_string, "%Y-%m-%dT%H:%M:%S.%fZ"
+        )
+
+    def test_per_step_checks_keep_lenient_parsing(self, date_time_validator):
+        """
+        Test that the per-step checks accept what they accepted before the
+        single-pass parse, while `validate` requires the exact feed format.
+        """
+        short_date_string = "2024-8-4T1:2:3.5Z"
+
+        assert date_time_validator.validate_components(short_date_string)
+        assert date_time_validator.validate_range(short_date_string)
+        assert date_time_validator.validate_format(
+            "2024-08-14T12:34:56.789Z\n"
+        )
+        assert date_time_validator.validate(short_date_string) is None
+
+    def test_validate_many(self, date_time_validator):
+        """
+        Test that validate_many returns the parsed dates and a rejection mask
+        aligned with the input, agreeing with validate on every string.
+        """
+        date_strings = [
+            "2024-08-14T12:34:56.789Z",
+            "2024-08-14 12:34:56",
+            "1899-12-31T23:59:59.999Z",
+            "2024-08-15T00:00:00.000Z",
+            "2024-02-30T12:34:56.789Z",
+            "2024-08-14T12:34:56.789Z\n",
+            "2101-01-01T00:00:00.000Z",
+            "2000-01-01T00:00:00.000Z",
+            "1999-12-31T23:59:59.999Z",
+        ]
+
+        parsed_dates, rejected = date_time_validator.validate_many(
+            date_strings
+        )
+
+        assert parsed_dates == [
+            date_time_validator.validate(date_string)
+            for date_string in date_strings
+        ]
+        assert parsed_dates[:4] == [
+            datetime(2024, 8, 14, 12, 34, 56, 789000),
+            None,
+            None,
+            datetime(2024, 8, 15),
+        ]
+        assert rejected == [date is None for date in parsed_dates]
+        assert date_time_validator.validate_many([]) == ([], [])
+
+    def test_validate_many_bounds(self):
+        """
+        Test that validate_many applies the configured min and max dates
+        together with the year range, like validate.
+        """
+        from ...dags.etl.transformers import DateTimeValidator
+
+        validator = DateTimeValidator(
+            min_date=datetime(1800, 1, 1), max_date=datetime(2024, 6, 30)
+        )
+        date_strings = [
+            "1899-12-31T23:59:59.999Z",
+            "1900-01-01T00:00:00.000Z",
+            "2024-06-30T00:00:00.000Z",
+            "2024-07-01T00:00:00.000Z",
+        ]
+
+        parsed_dates, rejected = validator.validate_many(date_strings)
+
+        assert parsed_dates == [validator.validate(d) for d in date_strings]
+        assert rejected == [True, False, False, True]
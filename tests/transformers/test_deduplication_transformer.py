@@ -22,14 +22,14 @@ class TestDeduplicationTransformer:
         :param fact_transformer_instance: FactTransformer class instance
         :param data_repository_mock: The `data_repository_mock` is a mock
         object that simulates the behavior of a data repository. In this test
-        case, it is being used to mock the  `fact_exists` method to return
-        `False`, indicating that no facts exist in the repository.
+        case, it is being used to mock the `existing_hashes` method to return
+        an empty set, indicating that no facts exist in the repository.
         """
         data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}, {"fact": "Fact 3"}]
 
-        # Mock fact_exists to return False, meaning no facts exist in the
-        # repository
-        data_repository_mock.fact_exists.return_value = False
+        # Mock existing_hashes to return an empty set, meaning no facts exist
+        # in the repository
+        data_repository_mock.existing_hashes.return_value = set()
 
         result = fact_transformer_instance.deduplication(data)
 
@@ -48,9 +48,9 @@ class TestDeduplicationTransformer:
         :param fact_transformer_instance: FactTransformer class instance
         :param data_repository_mock: The `data_repository_mock` is a mock
         object that simulates the behavior of a data repository in the test
-        environment. In this specific test case, it uses the `fact_exists`
-        method of the `data_repository_mock` to check if a fact already exists
-        in the repository before deduplicating
+        environment. In this specific test case, it uses the
+        `existing_hashes` method of the `data_repository_mock` to check if a
+        fact already exists in the repository before deduplicating
         """
         data = [
             {"fact": "Fact 1"},
@@ -58,9 +58,9 @@ class TestDeduplicationTransformer:
             {"fact": "Fact 1"},  # Duplicate fact
         ]
 
-        # Mock fact_exists to return False, meaning no facts exist in the
-        # repository
-        data_repository_mock.fact_exists.return_value = False
+        # Mock existing_hashes to return an empty set, meaning no facts exist
+        # in the repository
+        data_repository_mock.existing_hashes.return_value = set()
 
         result = fact_transformer_instance.deduplication(data)
 
@@ -75,19 +75,16 @@ class TestDeduplicationTransformer:
 
         :param fact_transformer_instance: FactTransformer class instance
         :param data_repository_mock: This is a mock object that simulates the
-        behavior of a data repository. In this specific test case, it used to
-        setting up a side effect for the `fact_exists` method of this mock
-        object to return `True` only for "Fact 2
+        behavior of a data repository. In this specific test case, the
+        `existing_hashes` method of this mock object returns only the hash of
+        "Fact 2"
         """
         data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}, {"fact": "Fact 3"}]
 
-        # Mock fact_exists to return True for "Fact 2", meaning it already
-        # exists in the repository
-        def fact_exists_side_effect(hash_value):
-            fact_2_hash = hashlib.md5("Fact 2".encode()).hexdigest()
-            return hash_value == fact_2_hash
-
-        data_repository_mock.fact_exists.side_effect = fact_exists_side_effect
+        # Mock existing_hashes to return the hash of "Fact 2", meaning it
+        # already exists in the repository
+        fact_2_hash = hashlib.md5("Fact 2".encode()).hexdigest()
+        data_repository_mock.existing_hashes.return_value = {fact_2_hash}
 
         result = fact_transformer_instance.deduplication(data)
 
@@ -106,16 +103,37 @@ class TestDeduplicationTransformer:
         :param fact_transformer_instance: FactTransformer class instance
         :param data_repository_mock: This is a mock object that simulates the
         behavior of a data repository in the test environment. In this specific
-        test case, the `fact_exists` method of the `data_repository_mock` is
-        being mocked to always return `True` for any fact provided to it.
+        test case, the `existing_hashes` method of the `data_repository_mock`
+        is being mocked to return the hashes of all facts provided to it.
         """
         data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}, {"fact": "Fact 3"}]
 
-        # Mock fact_exists to return True for all facts
-        data_repository_mock.fact_exists.return_value = True
+        # Mock existing_hashes to return every hash it is asked about
+        data_repository_mock.existing_hashes.side_effect = set
 
         result = fact_transformer_instance.deduplication(data)
 
         assert (
             len(result) == 0
         )  # Expecting no facts in the result as all exist in the repository
+
+    def test_deduplication_single_repository_lookup(
+        self, fact_transformer_instance, data_repository_mock
+    ):
+        """
+        This function tests that deduplication resolves the whole batch with
+        one `existing_hashes` call, passing only hashes unique to the batch.
+        """
+        data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}, {"fact": "Fact 1"}]
+
+        data_repository_mock.existing_hashes.return_value = set()
+
+        fact_transformer_instance.deduplication(data)
+
+        data_repository_mock.existing_hashes.assert_called_once_with(
+            [
+                hashlib.md5("Fact 1".encode()).hexdigest(),
+                hashlib.md5("Fact 2".encode()).hexdigest(),
+            ]
+        )
+        data_repository_mock.fact_exists.assert_not_called()
@@ -25,3 +25,22 @@ class TestFactTransformer:
 
         assert clean_data[0]["fact"] == "A great fact about dogs!"
         assert clean_data[1]["fact"] == "This is another fact with new line!"
+
+    def test_transform_no_new_data(
+        self, fact_transformer_instance, version_manager_mock
+    ):
+        """
+        This function tests that `transform` and `transform_stream` pass
+        `NoNewData` through without running any stage.
+        """
+        from ...dags.etl.extractors import NoNewData
+
+        transformed_data, expired = fact_transformer_instance.transform(
+            NoNewData()
+        )
+
+        assert isinstance(transformed_data, NoNewData)
+        assert expired == []
+        stream = fact_transformer_instance.transform_stream(NoNewData())
+        assert list(stream) == []
+        assert version_manager_mock.method_calls == []
@@ -128,3 +128,419 @@ class TestFactVersionManager:
 
         # Should return None because no match meets the threshold
         assert result is None
+
+    def test_match_and_find_versions_empty_batch(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that match_and_find_versions returns an empty list without
+        querying the repository for an empty batch.
+        """
+        result = fact_version_manager.match_and_find_versions([])
+
+        assert result == []
+        data_repository_mock.find_similar_facts_for_batch.assert_not_called()
+
+    def test_match_and_find_versions_batch(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that match_and_find_versions fetches the candidates of the whole
+        batch with one repository call and matches each fact against its own
+        candidates.
+        """
+        facts = [
+            {"fact": "This is a test fact"},
+            {"fact": "Something entirely different"},
+        ]
+        data_repository_mock.find_similar_facts_for_batch.return_value = [
+            [(1, 101, "This is a test fact")],
+            [(1, 101, "This is a test fact")],
+        ]
+
+        result = fact_version_manager.match_and_find_versions(facts)
+
+        assert result == [1, None]
+        data_repository_mock.find_similar_facts_for_batch.assert_called_once()
+        data_repository_mock.find_similar_facts_by_buckets.assert_not_called()
+        assert facts[0]["fact_number"] == 101
+        assert "fact_number" not in facts[1]
+        assert all("bucket_hashes" in fact for fact in facts)
+
+    def test_match_and_find_versions_within_batch(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that a later version of a fact within the same batch is resolved
+        in memory: it references the earlier fact, the earlier fact is
+        flagged as not current, and the candidates of the batch are fetched
+        with one repository call.
+        """
+        facts = [
+            {"fact": "Dogs can hear high pitched sounds", "fact_hash": "h1"},
+            {"fact": "Dogs can hear high pitched sound", "fact_hash": "h2"},
+        ]
+        data_repository_mock.find_similar_facts_for_batch.return_value = [
+            [],
+            [],
+        ]
+
+        result = fact_version_manager.match_and_find_versions(facts)
+
+        assert result == [None, None]
+        data_repository_mock.find_similar_facts_for_batch.assert_called_once_with(  # noqa
+            [fact["bucket_hashes"] for fact in facts]
+        )
+        assert facts[0]["is_current"] is False
+        assert "is_current" not in facts[1]
+        assert facts[1]["previous_fact_hash"] == "h1"
+        assert "fact_number" not in facts[1]
+
+    def test_match_and_find_versions_within_batch_stored_number(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that a later version within the batch takes over the fact number
+        the earlier fact got from the repository, and that a chain of
+        versions only keeps the latest fact current.
+        """
+        facts = [
+            {"fact": "Dogs can hear high pitched sounds", "fact_hash": "h1"},
+            {"fact": "Dogs can hear high pitched sound", "fact_hash": "h2"},
+            {"fact": "Dogs can hear high-pitched sound", "fact_hash": "h3"},
+        ]
+        data_repository_mock.find_similar_facts_for_batch.return_value = [
+            [(7, 70, "Dogs can hear high pitched sounds!")]
+        ] * 3
+
+        result = fact_version_manager.match_and_find_versions(facts)
+
+        assert result == [7, None, None]
+        assert [fact["fact_number"] for fact in facts] == [70, 70, 70]
+        assert facts[0]["is_current"] is False
+        assert facts[1]["is_current"] is False
+        assert "is_current" not in facts[2]
+
+    def test_match_and_find_versions_stored_fact_claimed_once(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that two facts of a batch matching the same stored fact, but not
+        each other, do not both supersede it: the later one supersedes the
+        earlier one, so only one fact of the chain stays current.
+        """
+        facts = [
+            {"fact": "Cats sleep for sixteen hours a day", "fact_hash": "h1"},
+            {"fact": "Cats sleep sixteen hours each day!!", "fact_hash": "h2"},
+        ]
+        stored = (7, 70, "Cats sleep for sixteen hours each day")
+        data_repository_mock.find_similar_facts_for_batch.return_value = [
+            [stored],
+            [stored],
+        ]
+        # the facts do not share a bucket, so only the stored fact links them
+        facts[0]["bucket_hashes"] = [1, 2, 3, 4, 5]
+        facts[1]["bucket_hashes"] = [6, 7, 8, 9, 10]
+
+        result = fact_version_manager.match_and_find_versions(facts)
+
+        assert result == [7, None]
+        assert [fact["fact_number"] for fact in facts] == [70, 70]
+        assert facts[0]["is_current"] is False
+        assert "is_current" not in facts[1]
+
+    def test_default_tokenizer(
+        self, fact_version_manager, data_repository_mock
+    ):
+        """
+        Test that facts are tokenized by words by default, while the original
+        tfidf tokenizer, whose tokens only depend on the number of distinct
+        words, can still be selected.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        tfidf_manager = FactVersionManager(
+            data_repository_mock, tokenizer="tfidf"
+        )
+
+        assert fact_version_manager.tokenizer == "words"
+        assert tfidf_manager.create_lsh_buckets(
+            "Dogs bark loudly"
+        ) == tfidf_manager.create_lsh_buckets("Cats chase mice")
+
+    def test_unknown_tokenizer(self, data_repository_mock):
+        """
+        Test that an unknown tokenizer is rejected.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        with pytest.raises(ValueError, match="Unknown tokenizer"):
+            FactVersionManager(data_repository_mock, tokenizer="unknown")
+
+    @pytest.mark.parametrize("tokenizer", ["words", "shingles"])
+    def test_create_lsh_buckets_stable_tokenizers(
+        self, data_repository_mock, tokenizer
+    ):
+        """
+        Test that the fit-free tokenizers give identical buckets for the same
+        text across instances, different buckets for different texts, and a
+        ValueError for text without tokens.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        first = FactVersionManager(data_repository_mock, tokenizer=tokenizer)
+        second = FactVersionManager(data_repository_mock, tokenizer=tokenizer)
+
+        text = "Dogs have three eyelids"
+        assert first.create_lsh_buckets(text) == second.create_lsh_buckets(
+            "  DOGS have three   eyelids!"
+        )
+        assert first.create_lsh_buckets(text) != first.create_lsh_buckets(
+            "Puppies are born deaf and blind"
+        )
+        with pytest.raises(ValueError):
+            first.create_lsh_buckets("  !  ")
+
+    def test_tokenize_words_drops_stop_words(self, data_repository_mock):
+        """
+        Test that the words tokenizer drops stop words unless the text holds
+        nothing else.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(data_repository_mock, tokenizer="words")
+
+        assert manager.tokenize("The dog is happy") == [b"dog", b"happy"]
+        assert manager.tokenize("It is") == [b"is", b"it"]
+
+    def test_tokenize_shingles(self, data_repository_mock):
+        """
+        Test that the shingles tokenizer returns the character shingles of
+        the normalized text, or the whole text when it is shorter.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(
+            data_repository_mock, tokenizer="shingles", shingle_size=3
+        )
+
+        assert manager.tokenize("A  dog") == [b" do", b"a d", b"dog"]
+        assert manager.tokenize("ab") == [b"ab"]
+
+    def test_rebuild_lsh_buckets(self, data_repository_mock):
+        """
+        Test that rebuild_lsh_buckets pages through the current facts and
+        replaces their buckets page by page.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(data_repository_mock, tokenizer="words")
+        data_repository_mock.get_current_facts.side_effect = [
+            [(1, "Dogs have three eyelids"), (4, "Dogs sweat through paws")],
+            [(9, "Puppies are born deaf")],
+            [],
+        ]
+
+        rebuilt = manager.rebuild_lsh_buckets(batch_size=2)
+
+        assert rebuilt == 3
+        assert [
+            call.kwargs
+            for call in data_repository_mock.get_current_facts.call_args_list
+        ] == [
+            {"after_id": 0, "limit": 2},
+            {"after_id": 4, "limit": 2},
+            {"after_id": 9, "limit": 2},
+        ]
+        replaced = data_repository_mock.replace_lsh_buckets.call_args_list
+        assert [sorted(call[0][0]) for call in replaced] == [[1, 4], [9]]
+        assert replaced[1][0][0][9] == manager.create_lsh_buckets(
+            "Puppies are born deaf"
+        )
+
+    def test_create_lsh_buckets_batch(self, fact_version_manager):
+        """
+        Test that create_lsh_buckets_batch returns one row of bucket hashes
+        per text, identical to create_lsh_buckets for each text.
+        """
+        texts = ["word", "multiple words input", "Dogs have three eyelids"]
+
+        result = fact_version_manager.create_lsh_buckets_batch(texts)
+
+        assert result.shape == (len(texts), fact_version_manager.num_buckets)
+        assert result.tolist() == [
+            fact_version_manager.create_lsh_buckets(text) for text in texts
+        ]
+
+    def test_create_lsh_buckets_batch_empty(self, fact_version_manager):
+        """
+        Test that create_lsh_buckets_batch handles an empty batch.
+        """
+        result = fact_version_manager.create_lsh_buckets_batch([])
+
+        assert result.shape == (0, fact_version_manager.num_buckets)
+
+    def test_create_lsh_buckets_matches_datasketch(self, data_repository_mock):
+        """
+        Test that the vectorized MinHash gives the same values as a
+        datasketch legacy MinHash updated token by token. With bands of one
+        row the bucket hashes are the MinHash values.
+        """
+        from datasketch import MinHash
+
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(
+            data_repository_mock, tokenizer="words", rows_per_band=1
+        )
+        text = "Dogs have three eyelids and sweat through their paws"
+
+        try:
+            minhash = MinHash(num_perm=manager.num_perm, scheme="legacy")
+        except TypeError:
+            # datasketch < 2.0 only implements the legacy scheme
+            minhash = MinHash(num_perm=manager.num_perm)
+        for token in manager.tokenize(text):
+            minhash.update(token)
+
+        assert manager.create_lsh_buckets(text) == [
+            int(value) for value in minhash.hashvalues[: manager.num_buckets]
+        ]
+
+    def test_too_many_bands(self, data_repository_mock):
+        """
+        Test that bands needing more permutations than available are
+        rejected.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        with pytest.raises(ValueError, match="permutations"):
+            FactVersionManager(
+                data_repository_mock,
+                num_perm=16,
+                num_buckets=5,
+                rows_per_band=4,
+            )
+
+    def test_create_lsh_buckets_banded(self, data_repository_mock):
+        """
+        Test that banded LSH returns one BIGINT-sized bucket hash per band.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(
+            data_repository_mock,
+            num_perm=64,
+            num_buckets=8,
+            tokenizer="words",
+            rows_per_band=4,
+        )
+
+        result = manager.create_lsh_buckets_batch(
+            ["Dogs have three eyelids", "Puppies are born deaf"]
+        )
+
+        assert result.shape == (2, 8)
+        assert all(0 <= value < 2**63 for value in result.flatten().tolist())
+
+    def test_default_bands_separate_unrelated_facts(
+        self, data_repository_mock
+    ):
+        """
+        Test that with the default bands a fact shares buckets with an edited
+        version of it, but none with an unrelated fact sharing a word, which
+        bands of a single row would make a candidate.
+        """
+        from ...dags.etl.transformers import FactVersionManager
+
+        texts = [
+            "Dogs have three eyelids and sweat through their paws",
+            "Dogs have three eyelids and sweat through their feet",
+            "Cats have whiskers that sense the air around paws",
+        ]
+
+        manager = FactVersionManager(data_repository_mock, tokenizer="words")
+        single_row_manager = FactVersionManager(
+            data_repository_mock,
+            num_buckets=5,
+            tokenizer="words",
+            rows_per_band=1,
+        )
+
+        fact, edited, unrelated = manager.create_lsh_buckets_batch(
+            texts
+        ).tolist()
+        assert manager.rows_per_band > 1
+        assert any(a == b for a, b in zip(fact, edited))
+        assert not any(a == b for a, b in zip(fact, unrelated))
+
+        fact, _, unrelated = single_row_manager.create_lsh_buckets_batch(
+            texts
+        ).tolist()
+        assert any(a == b for a, b in zip(fact, unrelated))
+
+    def test_hash_bands(self, data_repository_mock):
+        """
+        Test that a band's bucket hash only agrees when all of its rows agree.
+        """
+        import numpy as np
+
+        from ...dags.etl.transformers import FactVersionManager
+
+        manager = FactVersionManager(
+            data_repository_mock, num_buckets=2, rows_per_band=2
+        )
+        signatures = np.array(
+            [[1, 2, 3, 4], [1, 2, 3, 5], [2, 1, 3, 4]], dtype=np.uint64
+        )
+
+        bucket_hashes = manager.hash_bands(signatures).tolist()
+
+        assert bucket_hashes[0][0] == bucket_hashes[1][0]
+        assert bucket_hashes[0][1] != bucket_hashes[1][1]
+        assert bucket_hashes[0][0] != bucket_hashes[2][0]
+        assert bucket_hashes[0][1] == bucket_hashes[2][1]
+
+    def test_find_best_match_picks_top_scorer(self, fact_version_manager):
+        """
+        Test that find_best_match returns the id, fact number and score of
+        the most similar candidate.
+        """
+        from rapidfuzz import fuzz
+
+        candidates = [
+            (1, 101, "This is another fact"),
+            (2, 102, "This is a test facts"),
+            (3, 103, "Completely unrelated"),
+        ]
+
+        result = fact_version_manager.find_best_match(
+            "This is a test fact", candidates
+        )
+
+        assert result == (
+            2,
+            102,
+            fuzz.ratio("This is a test fact", "This is a test facts"),
+        )
+
+    def test_find_best_match_score_equal_to_threshold(
+        self, fact_version_manager
+    ):
+        """
+        Test that a candidate scoring exactly the threshold is not a match.
+        """
+        from rapidfuzz import fuzz
+
+        fact_version_manager.threshold = fuzz.ratio("abcd", "abce")
+
+        assert (
+            fact_version_manager.find_best_match("abcd", [(1, 101, "abce")])
+            is None
+        )
+
+    def test_find_best_match_no_candidates(self, fact_version_manager):
+        """
+        Test that find_best_match returns None without candidates.
+        """
+        assert fact_version_manager.find_best_match("abcd", []) is None
@@ -4,11 +4,15 @@ class TestIdentifyVersionsTransformer:
     class.
     """
 
-    def test_identify_versions_empty_data(self, fact_transformer_instance):
+    def test_identify_versions_empty_data(
+        self, fact_transformer_instance, version_manager_mock
+    ):
         """
         Test identify_versions with an empty data list.
         It should return empty lists for both expired and data.
         """
+        version_manager_mock.match_and_find_versions.return_value = []
+
         result_expired, result_data = (
             fact_transformer_instance.identify_versions([])
         )
@@ -23,7 +27,10 @@ class TestIdentifyVersionsTransformer:
         Test identify_versions where no facts match existing versions.
         It should return a list of None values in expired.
         """
-        version_manager_mock.match_and_find_version.return_value = None
+        version_manager_mock.match_and_find_versions.return_value = [
+            None,
+            None,
+        ]
 
         data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}]
 
@@ -41,7 +48,7 @@ class TestIdentifyVersionsTransformer:
         Test identify_versions where some facts match existing versions.
         It should return a list of expired fact IDs where matches are found.
         """
-        version_manager_mock.match_and_find_version.side_effect = [
+        version_manager_mock.match_and_find_versions.return_value = [
             123,
             None,
             456,
@@ -64,7 +71,7 @@ class TestIdentifyVersionsTransformer:
         The result should correctly reflect expired fact IDs and None for
         unmatched ones.
         """
-        version_manager_mock.match_and_find_version.side_effect = [
+        version_manager_mock.match_and_find_versions.return_value = [
             None,
             101,
             None,
@@ -92,7 +99,7 @@ class TestIdentifyVersionsTransformer:
         Test identify_versions where all facts match existing versions.
         It should return a list of expired fact IDs.
         """
-        version_manager_mock.match_and_find_version.side_effect = [
+        version_manager_mock.match_and_find_versions.return_value = [
             111,
             222,
             333,
@@ -106,3 +113,24 @@ class TestIdentifyVersionsTransformer:
 
         assert result_expired == [111, 222, 333]
         assert result_data == data
+
+    def test_identify_versions_single_batch_call(
+        self, fact_transformer_instance, version_manager_mock
+    ):
+        """
+        Test identify_versions resolves the whole batch with one call to the
+        version manager instead of one call per fact.
+        """
+        version_manager_mock.match_and_find_versions.return_value = [
+            None,
+            None,
+        ]
+
+        data = [{"fact": "Fact 1"}, {"fact": "Fact 2"}]
+
+        fact_transformer_instance.identify_versions(data)
+
+        version_manager_mock.match_and_find_versions.assert_called_once_with(
+            data
+        )
+        version_manager_mock.match_and_find_version.assert_not_called()
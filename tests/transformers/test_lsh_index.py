@@ -0,0 +1,82 @@
+class TestLSHIndex:
+    """
+    This class contains the testing logic for the in-memory `LSHIndex`.
+    """
+
+    def test_query_empty_index(self):
+        """
+        Test that querying an empty index returns no positions.
+        """
+        from ...dags.etl.transformers.lsh_index import LSHIndex
+
+        index = LSHIndex()
+
+        assert index.query([1, 2, 3]) == []
+        assert len(index) == 0
+
+    def test_query_shared_buckets(self):
+        """
+        Test that query returns every position sharing the bucket of at least
+        one band, once and in ascending order.
+        """
+        from ...dags.etl.transformers.lsh_index import LSHIndex
+
+        index = LSHIndex()
+        index.add(2, [10, 11])
+        index.add(0, [10, 12])
+        index.add(1, [13, 11])
+
+        assert index.query([10, 11]) == [0, 1, 2]
+        assert index.query([13, 12]) == [0, 1]
+        assert len(index) == 3
+
+    def test_query_matches_within_band_only(self):
+        """
+        Test that equal bucket hashes of different bands do not match.
+        """
+        from ...dags.etl.transformers.lsh_index import LSHIndex
+
+        index = LSHIndex()
+        index.add(0, [10, 11])
+
+        assert index.query([11, 10]) == []
+
+    def test_remove(self):
+        """
+        Test that a removed position is no longer returned and its empty
+        buckets are dropped.
+        """
+        from ...dags.etl.transformers.lsh_index import LSHIndex
+
+        index = LSHIndex()
+        index.add(0, [10, 11])
+        index.add(1, [12, 11])
+
+        index.remove(0)
+
+        assert index.query([10, 11]) == [1]
+        assert (0, 10) not in index.buckets
+        assert len(index) == 1
+
+        # removing an unknown position is a no-op
+        index.remove(5)
+        assert len(index) == 1
+
+    def test_bucket_size(self):
+        """
+        Test that a bucket only keeps its `bucket_size` most recently added
+        positions, and that evicted positions can still be removed.
+        """
+        from ...dags.etl.transformers.lsh_index import LSHIndex
+
+        index = LSHIndex(bucket_size=2)
+        index.add(0, [10, 11])
+        index.add(1, [10, 12])
+        index.add(2, [10, 13])
+
+        assert index.query([10, 0]) == [1, 2]
+        assert index.query([0, 11]) == [0]
+
+        index.remove(0)
+        assert index.query([0, 11]) == []
+        assert len(index) == 2
@@ -0,0 +1,128 @@
+import itertools
+import re
+
+
+def legacy_contains_number(text):
+    """
+    The three-scan implementation the numeric detector replaces.
+    """
+    from ...dags.etl.transformers.constants import (
+        hyphenated_numbers_pattern,
+        number_words,
+    )
+
+    if re.search(r"\d", text):
+        return True
+    if re.search(hyphenated_numbers_pattern, text, re.IGNORECASE):
+        return True
+    words = set(re.findall(r"\b\w+\b", text.lower()))
+    return bool(words & number_words)
+
+
+class TestNumericDetector:
+    """
+    Test suite for the numeric_detector module.
+    """
+
+    def test_word_alternation(self):
+        """
+        Test that the alternation matches exactly the given words, nested by
+        common prefix.
+        """
+        from ...dags.etl.transformers.numeric_detector import (
+            word_alternation,
+        )
+
+        pattern = word_alternation(["ten", "two", "twelve", "one"])
+
+        assert pattern == "(?:one|t(?:en|w(?:elve|o)))"
+        for word in ["ten", "two", "twelve", "one"]:
+            assert re.fullmatch(pattern, word)
+        for word in ["tw", "t", "twelv", "tens"]:
+            assert not re.fullmatch(pattern, word)
+
+    def test_matches_legacy_implementation(self):
+        """
+        Test that the single scan gives the same result as the three-scan
+        implementation on combinations of number words, look-alikes,
+        separators and case.
+        """
+        from ...dags.etl.transformers.numeric_detector import (
+            contains_number,
+            contains_numbers,
+        )
+
+        pieces = [
+            "Forty",
+            "two",
+            "TWENTY-ONE",
+            "sixty-ſix",
+            "FİFTY-NİNE",
+            "tens",
+            "oneself",
+            "nine_",
+            "Dogs",
+            "٣",
+            "7",
+            "",
+        ]
+        separators = [" ", "-", "_", "."]
+        texts = [
+            first + separator + second
+            for first, second in itertools.product(pieces, repeat=2)
+            for separator in separators
+        ]
+
+        expected = [legacy_contains_number(text) for text in texts]
+
+        assert [contains_number(text) for text in texts] == expected
+        assert contains_numbers(texts) == expected
+        assert any(expected) and not all(expected)
+
+    def test_detects_every_number_word(self):
+        """
+        Test that every listed number word and hyphenated number is detected
+        on its own and within a sentence, so the first-letter lookahead keeps
+        up with the word lists.
+        """
+        from ...dags.etl.transformers.constants import (
+            number_words,
+            tens_number_words,
+            unit_number_words,
+        )
+        from ...dags.etl.transformers.numeric_detector import contains_number
+
+        words = sorted(number_words) + [
+            f"{tens}-{unit}"
+            for tens, unit in itertools.product(
+                tens_number_words, unit_number_words
+            )
+        ]
+
+        for word in words:
+            assert contains_number(word), word
+            assert contains_number(f"Dogs have {word.upper()} legs"), word
+
+    def test_first_letters(self):
+        """
+        Test that the character class matches the first letters of the words
+        only.
+        """
+        from ...dags.etl.transformers.numeric_detector import first_letters
+
+        pattern = first_letters(["ten", "two"], {"zero", "one"})
+
+        assert pattern == "[otz]"
+
+    def test_contains_numbers(self, data_repository_mock):
+        """
+        Test the batch API of the transformer returns a flag per text.
+        """
+        from ...dags.etl.transformers import FactTransformer
+
+        transformer = FactTransformer(data_repository=data_repository_mock)
+
+        assert transformer.contains_numbers(
+            ["Dogs have 42 teeth", "Dogs bark", "Ninety-nine dogs"]
+        ) == [True, False, True]
+        assert transformer.contains_numbers([]) == []
@@ -0,0 +1,197 @@
+import copy
+
+import pytest
+
+
+def build_transformer(mocker, workers):
+    from ...dags.etl.transformers import FactTransformer, FactVersionManager
+
+    data_repository = mocker.Mock()
+    data_repository.existing_hashes.return_value = set()
+    data_repository.find_similar_facts_for_batch.side_effect = (
+        lambda batch: [[(7, 3, "Dogs have four legs")]] * len(batch)
+    )
+    version_manager = FactVersionManager(data_repository, tokenizer="words")
+    return FactTransformer(
+        data_repository=data_repository,
+        version_manager=version_manager,
+        workers=workers,
+    )
+
+
+raw_data = [
+    {
+        "fact": "Dogs have  four legs!",
+        "created_date": "2024-01-03T00:00:00.000Z",
+    },
+    {
+        "fact": "Dogs can smell fear",
+        "created_date": "2024-01-01T00:00:00.000Z",
+    },
+    {
+        "fact": "Dogs can smell fear.",
+        "created_date": "2024-01-02T00:00:00.000Z",
+    },
+    {
+        "fact": "   ",
+        "created_date": "2024-01-04T00:00:00.000Z",
+    },
+    {
+        "fact": "Dogs bark",
+        "created_date": "not a date",
+    },
+    {"fact": "Dogs bark"},
+    {
+        "fact": "Dogs can smell fear",
+        "created_date": "2024-01-05T00:00:00.000Z",
+    },
+    {
+        "fact": "Puppies sleep twelve hours",
+        "created_date": "2024-01-06T00:00:00.000Z",
+    },
+]
+
+
+class TestParallelTransformer:
+    """
+    This class contains the testing logic for the parallel mode of
+    FactTransformer.
+    """
+
+    def test_transform_parallel_matches_serial(self, mocker):
+        """
+        Test that transforming across a process pool gives the same facts and
+        expired IDs as the serial transform, in the same order.
+        """
+        serial = build_transformer(mocker, workers=1)
+        parallel = build_transformer(mocker, workers=2)
+
+        expected = serial.transform(copy.deepcopy(raw_data))
+        result = parallel.transform(copy.deepcopy(raw_data))
+
+        assert result == expected
+        facts, expired = result
+        assert [fact["fact"] for fact in facts] == [
+            "Dogs can smell fear",
+            "Dogs can smell fear.",
+            "Dogs have four legs!",
+            "Puppies sleep twelve hours",
+        ]
+        assert expired == [7]
+        assert facts[0]["is_current"] is False
+        assert [fact["is_numeric"] for fact in facts] == [
+            False,
+            False,
+            True,
+            True,
+        ]
+
+    def test_transform_parallel_since(self, mocker):
+        """
+        Test that the workers drop the records created before `since` before
+        hashing, like the serial transform.
+        """
+        serial = build_transformer(mocker, workers=1)
+        parallel = build_transformer(mocker, workers=2)
+        since = "2024-01-03T00:00:00.000Z"
+
+        expected = serial.transform(copy.deepcopy(raw_data), since=since)
+        result = parallel.transform(copy.deepcopy(raw_data), since=since)
+
+        assert result == expected
+        assert [fact["fact"] for fact in result[0]] == [
+            "Dogs have four legs!",
+            "Dogs can smell fear",
+            "Puppies sleep twelve hours",
+        ]
+        hashed = parallel.data_repository.existing_hashes.call_args[0][0]
+        assert len(hashed) == 3
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_transform_fact_records(self, mocker, workers):
+        """
+        Test that transforming `Fact` records gives the same result as
+        transforming dictionaries, serially and across a process pool.
+        """
+        from ...dags.etl.fact_record import Fact, to_facts
+
+        serial = build_transformer(mocker, workers=1)
+        transformer = build_transformer(mocker, workers=workers)
+
+        expected = serial.transform(copy.deepcopy(raw_data))
+        facts, expired = transformer.transform(
+            list(to_facts(copy.deepcopy(raw_data)))
+        )
+
+        assert (facts, expired) == expected
+        assert all(type(fact) is Fact for fact in facts)
+
+    def test_transform_parallel_dispatch(self, mocker):
+        """
+        Test that transform only uses the process pool with more than one
+        worker.
+        """
+        serial = build_transformer(mocker, workers=1)
+        transform_parallel = mocker.patch.object(
+            serial, "transform_parallel"
+        )
+
+        serial.transform(copy.deepcopy(raw_data))
+
+        transform_parallel.assert_not_called()
+
+    def test_partition(self, mocker):
+        """
+        Test that the data is split into a few partitions per worker.
+        """
+        transformer = build_transformer(mocker, workers=2)
+
+        partitions = list(transformer.partition(list(range(20))))
+
+        assert len(partitions) == 7
+        assert [x for partition in partitions for x in partition] == list(
+            range(20)
+        )
+        assert list(transformer.partition([])) == []
+
+    def test_worker_stages(self):
+        """
+        Test the worker functions in process: records are cleaned and hashed,
+        and facts get their bucket hashes and numeric flag.
+        """
+        from ...dags.etl.transformers import DateTimeValidator, parallel
+
+        parallel.init_worker(
+            ["fact", "created_date"],
+            DateTimeValidator(),
+            {
+                "num_perm": 16,
+                "num_buckets": 4,
+                "threshold": 70,
+                "tokenizer": "words",
+                "shingle_size": 3,
+                "rows_per_band": 2,
+            },
+        )
+
+        prepared, drops = parallel.prepare_records(
+            copy.deepcopy(raw_data[:6])
+        )
+        described = parallel.describe_facts(["Dogs bark", "Two dogs"])
+
+        assert [record["fact"] for record in prepared] == [
+            "Dogs have four legs!",
+            "Dogs can smell fear",
+            "Dogs can smell fear.",
+        ]
+        assert all(len(record["fact_hash"]) == 32 for record in prepared)
+        assert sorted(drops) == [
+            ("drop_blanks", "blank_fact", 1),
+            ("validate_datetime", "invalid_created_date", 1),
+            ("validate_keys", "missing_keys", 1),
+        ]
+        assert [len(bucket_hashes) for bucket_hashes, _ in described] == [
+            4,
+            4,
+        ]
+        assert [is_numeric for _, is_numeric in described] == [False, True]
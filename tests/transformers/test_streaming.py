@@ -0,0 +1,57 @@
+class TestStreaming:
+    """
+    This class contains the testing logic for the streaming helpers.
+    """
+
+    def test_iter_chunks(self):
+        """
+        Test that iter_chunks splits an iterable into lists of at most the
+        chunk size.
+        """
+        from ...dags.etl.transformers.streaming import iter_chunks
+
+        assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(iter_chunks([], 2)) == []
+
+    def test_external_sort_single_chunk(self, mocker):
+        """
+        Test that input fitting in one chunk is sorted without spilling to
+        disk.
+        """
+        from ...dags.etl.transformers import streaming
+
+        spill = mocker.spy(streaming, "_spill")
+
+        result = list(
+            streaming.external_sort([3, 1, 2], key=None, chunk_size=5)
+        )
+
+        assert result == [1, 2, 3]
+        spill.assert_not_called()
+
+    def test_external_sort_multiple_runs(self, mocker):
+        """
+        Test that input spanning several chunks is merged from sorted runs and
+        keeps the order of equal keys, like a stable in-memory sort.
+        """
+        from ...dags.etl.transformers import streaming
+
+        spill = mocker.spy(streaming, "_spill")
+        records = [
+            {"created_date": "2024-01-03", "fact": "a"},
+            {"created_date": "2024-01-01", "fact": "b"},
+            {"created_date": "2024-01-02", "fact": "c"},
+            {"created_date": "2024-01-01", "fact": "d"},
+            {"created_date": "2024-01-03", "fact": "e"},
+            {"created_date": "2024-01-02", "fact": "f"},
+            {"created_date": "2024-01-01", "fact": "g"},
+        ]
+
+        result = list(
+            streaming.external_sort(
+                iter(records), key=lambda x: x["created_date"], chunk_size=3
+            )
+        )
+
+        assert result == sorted(records, key=lambda x: x["created_date"])
+        assert spill.call_count == 3
@@ -0,0 +1,144 @@
+from datetime import datetime
+
+
+def parse_date(date_string):
+    return datetime.strptime(date_string, "%Y-%m-%d")
+
+
+class TestTransformStreamTransformer:
+    """
+    Test suite for the streaming transform of the FactTransformer class.
+    """
+
+    def test_transform_stream_matches_transform(
+        self,
+        data_repository_mock,
+        version_manager_mock,
+        datetime_validator_mock,
+        fact_transformer_instance,
+    ):
+        """
+        Test that the streaming transform yields the same facts, in the same
+        created date order, as the in-memory transform.
+        """
+        data_repository_mock.existing_hashes.return_value = set()
+        datetime_validator_mock.validate.side_effect = parse_date
+        version_manager_mock.match_and_find_versions.side_effect = (
+            lambda data: [None] * len(data)
+        )
+
+        def make_data():
+            return [
+                {"fact": " Fact 1 ", "created_date": "2024-01-03"},
+                {"fact": "", "created_date": "2024-01-02"},
+                {"fact": "Fact 2", "created_date": "2024-01-01"},
+                {"fact": "Fact 1", "created_date": "2024-01-01"},
+                {"created_date": "2024-01-01"},
+                {"fact": "Fact 3", "created_date": "2024-01-04"},
+                {"fact": "Fact 2 ", "created_date": "2024-01-05"},
+                {"fact": "Fact 4", "created_date": "2024-01-02"},
+            ]
+
+        expected, _ = fact_transformer_instance.transform(make_data())
+
+        chunks = list(
+            fact_transformer_instance.transform_stream(
+                iter(make_data()), chunk_size=2
+            )
+        )
+
+        streamed = [fact for chunk, _ in chunks for fact in chunk]
+        assert [fact["fact"] for fact in streamed] == [
+            fact["fact"] for fact in expected
+        ]
+        assert [fact["fact"] for fact in streamed] == [
+            "Fact 2",
+            "Fact 1",
+            "Fact 4",
+            "Fact 3",
+        ]
+        assert all(len(chunk) <= 2 for chunk, _ in chunks)
+
+    def test_transform_stream_expired_per_chunk(
+        self,
+        data_repository_mock,
+        version_manager_mock,
+        datetime_validator_mock,
+        fact_transformer_instance,
+    ):
+        """
+        Test that each chunk carries the expired fact ids found for it.
+        """
+        data_repository_mock.existing_hashes.return_value = set()
+        datetime_validator_mock.validate.side_effect = parse_date
+        version_manager_mock.match_and_find_versions.side_effect = [
+            [None, 11],
+            [12],
+        ]
+        data = [
+            {"fact": "Fact 1", "created_date": "2024-01-01"},
+            {"fact": "Fact 2", "created_date": "2024-01-02"},
+            {"fact": "Fact 3", "created_date": "2024-01-03"},
+        ]
+
+        chunks = list(
+            fact_transformer_instance.transform_stream(
+                iter(data), chunk_size=2
+            )
+        )
+
+        assert [expired for _, expired in chunks] == [[11], [12]]
+
+    def test_deduplication_across_chunks(
+        self, data_repository_mock, fact_transformer_instance
+    ):
+        """
+        Test that duplicates in later chunks are dropped when the seen hashes
+        are shared between deduplication calls.
+        """
+        data_repository_mock.existing_hashes.return_value = set()
+        seen_hashes = set()
+
+        first = fact_transformer_instance.deduplication(
+            [{"fact": "Fact 1"}], seen_hashes=seen_hashes
+        )
+        second = fact_transformer_instance.deduplication(
+            [{"fact": "Fact 1"}, {"fact": "Fact 2"}], seen_hashes=seen_hashes
+        )
+
+        assert [fact["fact"] for fact in first] == ["Fact 1"]
+        assert [fact["fact"] for fact in second] == ["Fact 2"]
+        assert len(seen_hashes) == 2
+
+    def test_transform_stream_since(
+        self,
+        data_repository_mock,
+        version_manager_mock,
+        datetime_validator_mock,
+        fact_transformer_instance,
+    ):
+        """
+        Test that records created before `since` are dropped, while records
+        created at `since` are kept.
+        """
+        data_repository_mock.existing_hashes.return_value = set()
+        datetime_validator_mock.validate.side_effect = parse_date
+        version_manager_mock.match_and_find_versions.side_effect = (
+            lambda data: [None] * len(data)
+        )
+        data = [
+            {"fact": "Fact 1", "created_date": "2024-01-01"},
+            {"fact": "Fact 2", "created_date": "2024-01-02"},
+            {"fact": "Fact 3", "created_date": "2024-01-03"},
+        ]
+
+        chunks = list(
+            fact_transformer_instance.transform_stream(
+                iter(data), chunk_size=2, since="2024-01-02"
+            )
+        )
+
+        assert [fact["fact"] for chunk, _ in chunks for fact in chunk] == [
+            "Fact 2",
+            "Fact 3",
+        ]
@@ -105,3 +105,22 @@ class TestValidateKeys:
         assert (
             result == expected_result
         )  # Only the record with all required keys should be included
+
+    def test_validate_keys_fact_records(self, fact_transformer_instance):
+        """
+        Test that `Fact` records are only checked for the required keys their
+        decoding did not already check.
+        """
+        from ...dags.etl.fact_record import Fact
+
+        fact = Fact("Fact 1", "2024-08-14")
+        fact_transformer_instance.required_keys = [
+            "fact",
+            "created_date",
+            "source",
+        ]
+        sourced_fact = Fact("Fact 2", "2024-08-15", source="partner")
+
+        result = fact_transformer_instance.validate_keys([fact, sourced_fact])
+
+        assert result == [sourced_fact]